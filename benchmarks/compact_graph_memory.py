@@ -0,0 +1,51 @@
+"""
+Memory benchmark comparing dict of `Package` objects with `CompactGraph`, both built from the same random DAG.
+
+Usage:
+    python benchmarks/compact_graph_memory.py [--packages N] [--edges-per-package K] [--seed S]
+"""
+
+# system imports
+import argparse
+import tracemalloc
+from typing import Any, Callable
+
+# local imports
+from exercise_two.compact_graph import CompactGraph
+from exercise_two.exercise_two import DependencyResolver
+from generators import random_dag
+
+
+def measure(build: Callable[[], Any]) -> tuple[int, Any]:
+    """Returns memory retained by the object returned from 'build', together with the object itself.
+    """
+    tracemalloc.start()
+    result = build()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--packages", type=int, default=200_000)
+    parser.add_argument("--edges-per-package", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    dependency_data = random_dag(args.packages, args.edges_per_package, args.seed)
+    dr = DependencyResolver()
+    resolution_order = dr.verified_resolution_order(dependency_data)
+
+    package_memory, _ = measure(lambda: dr.resolve_dependency_data(dependency_data))
+    compact_memory, _ = measure(lambda: CompactGraph.from_dependency_data(dependency_data, resolution_order))
+
+    edges = sum(len(dependencies) for dependencies in dependency_data.values())
+    print(f"packages: {len(dependency_data)}, edges: {edges}")
+    print(f"dict of Package: {package_memory / 2**20:10.1f} MiB")
+    print(f"CompactGraph:    {compact_memory / 2**20:10.1f} MiB")
+    print(f"ratio:           {package_memory / max(compact_memory, 1):10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Seeded generators of synthetic inputs for benchmarks.
+
+Dependency generators return dependency relations in the format of the dependency JSON files
+(package name mapped to a list of its dependencies). All generated graphs are acyclic, so they can be resolved.
+Package keys are shuffled, so the resolver does not get the packages already in resolution order.
+"""
+
+# system imports
+import random
+
+
+def shuffled(dependency_data: dict[str, list], seed: int) -> dict[str, list]:
+    """Returns the same dependency relations with keys in a random order.
+    """
+    names = list(dependency_data)
+    random.Random(seed).shuffle(names)
+    return {name: dependency_data[name] for name in names}
+
+
+def chain(packages: int, seed: int = 0) -> dict[str, list]:
+    """Generates a single long chain, every package depends on the next one.
+    """
+    dependency_data: dict[str, list] = {f"pkg{index}": [f"pkg{index + 1}"] for index in range(packages - 1)}
+    dependency_data[f"pkg{packages - 1}"] = []
+    return shuffled(dependency_data, seed)
+
+
+def fan_out(packages: int, seed: int = 0) -> dict[str, list]:
+    """Generates a single root package directly depending on all other packages.
+    """
+    dependency_data: dict[str, list] = {"root": [f"pkg{index}" for index in range(packages - 1)]}
+    dependency_data.update((f"pkg{index}", []) for index in range(packages - 1))
+    return shuffled(dependency_data, seed)
+
+
+def diamond_lattice(width: int, depth: int, seed: int = 0) -> dict[str, list]:
+    """Generates layers of packages, where every package depends on all packages of the following layer.
+
+    Amount of paths grows as width ** depth, which is the worst case of tree rendering.
+    """
+    dependency_data: dict[str, list] = {}
+    for layer in range(depth):
+        following = [f"pkg{layer + 1}_{index}" for index in range(width)] if layer < depth - 1 else []
+        for index in range(width):
+            dependency_data[f"pkg{layer}_{index}"] = list(following)
+    return shuffled(dependency_data, seed)
+
+
+def random_dag(packages: int, edges_per_package: int, seed: int = 0) -> dict[str, list]:
+    """Generates a random DAG, every package depends only on packages with higher index.
+    """
+    rng = random.Random(seed)
+    dependency_data: dict[str, list] = {}
+    for index in range(packages):
+        candidates = range(index + 1, packages)
+        dependencies = rng.sample(candidates, min(edges_per_package, len(candidates)))
+        dependency_data[f"pkg{index}"] = [f"pkg{dependency}" for dependency in dependencies]
+    return shuffled(dependency_data, seed)
+
+
+def near_cyclic(packages: int, back_edges: int = 2, seed: int = 0) -> dict[str, list]:
+    """Generates a chain with additional edges skipping forward, i.e. a ring missing only its closing edge.
+
+    Every package is reached by many paths and the depth-first search has to descend through the whole chain,
+    which is the worst case of cycle detection without any cycle to report.
+    """
+    rng = random.Random(seed)
+    dependency_data: dict[str, list] = {}
+    for index in range(packages):
+        dependencies = [index + 1] if index + 1 < packages else []
+        candidates = range(index + 2, packages)
+        dependencies += rng.sample(candidates, min(back_edges, len(candidates)))
+        dependency_data[f"pkg{index}"] = [f"pkg{dependency}" for dependency in dependencies]
+    return shuffled(dependency_data, seed)
+
+
+def mixed_list(size: int, duplicate_ratio: float = 0.1, seed: int = 0, hashable: bool = False) -> list:
+    """Generates a list of mixed types for 'detect_duplicate_elements'.
+
+    Contains ints, floats, strings, tuples and (unless 'hashable' is set) unhashable lists and dicts,
+    and roughly 'duplicate_ratio' of elements are repeated values of other elements.
+    """
+    rng = random.Random(seed)
+    factories = (
+        lambda value: value,
+        lambda value: value + 0.5,
+        lambda value: f"element{value}",
+        lambda value: (value, f"element{value}"),
+        lambda value: [value, value + 1],
+        lambda value: {"value": value},
+    )[:4 if hashable else 6]
+    elements: list = []
+    for index in range(size):
+        if elements and rng.random() < duplicate_ratio:
+            elements.append(rng.choice(elements))
+        else:
+            elements.append(rng.choice(factories)(index))
+    return elements
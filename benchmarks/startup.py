@@ -0,0 +1,139 @@
+"""
+Startup time benchmark of the command line interface.
+
+Every case runs a fresh interpreter, so it measures the interpreter startup, imports of 'entry_points'
+and of the modules used by the command, which dominate short runs on small files:
+    - python: bare interpreter startup, the floor of all other cases,
+    - import: import of 'entry_points' (definition of all commands),
+    - show_dependency_help, detect_duplicate_help: '--help' of the commands,
+    - detect_duplicate: a few elements given as arguments,
+    - show_dependency: a single small dependency file, without and with the graph cache (default invocation),
+    - dependency_batch: all generated files resolved by a single 'dependency-batch' process, reported in total
+      and per file (compare 'per_file' with 'show_dependency'), without the cache, with an empty cache (cold)
+      and with a filled cache (warm, default invocation on unchanged files).
+
+Cached cases use a temporary cache directory, the cache of the user is not touched.
+
+Every case is repeated and the minimum is reported. Results are written to a JSON file and compared with a baseline
+in the same way as by 'suite.py'.
+
+Usage:
+    python benchmarks/startup.py [--files N] [--repeat R] [--output results.json] [--baseline baseline.json] [--threshold T]
+"""
+
+# system imports
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+
+# local imports
+from exercise_two.defaults import CACHE_DIR_VARIABLE
+import generators
+from suite import THRESHOLD, compare
+
+
+# runs a command of 'entry_points' with the arguments of the process
+COMMAND_SCRIPT = "import sys, entry_points; getattr(entry_points, sys.argv[1])(sys.argv[2:])"
+
+
+def command(name: str, *arguments: str) -> list[str]:
+    """Returns the process arguments running a command of 'entry_points' in a fresh interpreter.
+    """
+    return [sys.executable, "-c", COMMAND_SCRIPT, name, *arguments]
+
+
+def best_run(arguments: list[str], repeat: int, stdin: str = "", cache_dir: Optional[str] = None, cold: bool = False) -> float:
+    """Returns the shortest of 'repeat' measured wall times of a process, in seconds.
+
+    Args:
+        arguments (list[str]): process arguments
+        repeat (int): amount of repetitions
+        stdin (str, optional): input of the process. Defaults to "".
+        cache_dir (Optional[str], optional): graph cache directory of the process. Defaults to None.
+        cold (bool, optional): empties the cache directory before every repetition. Defaults to False.
+    """
+    env = dict(os.environ)
+    if cache_dir is not None:
+        env[CACHE_DIR_VARIABLE] = cache_dir
+    durations = []
+    for _ in range(repeat):
+        if cold and cache_dir is not None:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        counter = time.perf_counter()
+        subprocess.run(arguments, input=stdin, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, text=True, env=env)
+        durations.append(time.perf_counter() - counter)
+    return min(durations)
+
+
+def run_startup(files: int, repeat: int) -> dict[str, dict[str, float]]:
+    """Runs all startup cases.
+
+    Returns:
+        dict[str, dict[str, float]]: durations in seconds of every case
+    """
+    results: dict[str, dict[str, float]] = {
+        "python": {"startup": best_run([sys.executable, "-c", "pass"], repeat)},
+        "import": {"startup": best_run([sys.executable, "-c", "import entry_points"], repeat)},
+        "show_dependency_help": {"startup": best_run(command("dependency_graph", "--help"), repeat)},
+        "detect_duplicate_help": {"startup": best_run(command("detect_duplicate", "--help"), repeat)},
+        "detect_duplicate": {"startup": best_run(command("detect_duplicate", "a", "b", "a"), repeat)},
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for index in range(files):
+            paths.append(os.path.join(directory, f"dependencies_{index}.json"))
+            with open(paths[-1], "w") as file:
+                json.dump(generators.random_dag(50, 3, seed=index), file)
+        cache_dir = os.path.join(directory, "cache")
+        results["show_dependency"] = {
+            "no_cache": best_run(command("dependency_graph", "-f", paths[0], "--no-cache"), repeat),
+            "cached": best_run(command("dependency_graph", "-f", paths[0]), repeat, cache_dir=cache_dir),
+        }
+        batch_input = "\n".join(paths)
+        for case, arguments, cold in (("dependency_batch_no_cache", ["--no-cache"], False),
+                                      ("dependency_batch_cold", [], True),
+                                      ("dependency_batch", [], False)):
+            total = best_run(command("dependency_batch", *arguments), repeat, batch_input, cache_dir, cold)
+            results[case] = {"total": total, "per_file": total / files}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=100, help="amount of files resolved by the batch")
+    parser.add_argument("--repeat", type=int, default=5, help="amount of repetitions of every case")
+    parser.add_argument("--output", default="startup_results.json", help="path of the written results")
+    parser.add_argument("--baseline", default=None, help="path of results to compare with")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    results = run_startup(args.files, args.repeat)
+    for case, phases in results.items():
+        print(f"{case:24}" + "".join(f"{phase:>10}: {duration:8.4f}s" for phase, duration in phases.items()))
+
+    report = dict(python=platform.python_version(), platform=platform.platform(), files=args.files,
+                  repeat=args.repeat, results=results)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+
+    if args.baseline is None:
+        return
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    regressions = compare(results, baseline["results"], args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    if regressions:
+        sys.exit(1)
+    print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Timing benchmark suite of `DependencyResolver` and `detect_duplicate_elements` on synthetic inputs.
+
+Every dependency case is written to a temporary JSON file and timed in separate phases:
+    - load: reading and parsing the file,
+    - verify: structural verification of the loaded data,
+    - resolve: cycle detection, ordering and building of the Package graph,
+    - render: rendering the compact graph in 'compact' mode (tree mode is exponential on lattices).
+Duplicate detection cases time a single call of `detect_duplicate_elements`. The parallel case times
+`detect_duplicate_elements_hybrid` and `detect_duplicate_elements_parallel` (with all CPUs) on the same large list,
+the ratio of the two is the speedup of the process pool.
+
+Every phase is repeated and the minimum is reported. Results are written to a JSON file and, if a baseline
+(a results file of an earlier run) is given, phases slower than the baseline by more than the threshold are reported
+as regressions and the script exits with status 1.
+
+Usage:
+    python benchmarks/suite.py [--scale S] [--repeat R] [--output results.json] [--baseline baseline.json] [--threshold T]
+"""
+
+# system imports
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Callable
+
+# local imports
+from exercise_one.exercise_one import (detect_duplicate_elements, detect_duplicate_elements_hybrid,
+                                       detect_duplicate_elements_parallel)
+from exercise_two.compact_graph import CompactGraph
+from exercise_two.exercise_two import DependencyResolver
+from exercise_two.renderer import render_graph
+import generators
+
+
+# default ratio of current and baseline time considered a regression
+THRESHOLD = 1.25
+
+
+def dependency_cases(scale: float) -> dict[str, dict[str, list]]:
+    """Generates dependency relations of all benchmarked graphs, sizes are multiplied by 'scale'.
+    """
+    def size(value: int) -> int:
+        return max(int(value * scale), 2)
+
+    return {
+        "chain": generators.chain(size(50_000)),
+        "fan_out": generators.fan_out(size(50_000)),
+        "diamond_lattice": generators.diamond_lattice(size(20), size(100)),
+        "random_dag": generators.random_dag(size(20_000), 10),
+        "near_cyclic": generators.near_cyclic(size(20_000)),
+    }
+
+
+def list_cases(scale: float) -> dict[str, list]:
+    """Generates lists of all benchmarked duplicate detection cases, sizes are multiplied by 'scale'.
+    """
+    size = max(int(10_000 * scale), 2)
+    return {
+        "mixed_list": generators.mixed_list(size),
+        "mixed_list_duplicates": generators.mixed_list(size, duplicate_ratio=0.5),
+        "int_list": [index % (size // 2) for index in range(size)],
+    }
+
+
+def best_time(function: Callable[[], Any], repeat: int) -> float:
+    """Returns the shortest of 'repeat' measured durations of 'function', in seconds.
+    """
+    durations = []
+    for _ in range(repeat):
+        counter = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - counter)
+    return min(durations)
+
+
+def time_dependency_case(dependency_data: dict[str, list], repeat: int, directory: str) -> dict[str, float]:
+    """Times all phases of resolving a single dependency file.
+    """
+    file_path = os.path.join(directory, "dependencies.json")
+    with open(file_path, "w") as file:
+        json.dump(dependency_data, file)
+
+    dr = DependencyResolver()
+    order = dr.verified_resolution_order(dependency_data)
+    graph = CompactGraph.from_dependency_data(dependency_data, order)
+    return {
+        "load": best_time(lambda: dr.load_dependency_data(file_path), repeat),
+        "verify": best_time(lambda: dr.verify_dependency_structure(dependency_data), repeat),
+        "resolve": best_time(lambda: dr.resolve_dependency_data(dependency_data, verified=True), repeat),
+        "render": best_time(lambda: render_graph(graph, io.StringIO(), "compact"), repeat),
+    }
+
+
+def run_suite(scale: float, repeat: int) -> dict[str, dict[str, float]]:
+    """Runs all benchmark cases.
+
+    Returns:
+        dict[str, dict[str, float]]: durations in seconds of every phase of every case
+    """
+    results: dict[str, dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, dependency_data in dependency_cases(scale).items():
+            results[name] = time_dependency_case(dependency_data, repeat, directory)
+    for name, elements in list_cases(scale).items():
+        results[name] = {"detect": best_time(lambda: detect_duplicate_elements(elements), repeat)}
+    elements = generators.mixed_list(max(int(1_000_000 * scale), 2), duplicate_ratio=0.5, hashable=True)
+    results["parallel_list"] = {
+        "hybrid": best_time(lambda: detect_duplicate_elements_hybrid(elements), repeat),
+        "parallel": best_time(lambda: detect_duplicate_elements_parallel(elements, threshold=0), repeat),
+    }
+    return results
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]],
+            threshold: float) -> list[str]:
+    """Compares results with a baseline.
+
+    Returns:
+        list[str]: descriptions of phases slower than the baseline by more than the threshold
+    """
+    regressions = []
+    for case, phases in results.items():
+        for phase, duration in phases.items():
+            reference = baseline.get(case, {}).get(phase)
+            if reference and duration / reference > threshold:
+                regressions.append(f"{case}/{phase}: {duration:.4f}s vs. {reference:.4f}s ({duration / reference:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier of all input sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="amount of repetitions of every phase")
+    parser.add_argument("--output", default="benchmark_results.json", help="path of the written results")
+    parser.add_argument("--baseline", default=None, help="path of results to compare with")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    results = run_suite(args.scale, args.repeat)
+    for case, phases in results.items():
+        print(f"{case:24}" + "".join(f"{phase:>9}: {duration:8.4f}s" for phase, duration in phases.items()))
+    parallel = results["parallel_list"]
+    print(f"Parallel speedup over hybrid with {os.cpu_count()} CPUs: {parallel['hybrid'] / parallel['parallel']:.2f}x")
+
+    report = dict(python=platform.python_version(), platform=platform.platform(), cpus=os.cpu_count(), scale=args.scale,
+                  repeat=args.repeat, results=results)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+
+    if args.baseline is None:
+        return
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    if baseline.get("scale") != args.scale:
+        print(f"WARNING: baseline was measured with scale {baseline.get('scale')}, current scale is {args.scale}")
+    regressions = compare(results, baseline["results"], args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    if regressions:
+        sys.exit(1)
+    print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,23 @@
 """
 Default setuptools entry point does not allow for argument, so one needs to use argparse similar. I prefer 'click'.
+
+Only lightweight modules defining option values are imported at the module level, the resolver, the detection engines
+(and NumPy) are imported by the commands using them, so '--help' and short runs do not pay for unused imports.
 """
 
-from exercise_two.exercise_two import show_dependency_graph, TARGET_PATH
-from exercise_one.exercise_one import detect_duplicate_elements
+from exercise_two.client import DEFAULT_SOCKET_PATH, DaemonQueryError, query
+from exercise_two.defaults import CACHE_DIR_VARIABLE, CONFLICT_POLICIES, TARGET_PATH
+from exercise_two.exporters import OUTPUT_FORMATS
+from exercise_two.renderer import RENDER_MODES
+from exercise_one.defaults import INPUT_FORMATS, RUN_SIZE
+from contextlib import redirect_stdout
 import click
+import json
+import sys
+
+
+# commands accepted by 'dependency-query', dashes are replaced by underscores in the request
+QUERY_COMMANDS = ("ping", "status", "reload", "shutdown", "packages", "dependencies", "dependents", "depends-on", "graph")
 
 
 @click.command()
@@ -13,15 +26,299 @@ import click
               show_default=True,
               type=str,
               help="Defines absolute path to a JSON file containing dependency relations.")
-def dependency_graph(file_path):
-    show_dependency_graph(file_path)
+@click.option("-m", "--mode",
+              default="tree",
+              show_default=True,
+              type=click.Choice(RENDER_MODES),
+              help="'tree' expands every dependency, 'compact' expands shared dependencies only once, 'flat' lists direct dependencies.")
+@click.option("-d", "--max-depth",
+              default=None,
+              type=click.IntRange(min=0),
+              help="Deepest printed level of dependencies, root packages are at level 0.")
+@click.option("--cache/--no-cache",
+              default=True,
+              show_default=True,
+              help="Reuses resolved graphs of unchanged dependency files from a persistent cache.")
+@click.option("--cache-dir",
+              default=None,
+              type=click.Path(file_okay=False),
+              help=f"Directory of the persistent cache. Defaults to ${CACHE_DIR_VARIABLE} or ~/.cache/exercise_two.")
+@click.option("--stats",
+              is_flag=True,
+              help="Writes wall times of resolution phases and graph counters as a JSON line to stderr.")
+@click.option("--trace-memory",
+              is_flag=True,
+              help="Adds peak memory of every phase to '--stats' output, slows down the resolution.")
+@click.option("-M", "--manifest", "manifests",
+              multiple=True,
+              type=str,
+              help="Resolves a merged graph of manifests instead of '--file_path'. Accepts a file, a directory "
+                   "(searched for *.json files) or a glob pattern, can be repeated.")
+@click.option("--conflict",
+              default="error",
+              show_default=True,
+              type=click.Choice(CONFLICT_POLICIES),
+              help="Policy for packages defined by more than one manifest.")
+@click.option("-w", "--workers",
+              default=None,
+              type=click.IntRange(min=1),
+              help="Number of processes loading manifests. Defaults to the number of CPUs.")
+@click.option("--snapshot",
+              default=None,
+              type=click.Path(exists=True, dir_okay=False),
+              help="Prints the graph of a snapshot compiled by 'compile-dependency' instead of '--file_path'.")
+@click.option("--format", "output_format",
+              default="text",
+              show_default=True,
+              type=click.Choice(OUTPUT_FORMATS),
+              help="'text' prints the indented graph, 'json' an adjacency object, 'ndjson' a record per package "
+                   "with transitive dependency counts and depth, 'dot' a Graphviz digraph.")
+@click.option("-o", "--output",
+              default="-",
+              type=click.File("w"),
+              help="Writes the graph into a file instead of stdout.")
+def dependency_graph(file_path, mode, max_depth, cache, cache_dir, stats, trace_memory, manifests, conflict, workers, snapshot,
+                     output_format, output):
+    """
+    Prints the resolved dependency graph of a JSON file, of many manifests merged with '--manifest',
+    or of a compiled snapshot.
+    """
+    from exercise_two.instrumentation import ResolverStats
+
+    resolver_stats = ResolverStats(trace_memory) if stats or trace_memory else None
+    hooks = [resolver_stats] if resolver_stats is not None else None
+    try:
+        if snapshot is not None:
+            from exercise_two.exporters import write_graph
+            from exercise_two.snapshot import open_snapshot
+            with open_snapshot(snapshot) as graph:
+                write_graph(graph, output, output_format, mode, max_depth)
+        elif manifests:
+            from exercise_two.manifests import show_manifests_graph
+            show_manifests_graph(manifests, mode, max_depth, conflict, workers, hooks, output, output_format)
+        else:
+            from exercise_two.exercise_two import show_dependency_graph
+            from exercise_two.graph_cache import GraphCache
+            graph_cache = GraphCache(cache_dir) if cache else None
+            try:
+                show_dependency_graph(file_path, mode, max_depth, graph_cache, hooks, output_format, output)
+            finally:
+                if graph_cache is not None:
+                    graph_cache.flush()
+    finally:
+        if resolver_stats is not None:
+            resolver_stats.close()
+    if resolver_stats is not None:
+        click.echo(json.dumps(resolver_stats.as_dict()), err=True)
 
 
 @click.command()
 @click.argument('elements', nargs=-1)
-def detect_duplicate(elements):
+@click.option("-i", "--input", "input_file",
+              default=None,
+              type=click.File("r"),
+              help="Reads elements from a file instead of ELEMENTS, '-' reads from stdin.")
+@click.option("--format", "input_format",
+              default="lines",
+              show_default=True,
+              type=click.Choice(INPUT_FORMATS),
+              help="Format of the input file, one string per line or one JSON value per line.")
+@click.option("--external",
+              is_flag=True,
+              help="Spills sorted runs of the input file to temporary files, bounding the memory by the run size.")
+@click.option("--run-size",
+              default=RUN_SIZE,
+              show_default=True,
+              type=click.IntRange(min=1),
+              help="Maximal amount of records held in memory in the external mode.")
+@click.pass_context
+def detect_duplicate(ctx, elements, input_file, input_format, external, run_size):
     """
     Detects duplicate entries in ELEMENTS argument.
     ELEMENTS take unlimited amount of arguments.
+
+    With the '--input' option, elements are read from a file or stdin and duplicates are written one per line.
+    Options '--format', '--external' and '--run-size' apply only to '--input'.
+    """
+    if input_file is None:
+        for name, option in (("input_format", "--format"), ("external", "--external"), ("run_size", "--run-size")):
+            if ctx.get_parameter_source(name) is not click.core.ParameterSource.DEFAULT:
+                raise click.UsageError(f"'{option}' can only be combined with the '--input' option.")
+        from exercise_one.exercise_one import detect_duplicate_elements
+        print(detect_duplicate_elements(list(elements)))
+        return
+    if elements:
+        raise click.UsageError("ELEMENTS cannot be combined with the '--input' option.")
+
+    from exercise_one.external import iter_duplicates, iter_duplicates_external
+
+    if external:
+        duplicates = iter_duplicates_external(input_file, input_format, run_size)
+    else:
+        duplicates = iter_duplicates(input_file, input_format)
+    for duplicate in duplicates:
+        click.echo(duplicate)
+
+
+@click.command()
+@click.argument("old_path", type=click.Path(exists=True, dir_okay=False))
+@click.argument("new_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--json", "as_json",
+              is_flag=True,
+              help="Writes the diff as a single JSON object.")
+def diff_dependency(old_path, new_path, as_json):
+    """
+    Compares two versions of a JSON file containing dependency relations.
+    Reports added and removed packages, changed direct dependencies and packages with changed transitive dependencies.
+    """
+    from exercise_two.graph_diff import diff_dependency_files
+
+    graph_diff = diff_dependency_files(old_path, new_path)
+    if as_json:
+        click.echo(json.dumps(graph_diff.as_dict()))
+        return
+    for line in graph_diff.lines():
+        click.echo(line)
+
+
+@click.command()
+@click.option("-f", "--file_path",
+              default=TARGET_PATH,
+              show_default=True,
+              type=str,
+              help="Defines absolute path to a JSON file containing dependency relations.")
+@click.option("-o", "--output",
+              required=True,
+              type=click.Path(dir_okay=False),
+              help="Path of the compiled snapshot.")
+def compile_dependency(file_path, output):
+    """
+    Resolves a JSON file containing dependency relations and compiles it into a binary snapshot,
+    which is loaded by memory mapping, without parsing or verification (see 'show-dependency --snapshot').
     """
-    print(detect_duplicate_elements(elements))
+    from exercise_two.snapshot import compile_snapshot
+
+    graph = compile_snapshot(file_path, output)
+    click.echo(f"Compiled {len(graph)} packages and {len(graph.edges)} edges into {output}")
+
+
+@click.command()
+@click.option("-f", "--file_path",
+              default=TARGET_PATH,
+              show_default=True,
+              type=str,
+              help="Defines absolute path to a JSON file containing dependency relations.")
+@click.option("-s", "--socket", "socket_path",
+              default=DEFAULT_SOCKET_PATH,
+              show_default=True,
+              type=str,
+              help="Path to the Unix socket the daemon listens on.")
+@click.option("--poll-interval",
+              default=1.0,
+              show_default=True,
+              type=click.FloatRange(min=0, min_open=True),
+              help="Interval in seconds between checks of the dependency file for changes.")
+def dependency_daemon(file_path, socket_path, poll_interval):
+    """
+    Keeps the resolved dependency graph in memory and answers queries sent by 'dependency-query'.
+    The graph is resolved again whenever the dependency file changes.
+    """
+    from exercise_two.daemon import run_daemon
+    run_daemon(file_path, socket_path, poll_interval)
+
+
+@click.command()
+@click.argument("command",
+                type=click.Choice(QUERY_COMMANDS))
+@click.argument("packages", nargs=-1)
+@click.option("-t", "--transitive",
+              is_flag=True,
+              help="Includes indirect dependencies or dependents.")
+@click.option("-m", "--mode",
+              default="tree",
+              show_default=True,
+              type=click.Choice(RENDER_MODES),
+              help="Rendering mode of the 'graph' command.")
+@click.option("-d", "--max-depth",
+              default=None,
+              type=click.IntRange(min=0),
+              help="Deepest printed level of the 'graph' command.")
+@click.option("-s", "--socket", "socket_path",
+              default=DEFAULT_SOCKET_PATH,
+              show_default=True,
+              type=str,
+              help="Path to the Unix socket of the daemon.")
+@click.option("--timeout",
+              default=None,
+              type=click.FloatRange(min=0, min_open=True),
+              help="Seconds to wait for the answer, e.g. for a rendered graph. Waits until the daemon answers by default.")
+def dependency_query(command, packages, transitive, mode, max_depth, socket_path, timeout):
+    """
+    Sends COMMAND to a running 'dependency-daemon' and prints the answer.
+    PACKAGES are the queried package (and dependency for 'depends-on'); lists are printed one item per line.
+    Command 'depends-on' exits with status 1 if the package does not depend on the dependency.
+    """
+    request = dict(command=command.replace("-", "_"), transitive=transitive, mode=mode, max_depth=max_depth)
+    request.update(zip(("package", "dependency"), packages))
+    try:
+        result = query(request, socket_path, timeout)
+    except (OSError, DaemonQueryError) as exc:
+        raise click.ClickException(str(exc))
+
+    if isinstance(result, list):
+        for name in result:
+            click.echo(name)
+    elif isinstance(result, bool):
+        click.echo(str(result).lower())
+        if command == "depends-on" and not result:
+            raise SystemExit(1)
+    elif isinstance(result, str):
+        click.echo(result, nl=False)
+    else:
+        click.echo(json.dumps(result))
+
+
+@click.command()
+@click.argument("paths", nargs=-1)
+@click.option("--adjacency",
+              is_flag=True,
+              help="Adds direct dependencies of every package to the records.")
+@click.option("--cache/--no-cache",
+              default=True,
+              show_default=True,
+              help="Reuses resolved graphs of unchanged dependency files from a persistent cache.")
+@click.option("--cache-dir",
+              default=None,
+              type=click.Path(file_okay=False),
+              help=f"Directory of the persistent cache. Defaults to ${CACHE_DIR_VARIABLE} or ~/.cache/exercise_two.")
+def dependency_batch(paths, adjacency, cache, cache_dir):
+    """
+    Resolves every JSON file in PATHS in a single process and writes a JSON record per file (NDJSON).
+    Without PATHS, paths are read from stdin, one per line.
+
+    Records hold 'path', 'ok' and either counters of the graph ('packages', 'edges', 'max_depth')
+    or the 'error' and its 'message'. Failed files do not stop the batch, the command then exits with status 1.
+    The index of the graph cache is loaded and written once per batch.
+    """
+    from exercise_two.batch import resolve_batch
+    from exercise_two.exercise_two import DependencyResolver
+    from exercise_two.graph_cache import GraphCache
+
+    if not paths:
+        paths = (line.strip() for line in sys.stdin if line.strip())
+    graph_cache = GraphCache(cache_dir) if cache else None
+    resolver = DependencyResolver(graph_cache)
+    output = sys.stdout
+    failed = False
+    # messages printed by the resolver go to stderr, so stdout holds only the records
+    try:
+        with redirect_stdout(sys.stderr):
+            for record in resolve_batch(paths, resolver, adjacency):
+                failed = failed or not record["ok"]
+                click.echo(json.dumps(record), file=output)
+    finally:
+        # the cache index is written once per batch
+        if graph_cache is not None:
+            graph_cache.flush()
+    if failed:
+        raise SystemExit(1)
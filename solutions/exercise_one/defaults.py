@@ -0,0 +1,12 @@
+"""
+Default values shared by the package and its command line interface.
+
+The module has no imports, so the command line interface can define its options (and print '--help')
+without importing the detection engines and NumPy.
+"""
+
+
+# supported formats of input streams
+INPUT_FORMATS = ("lines", "ndjson")
+# default amount of records held in memory by the external mode
+RUN_SIZE = 1_000_000
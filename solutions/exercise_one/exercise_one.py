@@ -17,19 +17,190 @@ Assumptions taken:
       this function will uphold this automatic pythonic typecasting strategy (e.g. `1. == 1` , `1 == True` etc.).
 
 Improvement ideas:
-    - if we are given hashable objects, we could immediately go to dicts and reduce complexity to O(n) if optimistic, O(n2) if pessimistic
-    - one could make checking stricter (with performance consequences) to prevent, situations like in list3 example, where gets
-      duplicates detected, due to typecasting
+    - hashable objects are already routed through a dict based index (see `DuplicateTracker`), which
+      reduces complexity to O(n) if optimistic, O(n2) only for the unhashable part of the input,
+    - checking can be made stricter with `strict=True`, which prevents situations like in list3 example, where duplicates
+      get detected due to typecasting; objects are then compared by canonical keys (see `strict_key`), which are hashable
+      even for lists and dicts, so the detection stays O(n) for those as well
 """
 
 
 # system imports
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from heapq import merge
+from multiprocessing import get_context
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, Union
 # third-party imports
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
 # local imports
 
-def detect_duplicate_elements(elements: list) -> list:
+
+# types of homogeneous lists, which are handed over to the NumPy backend
+VECTORIZABLE_TYPES = (int, float, str)
+# minimal length of a list, for which conversion into an array pays off
+VECTORIZATION_THRESHOLD = 1000
+# NumPy pads strings to the longest one, lists padded to more than this multiple of their total length are refused
+STRING_PADDING_RATIO = 4
+
+# minimal length of a list, for which sharding over a process pool outweighs pickling overhead
+PARALLEL_THRESHOLD = 200_000
+# workers of 'detect_duplicate_elements_parallel' are forked (and inherit the list), otherwise they are spawned
+FORK_WORKERS = sys.platform.startswith("linux")
+# list processed by 'detect_duplicate_elements_parallel', inherited by forked worker processes
+SHARED_ELEMENTS: list = []
+
+# unhashable builtin types, which compare equal to instances of a hashable type
+HASHABLE_COUNTERPARTS: dict[type, type] = {set: frozenset,
+                                           bytearray: bytes,
+                                           type({}.keys()): frozenset,
+                                           type({}.items()): frozenset}
+
+
+def detect_duplicate_elements(elements: Union[list, "np.ndarray"], workers: Optional[int] = 1, strict: bool = False) -> list:
     """Detects duplicate objects in a given list and returns them in order defined by their respective occurrence.
 
+    Homogeneous lists of ints, floats or strings and 1-D numpy arrays are processed by the vectorized NumPy backend,
+    if NumPy is installed. Everything else is processed by the hybrid engine, sharded over a process pool
+    if more than one worker is requested.
+
+    Args:
+        elements (Union[list, np.ndarray]): list of objects with possible duplicates, or a 1-D numpy array
+        workers (Optional[int], optional): number of worker processes, None uses all CPUs. Defaults to 1.
+        strict (bool, optional): objects of different types are never duplicates (e.g. `1`, `1.` and `True`),
+                                 see `strict_key`. Defaults to False.
+
+    Returns:
+        list: list of duplicate objects in the `elements` list ordered in FIFO.
+              If there are no duplicates, returns an empty list.
+
+    """
+    # homogeneous lists hold a single type, so strict comparison does not differ there
+    if np is not None and (isinstance(elements, np.ndarray) or is_vectorizable(elements)):
+        try:
+            return detect_duplicate_elements_vectorized(elements)
+        except (ValueError, MemoryError):
+            pass
+    element_list = elements.tolist() if np is not None and isinstance(elements, np.ndarray) else elements
+    if workers != 1:
+        return detect_duplicate_elements_parallel(element_list, workers, strict=strict)
+    return detect_duplicate_elements_hybrid(element_list, strict)
+
+
+def detect_duplicate_occurrences(elements: Iterable, strict: bool = False) -> list[tuple[Any, int, int]]:
+    """Detects duplicate objects together with index of their first occurrence and amount of their occurrences.
+
+    Args:
+        elements (Iterable): objects with possible duplicates
+        strict (bool, optional): objects of different types are never duplicates, see `strict_key`. Defaults to False.
+
+    Returns:
+        list[tuple[Any, int, int]]: (duplicate object, index of its first occurrence, amount of occurrences)
+                                    ordered in FIFO. If there are no duplicates, returns an empty list.
+    """
+    tracker = DuplicateTracker(strict_key if strict else None)
+    tracker.extend(elements)
+    return tracker.occurrences()
+
+
+def strict_key(element: Any) -> Any:
+    """Builds a canonical key of an object, which includes its type, so objects of different types never share a key.
+
+    Lists, tuples, dicts, sets and frozensets are frozen recursively into hashable tuples and frozensets of keys,
+    so (unlike the objects themselves) keys of all builtin containers are hashable. Other objects are kept as they are.
+
+    Args:
+        element (Any): object
+
+    Returns:
+        Any: canonical key, keys of two objects are equal exactly if the objects have the same type and equal content
+    """
+    element_type = type(element)
+    if element_type is list or element_type is tuple:
+        return element_type, tuple(strict_key(item) for item in element)
+    if element_type is dict:
+        return element_type, frozenset((strict_key(key), strict_key(value)) for key, value in element.items())
+    if element_type is set or element_type is frozenset:
+        return element_type, frozenset(strict_key(item) for item in element)
+    if element_type is bytearray:
+        return element_type, bytes(element)
+    return element_type, element
+
+
+def is_vectorizable(elements: list) -> bool:
+    """Checks if a list is long enough and homogeneous, i.e. holds only ints, only floats or only strings.
+
+    Strings are refused, if padding them to the longest one would multiply their size by more than
+    'STRING_PADDING_RATIO' (e.g. many short strings and a single very long one).
+
+    Args:
+        elements (list): list of objects with possible duplicates
+
+    Returns:
+        bool: True if the list should be processed by the NumPy backend
+    """
+    if len(elements) < VECTORIZATION_THRESHOLD:
+        return False
+    element_types = set(map(type, elements))
+    if len(element_types) != 1:
+        return False
+    element_type = element_types.pop()
+    if element_type is str:
+        lengths = list(map(len, elements))
+        return len(lengths) * max(lengths) <= STRING_PADDING_RATIO * max(sum(lengths), len(lengths))
+    return element_type in VECTORIZABLE_TYPES
+
+
+def detect_duplicate_elements_vectorized(elements: Any) -> list:
+    """Detects duplicate objects with NumPy, sorting the values and ordering duplicates by index of their first occurrence.
+
+    Values, which NumPy does not compare the same way as Python, are refused: ints overflowing 64 bits, NaNs
+    (distinct NaN objects are never equal in Python) and strings holding null characters (stripped by NumPy).
+
+    Args:
+        elements (Any): homogeneous list of ints, floats or strings, or a 1-D numpy.ndarray
+
+    Raises:
+        ImportError: raises if NumPy is not installed,
+        ValueError: raises if the objects cannot be compared exactly by NumPy.
+
+    Returns:
+        list: list of duplicate objects in the `elements` list ordered in FIFO.
+              If there are no duplicates, returns an empty list.
+    """
+    if np is None:
+        raise ImportError("NumPy backend requires 'numpy' package to be installed")
+
+    try:
+        values = np.asarray(elements)
+    except OverflowError as exc:
+        raise ValueError("Elements cannot be represented by a NumPy array") from exc
+    if values.ndim != 1 or values.dtype.kind not in "biufUS":
+        raise ValueError(f"Unsupported array of dtype {values.dtype!r} and dimension {values.ndim!r}")
+    if values.dtype.kind == "f" and np.isnan(values).any():
+        raise ValueError("NaN values cannot be compared by NumPy")
+    if values.dtype.kind == "U" and not isinstance(elements, np.ndarray) and "\x00" in "".join(elements):
+        raise ValueError("Strings with null characters cannot be compared by NumPy")
+
+    # stable sorting of 'np.unique' guarantees, that indices point to first occurrences
+    _, first_indices, counts = np.unique(values, return_index=True, return_counts=True)
+    duplicate_indices = np.sort(first_indices[counts > 1])
+
+    if isinstance(elements, np.ndarray):
+        return list(values[duplicate_indices].tolist())
+    return [elements[index] for index in duplicate_indices.tolist()]
+
+
+def detect_duplicate_elements_linear(elements: list) -> list:
+    """Reference implementation of duplicate detection, relying only on equality of objects.
+
+    Works for any object, but every membership check scans a plain list, which makes the function O(n2).
+
     Args:
         elements (list): list of objects with possible duplicates
 
@@ -58,6 +229,292 @@ def detect_duplicate_elements(elements: list) -> list:
     return output_list
 
 
+def detect_duplicate_elements_hybrid(elements: list, strict: bool = False) -> list:
+    """Detects duplicate objects, looking up hashable objects in a dict and scanning linearly only for unhashable ones.
+
+    See `DuplicateTracker` for details of the lookup.
+
+    Args:
+        elements (list): list of objects with possible duplicates
+        strict (bool, optional): objects are compared by their `strict_key`. Defaults to False.
+
+    Returns:
+        list: list of duplicate objects in the `elements` list ordered in FIFO.
+              If there are no duplicates, returns an empty list.
+
+    """
+    tracker = DuplicateTracker(strict_key if strict else None)
+    tracker.extend(elements)
+    return tracker.duplicates()
+
+
+def hashable_counterpart(element: Any) -> Any:
+    """Converts an instance of an unhashable builtin type into an equal hashable object, see `HASHABLE_COUNTERPARTS`.
+
+    Objects of other types and objects, which can not be converted (e.g. items of a dict with unhashable values),
+    are returned unchanged.
+
+    Args:
+        element (Any): object
+
+    Returns:
+        Any: equal hashable object or the object itself
+    """
+    counterpart = HASHABLE_COUNTERPARTS.get(type(element))
+    if counterpart is None:
+        return element
+    try:
+        return counterpart(element)
+    except TypeError:
+        return element
+
+
+class DuplicateTracker:
+    """Incremental duplicate detector, consuming objects one by one, e.g. from a generator.
+
+    Hashable objects are looked up in a dict, unhashable objects are scanned linearly. The dict lookup follows the same `is`/`==`
+    rule as list membership, and since equal builtin objects share their hash, the pythonic typecasting (`1 == True == 1.`)
+    is upheld. Builtin unhashable types that compare equal to a hashable type (`set` and `frozenset`, `bytearray` and `bytes`)
+    and set-like dict views (`dict.keys()` and `dict.items()`, equal to sets of their content) are indexed through their
+    hashable counterpart, see `hashable_counterpart`. It is assumed that no other unhashable object is equal to a hashable one,
+    which holds for all other builtin types.
+
+    Optional key function replaces objects by keys in all lookups, e.g. `strict_key` for type-aware comparison.
+
+    Only the first occurrence of every distinct object is kept, so memory grows with the number of distinct objects,
+    not with the amount of consumed objects.
+    """
+    def __init__(self, key: Optional[Callable[[Any], Any]] = None):
+        self.key = key
+        self.unique_elements: list = []                      # first occurrences of objects, in order
+        self.first_indices: list[int] = []                   # index of the first occurrence per unique object
+        self.counts: list[int] = []                          # amount of occurrences per unique object
+        self.consumed = 0                                    # amount of consumed objects
+        self.duplicate_flags: list[bool] = []                # flag per unique object, marking it as duplicated
+        self.hashable_index: dict[Any, int] = {}             # position of hashable keys in 'unique_elements'
+        self.unhashable_index: list[tuple[Any, int]] = []    # (key, position) pairs of unhashable keys
+        self.duplicate_positions: list[int] = []             # positions of duplicated objects, in order of detection
+        self.snapshot: Optional[list] = []                   # cached output of 'duplicates', None if outdated
+
+    def __repr__(self):
+        class_name = type(self).__name__
+        return f"{class_name}(distinct={len(self.unique_elements)!r}, duplicates={len(self.duplicate_positions)!r})"
+
+    def add(self, element: Any) -> bool:
+        """Consumes a single object.
+
+        Args:
+            element (Any): consumed object
+
+        Returns:
+            bool: True if the object has just become a duplicate, i.e. it was seen exactly once before.
+        """
+        if self.key is not None:
+            key = self.key(element)
+        else:
+            key = hashable_counterpart(element)
+        try:
+            position = self.hashable_index.get(key, None)
+            hashable = True
+        except TypeError:
+            position = find_unhashable(self.unhashable_index, key)
+            hashable = False
+
+        index = self.consumed
+        self.consumed += 1
+        if position is None:
+            # adding unique elements while respecting their ordering
+            position = len(self.unique_elements)
+            self.unique_elements.append(element)
+            self.first_indices.append(index)
+            self.counts.append(1)
+            self.duplicate_flags.append(False)
+            if hashable:
+                self.hashable_index[key] = position
+            else:
+                self.unhashable_index.append((key, position))
+            return False
+
+        self.counts[position] += 1
+        if self.duplicate_flags[position]:
+            return False
+        self.duplicate_flags[position] = True
+        self.duplicate_positions.append(position)
+        self.snapshot = None
+        return True
+
+    def extend(self, elements: Iterable) -> None:
+        """Consumes all objects of an iterable.
+
+        Args:
+            elements (Iterable): consumed objects, the iterable may be unbounded
+        """
+        for element in elements:
+            self.add(element)
+
+    def iter_duplicates(self, elements: Iterable) -> Iterator:
+        """Consumes objects of an iterable lazily and yields every object at the moment it becomes a duplicate.
+
+        Yielded object is the first occurrence, the same one which is returned by 'duplicates' method.
+
+        Args:
+            elements (Iterable): consumed objects, the iterable may be unbounded
+
+        Yields:
+            Iterator: objects in order of their duplication
+        """
+        for element in elements:
+            if self.add(element):
+                yield self.unique_elements[self.duplicate_positions[-1]]
+
+    def duplicates(self) -> list:
+        """Returns duplicates consumed so far, ordered by their first occurrence.
+
+        The result is cached until another duplicate is detected, so repeated calls are cheap.
+
+        Returns:
+            list: list of duplicate objects ordered in FIFO. If there are no duplicates, returns an empty list.
+        """
+        if self.snapshot is None:
+            self.snapshot = [self.unique_elements[position] for position in sorted(self.duplicate_positions)]
+        return list(self.snapshot)
+
+    def occurrences(self) -> list[tuple[Any, int, int]]:
+        """Returns duplicates consumed so far together with index of their first occurrence and amount of occurrences.
+
+        Returns:
+            list[tuple[Any, int, int]]: (duplicate object, index of its first occurrence, amount of occurrences)
+                                        ordered in FIFO. If there are no duplicates, returns an empty list.
+        """
+        return [(self.unique_elements[position], self.first_indices[position], self.counts[position])
+                for position in sorted(self.duplicate_positions)]
+
+
+def detect_duplicate_elements_parallel(elements: list, workers: Optional[int] = None, threshold: int = PARALLEL_THRESHOLD,
+                                       strict: bool = False) -> list:
+    """Detects duplicate objects by hash partitioning the list into shards, which are processed by a pool of processes.
+
+    Equal objects share their hash and therefore their shard, unhashable objects are collected in a shard of their own.
+    Every shard reports global indices of first occurrences of its duplicates, and merging these sorted index lists
+    restores the same ordering, which is given by `detect_duplicate_elements_hybrid`.
+
+    On Linux, workers are forked and read the list inherited from the parent, so only index arrays are pickled.
+    Partitioning is parallel as well: every worker hashes a contiguous range of the list and returns global indices
+    of its objects per shard, which are concatenated in order of the ranges (forked workers share the string hash seed
+    of the parent, so equal objects land in the same shard).
+    Elsewhere, workers are spawned with their own string hash seeds, so the parent partitions the list itself
+    and shards of the list are pickled to the workers, objects therefore have to be picklable.
+
+    Args:
+        elements (list): list of objects with possible duplicates
+        workers (Optional[int], optional): number of worker processes, None uses all CPUs. Defaults to None.
+        threshold (int, optional): lists shorter than threshold are processed serially. Defaults to PARALLEL_THRESHOLD.
+        strict (bool, optional): objects are compared by their `strict_key`. Defaults to False.
+
+    Returns:
+        list: list of duplicate objects in the `elements` list ordered in FIFO.
+              If there are no duplicates, returns an empty list.
+    """
+    global SHARED_ELEMENTS
+    workers = workers or os.cpu_count() or 1
+    if workers < 2 or len(elements) < threshold:
+        return detect_duplicate_elements_hybrid(elements, strict)
+
+    shared = FORK_WORKERS
+    # the last shard collects unhashable objects
+    shards = workers + 1
+    range_size = -(-len(elements) // workers)
+    starts = range(0, len(elements), range_size)
+    SHARED_ELEMENTS = elements if shared else []
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("fork" if shared else "spawn")) as executor:
+            partitions: Iterable[list[array]]
+            if shared:
+                partitions = executor.map(partition_shard_indices, starts, [range_size] * len(starts), [None] * len(starts),
+                                          [shards] * len(starts), [strict] * len(starts))
+            else:
+                # string hashes differ between spawned processes, so all objects are hashed by the parent
+                partitions = [partition_shard_indices(0, len(elements), elements, shards, strict)]
+            shard_indices = [array('q') for _ in range(shards)]
+            for partition in partitions:
+                for indices, range_indices in zip(shard_indices, partition):
+                    indices.extend(range_indices)
+            shard_elements = [None if shared else [elements[index] for index in indices] for indices in shard_indices]
+            shard_results = list(executor.map(find_shard_duplicates, shard_indices, shard_elements, [strict] * shards))
+    finally:
+        SHARED_ELEMENTS = []
+
+    return [elements[index] for index in merge(*shard_results)]
+
+
+def lookup_key(element: Any, strict: bool = False) -> Any:
+    """Returns the key, by which an object is looked up in a dict (see `DuplicateTracker`) and assigned to a shard.
+    """
+    if strict:
+        return strict_key(element)
+    return hashable_counterpart(element)
+
+
+def partition_shard_indices(start: int, size: int, elements: Optional[list], shards: int, strict: bool = False) -> list[array]:
+    """Assigns objects of a range of the list to shards, runs in forked workers of `detect_duplicate_elements_parallel`.
+
+    Spawned workers hash strings with different seeds, so without forking the whole list is partitioned by the parent.
+
+    Args:
+        start (int): global index of the first object of the range
+        size (int): length of the range
+        elements (Optional[list]): objects of the range, None reads them from the list inherited from the parent
+        shards (int): amount of shards, the last one collects unhashable objects
+        strict (bool, optional): objects are compared by their `strict_key`. Defaults to False.
+
+    Returns:
+        list[array]: ascending global indices of objects of every shard
+    """
+    if elements is None:
+        elements = SHARED_ELEMENTS[start:start + size]
+    partition = [array('q') for _ in range(shards)]
+    hashed_shards = shards - 1
+    for index, element in enumerate(elements, start):
+        try:
+            shard = hash(lookup_key(element, strict)) % hashed_shards
+        except TypeError:
+            shard = hashed_shards
+        partition[shard].append(index)
+    return partition
+
+
+def find_shard_duplicates(indices: Sequence[int], elements: Optional[list], strict: bool = False) -> list[int]:
+    """Worker function of `detect_duplicate_elements_parallel`, processing a single shard.
+
+    Args:
+        indices (Sequence[int]): ascending global indices of objects in the shard
+        elements (Optional[list]): objects in the shard, None reads them from the list inherited from the parent
+        strict (bool, optional): objects are compared by their `strict_key`. Defaults to False.
+
+    Returns:
+        list[int]: sorted global indices of first occurrences of duplicate objects
+    """
+    tracker = DuplicateTracker(strict_key if strict else None)
+    tracker.extend(elements if elements is not None else map(SHARED_ELEMENTS.__getitem__, indices))
+    return sorted(indices[tracker.first_indices[position]] for position in tracker.duplicate_positions)
+
+
+def find_unhashable(unhashable_index: list[tuple[Any, int]], element: Any) -> Optional[int]:
+    """Linear lookup of an unhashable object (or key), mirroring semantics of `in` operator on lists.
+
+    Args:
+        unhashable_index (list[tuple[Any, int]]): pairs of already seen unhashable objects and their positions
+        element (Any): looked up object
+
+    Returns:
+        Optional[int]: position of the equal object, None if the object was not seen yet
+    """
+    for candidate, position in unhashable_index:
+        if candidate is element or candidate == element:
+            return position
+    return None
+
+
 # examples
 if __name__ == "__main__":
     list1 = ["b", "a", "c", "c", "e", "a", "c", "d", "c", "d"]
@@ -0,0 +1,211 @@
+"""
+Extension of exercise one, detecting duplicates in inputs which do not fit into memory.
+
+Elements are read from a text stream, either one string element per line, or one JSON value per line (NDJSON).
+Duplicates are found by an external sort:
+    1. input is cut into runs of bounded size, every run is sorted by (key, index) and spilled to a temporary file,
+    2. runs are merged, equal keys become adjacent and every duplicate key yields index of its first occurrence,
+       these (index, element) pairs are spilled into runs sorted by index,
+    3. second set of runs is merged by index, which streams duplicates in order of their first occurrence.
+
+Memory is therefore bounded by the run size, regardless of the input length.
+
+Assumptions taken:
+    - JSON values are compared by a canonical key, which upholds the pythonic typecasting (`1 == 1. == true`),
+      with the exception of NaN, which is considered equal to NaN,
+    - amount of runs is small enough to keep all of them open while merging.
+"""
+
+# system imports
+import json
+import os
+from heapq import merge
+from itertools import groupby
+from tempfile import TemporaryDirectory
+from typing import Any, Iterable, Iterator, TextIO
+
+# third-party imports
+# local imports
+from .defaults import INPUT_FORMATS, RUN_SIZE
+from .exercise_one import DuplicateTracker
+
+
+def read_elements(stream: TextIO, input_format: str = "lines") -> Iterator:
+    """Lazily reads elements from a text stream.
+
+    Args:
+        stream (TextIO): text stream, e.g. opened file or stdin
+        input_format (str, optional): 'lines' for one string per line, 'ndjson' for one JSON value per line. Defaults to "lines".
+
+    Raises:
+        ValueError: raises if 'input_format' is not supported.
+
+    Yields:
+        Iterator: elements of the stream, blank lines are skipped in 'ndjson' format
+    """
+    if input_format not in INPUT_FORMATS:
+        raise ValueError(f"Unsupported input format {input_format!r}, use one of {INPUT_FORMATS!r}")
+    for line in stream:
+        line = line.rstrip("\r\n")
+        if input_format == "lines":
+            yield line
+        elif line.strip():
+            yield json.loads(line)
+
+
+def format_element(element: Any, input_format: str = "lines") -> str:
+    """Formats an element for output, in the same format as it was read.
+
+    Args:
+        element (Any): element read by 'read_elements'
+        input_format (str, optional): 'lines' or 'ndjson'. Defaults to "lines".
+
+    Returns:
+        str: single output line without line break
+    """
+    return element if input_format == "lines" else json.dumps(element)
+
+
+def canonical_key(value: Any) -> str:
+    """Builds a string key of a JSON value, such that keys are equal exactly if values are equal in Python.
+
+    Args:
+        value (Any): value decoded from JSON
+
+    Returns:
+        str: canonical key
+    """
+    if isinstance(value, str):
+        return json.dumps(value)
+    if value is None:
+        return "null"
+    if isinstance(value, (bool, int)):
+        return str(int(value))
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() else repr(value)
+    if isinstance(value, list):
+        return "[" + ",".join(canonical_key(item) for item in value) + "]"
+    return "{" + ",".join(f"{json.dumps(key)}:{canonical_key(value[key])}" for key in sorted(value)) + "}"
+
+
+def iter_duplicates(stream: TextIO, input_format: str = "lines") -> Iterator[str]:
+    """Streams duplicates of an input stream in order of their first occurrence, keeping distinct elements in memory.
+
+    Args:
+        stream (TextIO): text stream, e.g. opened file or stdin
+        input_format (str, optional): 'lines' or 'ndjson'. Defaults to "lines".
+
+    Yields:
+        Iterator[str]: formatted duplicate elements
+    """
+    tracker = DuplicateTracker()
+    tracker.extend(read_elements(stream, input_format))
+    for duplicate in tracker.duplicates():
+        yield format_element(duplicate, input_format)
+
+
+def iter_duplicates_external(stream: TextIO, input_format: str = "lines", run_size: int = RUN_SIZE) -> Iterator[str]:
+    """Streams duplicates of an input stream in order of their first occurrence, keeping at most 'run_size' records in memory.
+
+    Args:
+        stream (TextIO): text stream, e.g. opened file or stdin
+        input_format (str, optional): 'lines' or 'ndjson'. Defaults to "lines".
+        run_size (int, optional): maximal amount of records held in memory. Defaults to RUN_SIZE.
+
+    Raises:
+        ValueError: raises if 'run_size' is not positive.
+
+    Yields:
+        Iterator[str]: formatted duplicate elements
+    """
+    if run_size < 1:
+        raise ValueError(f"Run size has to be positive, got {run_size!r}")
+
+    with TemporaryDirectory(prefix="detect-duplicate-") as spill_directory:
+        # 1. spilling input into runs sorted by key and index
+        records = ((canonical_key(element) if input_format == "ndjson" else element, index, format_element(element, input_format))
+                   for index, element in enumerate(read_elements(stream, input_format)))
+        key_runs = spill_runs(records, run_size, spill_directory, "key", sort_key=lambda record: (record[0], record[1]))
+
+        # 2. merging runs by key, spilling first occurrences of duplicate keys into runs sorted by index
+        key_records = merge(*(read_run(path) for path in key_runs), key=lambda record: (record[0], record[1]))
+        index_runs = spill_runs(iter_first_occurrences(key_records), run_size, spill_directory, "index", sort_key=lambda record: record[0])
+        remove_runs(key_runs)
+
+        # 3. merging runs by index
+        for _, formatted_element in merge(*(read_run(path) for path in index_runs), key=lambda record: record[0]):
+            yield formatted_element
+        remove_runs(index_runs)
+
+
+def iter_first_occurrences(key_records: Iterable[list]) -> Iterator[list]:
+    """Picks first occurrences of duplicate keys out of records sorted by key and index.
+
+    Args:
+        key_records (Iterable[list]): (key, index, formatted element) records sorted by key and index
+
+    Yields:
+        Iterator[list]: (index, formatted element) records of first occurrences of duplicate keys
+    """
+    for _, group in groupby(key_records, key=lambda record: record[0]):
+        first_record = next(group)
+        if next(group, None) is not None:
+            yield first_record[1:]
+
+
+def spill_runs(records: Iterable, run_size: int, spill_directory: str, prefix: str, sort_key: Any) -> list[str]:
+    """Cuts records into sorted runs of at most 'run_size' records and writes them into temporary files.
+
+    Args:
+        records (Iterable): JSON serializable records
+        run_size (int): maximal amount of records in a run
+        spill_directory (str): directory holding the runs
+        prefix (str): prefix of run file names
+        sort_key (Any): key function used to sort records of a run
+
+    Returns:
+        list[str]: paths to the runs
+    """
+    paths: list[str] = []
+    run: list = []
+
+    def flush():
+        run.sort(key=sort_key)
+        path = os.path.join(spill_directory, f"{prefix}-{len(paths)}.ndjson")
+        with open(path, "w", encoding="utf-8") as run_file:
+            for record in run:
+                run_file.write(json.dumps(record) + "\n")
+        paths.append(path)
+        run.clear()
+
+    for record in records:
+        run.append(record)
+        if len(run) >= run_size:
+            flush()
+    if run:
+        flush()
+    return paths
+
+
+def read_run(path: str) -> Iterator[list]:
+    """Lazily reads records of a run written by 'spill_runs'.
+
+    Args:
+        path (str): path to the run
+
+    Yields:
+        Iterator[list]: records of the run
+    """
+    with open(path, encoding="utf-8") as run_file:
+        for line in run_file:
+            yield json.loads(line)
+
+
+def remove_runs(paths: list[str]) -> None:
+    """Removes already merged runs, to release disk space before the temporary directory is cleaned up.
+
+    Args:
+        paths (list[str]): paths to the runs
+    """
+    for path in paths:
+        os.remove(path)
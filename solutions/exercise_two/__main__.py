@@ -1,4 +1,23 @@
+# system imports
+import argparse
+
+# local imports
+from .defaults import TARGET_PATH
 from .exercise_two import show_dependency_graph
+from .exporters import OUTPUT_FORMATS
+from .renderer import RENDER_MODES
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m exercise_two", description="Prints the resolved dependency graph of a JSON file.")
+    parser.add_argument("-f", "--file_path", default=TARGET_PATH, help="path to a JSON file containing dependency relations")
+    parser.add_argument("-m", "--mode", default="tree", choices=RENDER_MODES, help="render mode of 'text' format")
+    parser.add_argument("-d", "--max-depth", type=int, default=None, help="deepest printed level of 'text' format")
+    parser.add_argument("--format", dest="output_format", default="text", choices=OUTPUT_FORMATS, help="output format")
+    # like the original entry point, which took no arguments, unknown arguments are ignored
+    args, _ = parser.parse_known_args(argv)
+    show_dependency_graph(args.file_path, args.mode, args.max_depth, output_format=args.output_format)
+
 
 if __name__ == '__main__':
-    show_dependency_graph()
+    main()
@@ -0,0 +1,67 @@
+"""
+Resolution of many dependency files in a single process.
+
+Every file is resolved on its own and described by a JSON serializable record, so the results can be streamed
+as NDJSON (one record per file). Failures are reported per file as well: a missing or invalid file, missing packages
+or cycles produce an error record and the batch continues with the next file.
+
+Resolving all files in one process pays the interpreter startup and the imports only once, which dominates
+the run time of many invocations on small files.
+"""
+
+# system imports
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Union
+
+# local imports
+from .errors import CyclicDependencyError, MissingPackageError
+from .exercise_two import DependencyResolver
+from .instrumentation import graph_counters
+
+
+# exceptions reported as failures of a single file, other exceptions abort the batch
+BATCH_ERRORS = (OSError, ValueError, TypeError, MissingPackageError, CyclicDependencyError)
+
+
+def batch_record(file_path: Union[str, Path], resolver: DependencyResolver, adjacency: bool = False) -> dict[str, Any]:
+    """Resolves a single dependency file into a result record.
+
+    Args:
+        file_path (Union[str, Path]): JSON file containing dependency relations
+        resolver (DependencyResolver): resolver shared by the batch, e.g. with a graph cache
+        adjacency (bool, optional): adds direct dependencies of every package, in resolution order. Defaults to False.
+
+    Returns:
+        dict[str, Any]: 'path', 'ok' and either graph counters (see 'graph_counters') or 'error' type and 'message'
+                        ('cycles' are added for cyclic dependencies)
+    """
+    record: dict[str, Any] = dict(path=str(file_path))
+    try:
+        graph = resolver.resolve_compact_graph(file_path)
+    except BATCH_ERRORS as exc:
+        record.update(ok=False, error=type(exc).__name__, message=str(exc))
+        if isinstance(exc, CyclicDependencyError):
+            record["cycles"] = exc.cycles
+        return record
+
+    record.update(ok=True, **graph_counters(graph))
+    if adjacency:
+        record["dependencies"] = {name: [dependency.name for dependency in package.dependencies] for name, package in graph.items()}
+    return record
+
+
+def resolve_batch(paths: Iterable[Union[str, Path]], resolver: Optional[DependencyResolver] = None,
+                  adjacency: bool = False) -> Iterator[dict[str, Any]]:
+    """Lazily resolves dependency files one by one, yielding a record per file, see 'batch_record'.
+
+    Args:
+        paths (Iterable[Union[str, Path]]): paths of dependency files, consumed lazily (e.g. lines of stdin)
+        resolver (Optional[DependencyResolver], optional): resolver, e.g. with a graph cache. Defaults to None.
+        adjacency (bool, optional): adds direct dependencies of every package to the records. Defaults to False.
+
+    Returns:
+        Iterator[dict[str, Any]]: records in order of 'paths'
+    """
+    dr = resolver or DependencyResolver()
+    for file_path in paths:
+        yield batch_record(file_path, dr, adjacency)
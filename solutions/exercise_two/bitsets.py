@@ -0,0 +1,40 @@
+"""
+Helpers of sets of package ids stored as Python ints (bit `i` is set if the set contains id `i`).
+
+Both helpers take time linear in the length of the bitset, see 'reachability' and 'exporters' modules.
+"""
+
+
+def iter_bits(bitset: int) -> list[int]:
+    """Returns positions of set bits in ascending order.
+
+    Args:
+        bitset (int): bitset
+
+    Returns:
+        list[int]: positions of set bits
+    """
+    # binary digits from the lowest bit, searched for ones in a single linear pass
+    digits = bin(bitset)[:1:-1]
+    positions = []
+    position = digits.find("1")
+    while position >= 0:
+        positions.append(position)
+        position = digits.find("1", position + 1)
+    return positions
+
+
+def bit_count(bitset: int) -> int:
+    """Returns amount of set bits.
+
+    Uses `int.bit_count` on Python 3.10 and newer, older versions count ones of the binary representation.
+
+    Args:
+        bitset (int): bitset
+
+    Returns:
+        int: amount of set bits
+    """
+    if hasattr(bitset, "bit_count"):
+        return bitset.bit_count()
+    return bin(bitset).count("1")  # pragma: no cover
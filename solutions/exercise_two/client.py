@@ -0,0 +1,80 @@
+"""
+Lightweight client of the resolver daemon (see module 'daemon').
+
+The module imports only the standard library modules needed to talk to the Unix socket,
+so queries from shell scripts do not pay for importing and resolving the graph.
+"""
+
+# system imports
+import getpass
+import json
+import os
+import socket
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, Union
+
+
+# default timeout of connecting to the daemon, in seconds
+CONNECT_TIMEOUT = 10.0
+
+
+def default_socket_path() -> str:
+    """Returns the default path of the daemon socket, private to the current user.
+
+    The socket is placed in $XDG_RUNTIME_DIR, which is accessible only to its user. Without it, the socket is placed
+    in a per-user directory of the temporary directory, which the daemon creates accessible only to its owner,
+    so other users can neither connect to the socket nor replace it.
+
+    Returns:
+        str: path of the socket
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "exercise_two.sock")
+    user = str(os.getuid()) if hasattr(os, "getuid") else getpass.getuser()
+    return os.path.join(tempfile.gettempdir(), f"exercise_two-{user}", "daemon.sock")
+
+
+# default path of the daemon socket
+DEFAULT_SOCKET_PATH = default_socket_path()
+
+
+class DaemonQueryError(Exception):
+    """
+    Raised if the daemon answers a query with an error
+    """
+    ...
+
+
+def query(request: dict, socket_path: Union[str, Path] = DEFAULT_SOCKET_PATH, timeout: Optional[float] = None,
+          connect_timeout: float = CONNECT_TIMEOUT) -> Any:
+    """Sends a single request to the daemon and returns its result.
+
+    Args:
+        request (dict): request with a 'command' field, see module 'daemon' for the protocol
+        socket_path (Union[str, Path], optional): path to the daemon socket. Defaults to DEFAULT_SOCKET_PATH.
+        timeout (Optional[float], optional): timeout of waiting for the answer in seconds, e.g. of rendering a large graph.
+                                             Defaults to None, which waits until the daemon answers.
+        connect_timeout (float, optional): timeout of connecting to the daemon in seconds. Defaults to CONNECT_TIMEOUT.
+
+    Raises:
+        ConnectionError: raises if the daemon closes the connection without an answer,
+        DaemonQueryError: raises if the daemon answers with an error.
+
+    Returns:
+        Any: result of the request
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(connect_timeout)
+        connection.connect(str(socket_path))
+        connection.settimeout(timeout)
+        connection.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with connection.makefile("rb") as answer:
+            line = answer.readline()
+    if not line:
+        raise ConnectionError(f"Daemon at {socket_path} closed the connection without an answer")
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise DaemonQueryError(response.get("error"))
+    return response.get("result")
@@ -0,0 +1,224 @@
+"""
+Compact, array backed representation of a resolved dependency graph.
+
+Every package is interned and identified by an integer id, which is its position in resolution order.
+Dependencies are stored in CSR (compressed sparse row) layout: dependencies of a package with id `i` are ids
+`edges[offsets[i]:offsets[i+1]]`. Both buffers are `array('i')`, so an edge costs 4 bytes instead of a list slot
+pointing to a full Python object.
+
+`PackageView` is a lightweight `__slots__` view over a single package of the graph, which exposes the same interface
+as `Package` (`name`, `dependencies`, `structural_print`, structural equality and hashing), so callers of resolved graphs
+work with both. Structural digests of all packages are computed once, in id (topological) order.
+
+`DependencyResolver.resolve_graph` keeps returning `Package` objects, since callers may rely on them being `Package`
+instances (e.g. `isinstance` checks or building graphs of their own with `build_dependency_graph`). The compact graph
+is returned by `DependencyResolver.resolve_compact_graph` instead, which is used by printing of graphs, the graph cache,
+snapshots and the daemon, so the command line benefits from it without changes of the `resolve_graph` API.
+"""
+
+# system imports
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from hashlib import blake2b
+from typing import Any, Iterable, Iterator, Optional
+
+# local imports
+from .renderer import render_package
+
+
+# size of structural digests in bytes
+DIGEST_SIZE = 16
+# binary serialization header: magic, format version, byte order flag, amount of packages, amount of edges
+SERIALIZATION_HEADER = struct.Struct("<8sHHII")
+SERIALIZATION_MAGIC = b"CMPGRAPH"
+SERIALIZATION_VERSION = 1
+
+
+def structural_digest(name: str, dependency_digests: Iterable[bytes]) -> bytes:
+    """Merkle-style digest of a package, shared by `Package` and `PackageView`.
+
+    Args:
+        name (str): name of the package
+        dependency_digests (Iterable[bytes]): digests of direct dependencies, in order
+
+    Returns:
+        bytes: digest of the package structure
+    """
+    encoded_name = name.encode("utf-8")
+    digest = blake2b(len(encoded_name).to_bytes(8, "little"), digest_size=DIGEST_SIZE)
+    digest.update(encoded_name)
+    for dependency_digest in dependency_digests:
+        digest.update(dependency_digest)
+    return digest.digest()
+
+
+class CompactGraph(Mapping):
+    """Read-only mapping of package names to `PackageView` objects, backed by CSR arrays.
+    """
+    def __init__(self, names: list[str], offsets: array, edges: array, ids: Optional[dict[str, int]] = None):
+        self.names = names
+        self.ids = ids if ids is not None else {name: package_id for package_id, name in enumerate(names)}
+        self.offsets = offsets
+        self.edges = edges
+        self.digests: Optional[list[bytes]] = None
+
+    @classmethod
+    def from_dependency_data(cls, dependency_data: dict[str, list], resolution_order: list[str]) -> 'CompactGraph':
+        """Builds the compact graph out of verified dependency relations.
+
+        Args:
+            dependency_data (dict[str, list]): Verified data containing dependency relations read from a JSON file.
+            resolution_order (list[str]): package names, such that every package follows all of its dependencies
+
+        Returns:
+            CompactGraph: compact graph with package ids assigned in resolution order
+        """
+        names = [sys.intern(name) for name in resolution_order]
+        ids = {name: package_id for package_id, name in enumerate(names)}
+        offsets = array('i', [0])
+        edges = array('i')
+        for name in names:
+            edges.extend(ids[dependency] for dependency in dependency_data[name])
+            offsets.append(len(edges))
+        return cls(names, offsets, edges, ids)
+
+    def to_bytes(self) -> bytes:
+        """Serializes the graph into a binary form, which can be loaded without parsing or verification.
+
+        Layout: header, byte lengths of names, offsets and edges (all 'array('i')' in native byte order), UTF-8 names.
+
+        Returns:
+            bytes: serialized graph
+        """
+        encoded_names = [name.encode("utf-8") for name in self.names]
+        name_lengths = array('i', map(len, encoded_names))
+        header = SERIALIZATION_HEADER.pack(SERIALIZATION_MAGIC, SERIALIZATION_VERSION, sys.byteorder == "little",
+                                           len(self.names), len(self.edges))
+        return b"".join((header, name_lengths.tobytes(), self.offsets.tobytes(), self.edges.tobytes(), *encoded_names))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'CompactGraph':
+        """Loads a graph serialized by 'to_bytes'.
+
+        Args:
+            data (bytes): serialized graph
+
+        Raises:
+            ValueError: raises if data are not a compatible serialized graph.
+
+        Returns:
+            CompactGraph: loaded graph
+        """
+        if len(data) < SERIALIZATION_HEADER.size:
+            raise ValueError("Serialized graph is truncated")
+        magic, version, little_endian, package_count, edge_count = SERIALIZATION_HEADER.unpack_from(data)
+        if magic != SERIALIZATION_MAGIC or version != SERIALIZATION_VERSION or bool(little_endian) != (sys.byteorder == "little"):
+            raise ValueError("Incompatible serialized graph")
+
+        position = SERIALIZATION_HEADER.size
+        buffers = []
+        for length in (package_count, package_count + 1, edge_count):
+            buffer = array('i')
+            buffer.frombytes(data[position:position + length * buffer.itemsize])
+            if len(buffer) != length:
+                raise ValueError("Serialized graph is truncated")
+            buffers.append(buffer)
+            position += length * buffer.itemsize
+        name_lengths, offsets, edges = buffers
+        if position + sum(name_lengths) != len(data):
+            raise ValueError("Serialized graph is truncated")
+
+        names = []
+        for length in name_lengths:
+            names.append(sys.intern(data[position:position + length].decode("utf-8")))
+            position += length
+        return cls(names, offsets, edges)
+
+    def __repr__(self):
+        class_name = type(self).__name__
+        return f"{class_name}(packages={len(self.names)!r}, edges={len(self.edges)!r})"
+
+    def __getitem__(self, name: str) -> 'PackageView':
+        return PackageView(self, self.ids[name])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def dependency_ids(self, package_id: int) -> array:
+        """Returns ids of direct dependencies of a package.
+
+        Args:
+            package_id (int): id of the package
+
+        Returns:
+            array: ids of dependencies, in order of the dependency file
+        """
+        return self.edges[self.offsets[package_id]:self.offsets[package_id + 1]]
+
+    def structural_digest(self, package_id: int) -> bytes:
+        """Returns structural digest of a package, digests of all packages are computed on the first call.
+
+        Ids follow resolution order, so digests of dependencies are always known before the package itself.
+
+        Args:
+            package_id (int): id of the package
+
+        Returns:
+            bytes: digest of the package structure
+        """
+        if self.digests is None:
+            digests: list[bytes] = []
+            for name_id, name in enumerate(self.names):
+                digests.append(structural_digest(name, (digests[dependency_id] for dependency_id in self.dependency_ids(name_id))))
+            self.digests = digests
+        return self.digests[package_id]
+
+
+class PackageView:
+    """View of a single package of `CompactGraph`, mimicking `Package` interface.
+    """
+    __slots__ = ("graph", "package_id")
+
+    def __init__(self, graph: CompactGraph, package_id: int):
+        self.graph = graph
+        self.package_id = package_id
+
+    @property
+    def name(self) -> str:
+        return self.graph.names[self.package_id]
+
+    @property
+    def dependencies(self) -> list['PackageView']:
+        return [PackageView(self.graph, dependency_id) for dependency_id in self.graph.dependency_ids(self.package_id)]
+
+    def __repr__(self):
+        class_name = type(self).__name__
+        dependency_names = [self.graph.names[dependency_id] for dependency_id in self.graph.dependency_ids(self.package_id)]
+        return f"{class_name}(name={self.name!r}, dependencies={dependency_names})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, PackageView) and other.graph is self.graph:
+            return other.package_id == self.package_id
+        try:
+            return True if self.structural_digest() == other.structural_digest() else False
+        except AttributeError:
+            return False
+
+    def __hash__(self) -> int:
+        return hash(self.structural_digest())
+
+    def structural_digest(self) -> bytes:
+        """Returns digest identifying the package name together with its whole dependency structure
+        """
+        return self.graph.structural_digest(self.package_id)
+
+    def structural_print(self, depth_level: int = 0, max_depth: Optional[int] = None):
+        """
+        Convenience method that prints dependency structure of a package
+        """
+        render_package(self, depth_level=depth_level, max_depth=max_depth)
@@ -0,0 +1,257 @@
+"""
+Long-running resolver daemon, answering dependency queries over a Unix socket.
+
+The daemon resolves the dependency file once and keeps the graph (together with its reachability index) in memory.
+The reachability index is built eagerly together with every snapshot, in the background thread of the reload,
+so queries never wait for it. It costs O(V * (V + E) / 64) word operations and up to O(V^2 / 8) bytes for V packages
+and E relations (see 'reachability' module), and during a reload the old and the new snapshot are both in memory.
+The file is polled for changes of its modification time and size, and a changed file is re-resolved in a background
+thread. A new snapshot replaces the old one atomically, so queries always see a consistent graph, and a file which fails
+to resolve keeps the last valid snapshot in place (the error is reported by the 'status' command).
+
+Protocol is line delimited JSON: every request is a single line holding a JSON object with a 'command' field,
+every response is a single line holding {"ok": true, "result": ...} or {"ok": false, "error": "..."}.
+
+Commands:
+    - 'ping', 'status', 'reload', 'shutdown',
+    - 'packages' lists all packages in resolution order,
+    - 'dependencies' and 'dependents' with fields 'package' and optional 'transitive' (defaults to false),
+    - 'depends_on' with fields 'package' and 'dependency',
+    - 'graph' with optional fields 'package', 'mode' and 'max_depth' returns rendered text, see 'renderer' module.
+      The text is rendered in a worker thread, so a large tree does not delay queries of other clients.
+
+See module 'client' for a lightweight client.
+"""
+
+# system imports
+import asyncio
+import io
+import json
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+
+# local imports
+from .client import DEFAULT_SOCKET_PATH
+from .compact_graph import CompactGraph
+from .exercise_two import DependencyResolver
+from .reachability import ReachabilityIndex
+from .renderer import render_graph, render_package
+
+
+# default interval of polling the dependency file for changes, in seconds
+POLL_INTERVAL = 1.0
+
+
+class GraphSnapshot:
+    """Immutable state of the daemon, replaced as a whole on reload.
+
+    The reachability index is built in the constructor, i.e. in the reload worker thread, not on the first query.
+    """
+    def __init__(self, graph: CompactGraph, signature: tuple[int, int], generation: int):
+        self.graph = graph
+        self.index = ReachabilityIndex(graph)
+        self.signature = signature      # (modification time, size) of the resolved file
+        self.generation = generation
+        self.loaded_at = time.time()
+
+
+class ResolverDaemon:
+    """Asyncio server keeping the resolved graph of a single dependency file in memory.
+    """
+    def __init__(self, file_path: Union[str, Path], socket_path: Union[str, Path] = DEFAULT_SOCKET_PATH,
+                 poll_interval: float = POLL_INTERVAL):
+        self.file_path = os.path.abspath(file_path)
+        self.socket_path = str(socket_path)
+        self.poll_interval = poll_interval
+        self.snapshot: Optional[GraphSnapshot] = None
+        self.last_error: Optional[str] = None
+        self.failed_signature: Optional[tuple[int, int]] = None
+        self.stopped: Optional[asyncio.Event] = None
+        self.reload_lock: Optional[asyncio.Lock] = None
+
+    def __repr__(self):
+        class_name = type(self).__name__
+        return f"{class_name}(file_path={self.file_path!r}, socket_path={self.socket_path!r})"
+
+    def file_signature(self) -> tuple[int, int]:
+        stat = os.stat(self.file_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def build_snapshot(self, generation: int) -> GraphSnapshot:
+        """Resolves the dependency file, runs in a worker thread.
+        """
+        signature = self.file_signature()
+        graph = DependencyResolver().resolve_compact_graph(self.file_path)
+        return GraphSnapshot(graph, signature, generation)
+
+    async def reload(self) -> bool:
+        """Re-resolves the dependency file in background and swaps the snapshot.
+
+        Returns:
+            bool: True if the new snapshot is in place, False if resolution failed and the old snapshot is kept
+        """
+        if self.reload_lock is None:
+            self.reload_lock = asyncio.Lock()
+        async with self.reload_lock:
+            generation = self.snapshot.generation + 1 if self.snapshot is not None else 0
+            try:
+                snapshot = await asyncio.get_running_loop().run_in_executor(None, self.build_snapshot, generation)
+            except Exception as exc:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                return False
+            self.snapshot = snapshot
+            self.last_error = None
+            return True
+
+    async def watch(self) -> None:
+        """Polls the dependency file and reloads it once its modification time or size change.
+        """
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                signature = self.file_signature()
+            except OSError as exc:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                continue
+            if self.snapshot is not None and signature in (self.snapshot.signature, self.failed_signature):
+                continue
+            if not await self.reload():
+                # failed content is not retried until the file changes again
+                self.failed_signature = signature
+
+    async def serve(self) -> None:
+        """Resolves the file and serves queries until the 'shutdown' command.
+
+        Raises:
+            RuntimeError: raises if another daemon already listens on the socket.
+        """
+        self.stopped = asyncio.Event()
+        if not await self.reload():
+            raise RuntimeError(f"Dependency file {self.file_path} could not be resolved. {self.last_error}")
+        self.prepare_socket_dir()
+        self.remove_stale_socket()
+
+        server = await asyncio.start_unix_server(self.handle_client, path=self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        watcher = asyncio.create_task(self.watch())
+        try:
+            async with server:
+                await self.stopped.wait()
+        finally:
+            watcher.cancel()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def prepare_socket_dir(self) -> None:
+        """Creates the directory of the socket, accessible only to the current user.
+
+        Raises:
+            RuntimeError: raises if the directory of the default socket is owned by another user or accessible to others.
+        """
+        directory = os.path.dirname(self.socket_path) or "."
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if self.socket_path != DEFAULT_SOCKET_PATH or not hasattr(os, "getuid"):
+            return
+        stat = os.stat(directory)
+        if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+            raise RuntimeError(f"Socket directory {directory} is not private to the current user")
+
+    def remove_stale_socket(self) -> None:
+        if not os.path.exists(self.socket_path):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                os.remove(self.socket_path)
+                return
+        raise RuntimeError(f"Another daemon is already listening on {self.socket_path}")
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answers requests of a single connection, one response line per request line.
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Request has to be a JSON object")
+                    response = {"ok": True, "result": await self.dispatch(request)}
+                except Exception as exc:
+                    response = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def dispatch(self, request: dict) -> Any:
+        """Executes a single request.
+
+        Args:
+            request (dict): decoded request
+
+        Raises:
+            ValueError: raises if the command is unknown,
+            KeyError: raises if a requested package is not in the graph.
+
+        Returns:
+            Any: JSON serializable result
+        """
+        command = request.get("command")
+        if command == "reload":
+            return await self.reload()
+        if command == "shutdown":
+            if self.stopped is not None:
+                self.stopped.set()
+            return True
+
+        # single read of the snapshot, so a concurrent reload cannot mix two graphs in one answer
+        snapshot = self.snapshot
+        if snapshot is None:
+            raise RuntimeError("Dependency graph is not resolved yet")
+        transitive = bool(request.get("transitive", False))
+        if command == "ping":
+            return "pong"
+        if command == "status":
+            return dict(file_path=self.file_path, packages=len(snapshot.graph), generation=snapshot.generation,
+                        loaded_at=snapshot.loaded_at, last_error=self.last_error)
+        if command == "packages":
+            return list(snapshot.graph)
+        if command == "dependencies":
+            package = request["package"]
+            if transitive:
+                return snapshot.index.all_dependencies(package)
+            return [dependency.name for dependency in snapshot.graph[package].dependencies]
+        if command == "dependents":
+            return snapshot.index.dependents(request["package"], transitive)
+        if command == "depends_on":
+            return snapshot.index.depends_on(request["package"], request["dependency"])
+        if command == "graph":
+            # rendering is proportional to the size of the (possibly exponential) tree, so it must not block other clients
+            return await asyncio.get_running_loop().run_in_executor(None, self.render, snapshot, request)
+        raise ValueError(f"Unknown command {command!r}")
+
+    @staticmethod
+    def render(snapshot: GraphSnapshot, request: dict[str, Any]) -> str:
+        """Renders the graph of a snapshot (or a subtree of a single package) for the 'graph' command, runs in a worker thread.
+        """
+        stream = io.StringIO()
+        if request.get("package") is not None:
+            render_package(snapshot.graph[request["package"]], stream, max_depth=request.get("max_depth"))
+        else:
+            render_graph(snapshot.graph, stream, request.get("mode", "tree"), request.get("max_depth"))
+        return stream.getvalue()
+
+
+def run_daemon(file_path: Union[str, Path], socket_path: Union[str, Path] = DEFAULT_SOCKET_PATH,
+               poll_interval: float = POLL_INTERVAL) -> None:
+    """
+    Convenience method running the daemon in the current thread, until it receives the 'shutdown' command.
+    """
+    asyncio.run(ResolverDaemon(file_path, socket_path, poll_interval).serve())
@@ -0,0 +1,14 @@
+"""
+Default values shared by the package and its command line interface.
+
+The module has no imports, so the command line interface can define its options (and print '--help')
+without importing the resolver and its dependencies.
+"""
+
+
+# default path of the dependency file
+TARGET_PATH = "/tmp/deps.json"
+# environment variable overriding default cache directory
+CACHE_DIR_VARIABLE = "EXERCISE_TWO_CACHE_DIR"
+# supported policies for packages defined in more than one manifest
+CONFLICT_POLICIES = ("error", "first", "last", "union")
@@ -0,0 +1,30 @@
+"""
+Exceptions raised during verification and resolution of dependency files.
+"""
+
+# system imports
+from typing import Optional
+
+
+class CyclicDependencyError(Exception):
+    """
+    Raised if cyclic dependency is detected during verification of the dependency file.
+    Attribute 'cycles' holds package names of every detected cycle (strongly connected component).
+    """
+    def __init__(self, message: str, cycles: Optional[list[list[str]]] = None):
+        super().__init__(message)
+        self.cycles: list[list[str]] = cycles if cycles is not None else []
+
+
+class MissingPackageError(Exception):
+    """
+    Raised if a missing package is detected during verification of the dependency file
+    """
+    ...
+
+
+class ConflictingPackageError(Exception):
+    """
+    Raised if merged manifests define the same package with different dependencies
+    """
+    ...
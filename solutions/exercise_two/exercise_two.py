@@ -41,61 +41,107 @@ Assumptions taken:
     - other file extensions are allowed, if JSON decoder can extract valid JSON out of them ('.txt').
     - order of listed packages does not influence the validity of a solution
 
-Possible improvements:
-    -current recursive scheme is inefficient, one builds package chains repeatedly,
-     while it would be much more interesting to "cache" the results on recursion method return
+Resolution scheme:
+    - packages are ordered by an iterative Tarjan's algorithm, which runs in O(V+E) and does not depend on interpreter
+      recursion limit, its strongly connected components are emitted in post-order,
+    - every component of more than one package (or a package importing itself) is a cycle, all of them are reported,
+    - in absence of cycles, packages are built in the post-order, so every dependency is resolved (and cached) before
+      packages depending on it.
 """
 
 # system imports
 import os
-from json import load, JSONDecodeError
-from typing import Union, Any
+from collections.abc import Mapping
+from json import loads, JSONDecodeError
+from typing import Union, Any, Optional, Sequence, TextIO, cast
 from pathlib import Path
 
-
-# global variables
-TARGET_PATH = "/tmp/deps.json"
-
-
-class CyclicDependencyError(Exception):
-    """
-    Raised if cyclic dependency is detected during verification of the dependency file
-    """
-    ...
-
-
-class MissingPackageError(Exception):
-    """
-    Raised if a missing package is detected during verification of the dependency file
-    """
-    ...
+# local imports
+from .compact_graph import CompactGraph, structural_digest
+from .defaults import TARGET_PATH
+from .errors import CyclicDependencyError, MissingPackageError
+from .exporters import write_graph
+from .graph_cache import GraphCache
+from .instrumentation import NO_PHASE, PhaseTimer, ResolverHook, graph_counters
+from .renderer import render_package
+from .streaming import CHUNK_SIZE, stream_dependency_data
 
 
 class Package:
     """Class that represents a package, with its dependencies and depth in the dependency graph
+
+    Equality and hashing are structural, based on a Merkle-style digest of the package name and digests of its dependencies.
+    The digest is computed once per package and cached, therefore comparing two graphs costs O(V+E) even for diamond-heavy DAGs.
+    Reassigning 'dependencies' resets the cache of the package, however, packages are expected not to be modified
+    in place after they were compared or hashed.
     """
+    __slots__ = ("name", "_dependencies", "cached_digest")
+
     def __init__(self, name: str):
         self.name = name
         self.dependencies: list['Package'] = []
 
+    @property
+    def dependencies(self) -> list['Package']:
+        return self._dependencies
+
+    @dependencies.setter
+    def dependencies(self, dependencies: list['Package']) -> None:
+        self._dependencies = dependencies
+        self.cached_digest: Optional[bytes] = None
+
     def __repr__(self):
         class_name = type(self).__name__
         return f"{class_name}(name={self.name!r}, dependencies={[dependency.name for dependency in self.dependencies]})"
 
     def __eq__(self, other: Any) -> bool:
         try:
-            ret = True if (self.name == other.name) and (self.dependencies == other.dependencies) else False
+            return True if self.structural_digest() == other.structural_digest() else False
         except AttributeError:
             return False
-        return ret
+        except TypeError:
+            # dependencies are not a list of packages, falling back to plain comparison
+            return True if (self.name == other.name) and (self.dependencies == other.dependencies) else False
+
+    def __hash__(self) -> int:
+        return hash(self.structural_digest())
 
-    def structural_print(self, depth_level: int = 0):
+    def structural_digest(self) -> bytes:
+        """Computes (or retrieves cached) digest of the package structure, without recursion.
+
+        Raises:
+            CyclicDependencyError: raises if packages form a cycle, since such a structure has no digest.
+
+        Returns:
+            bytes: digest identifying the package name together with its whole dependency structure
         """
-        Convenience method that recursively prints dependency structure of a package
+        if self.cached_digest is not None:
+            return self.cached_digest
+
+        in_progress: set[int] = set()
+        # explicit post-order DFS stack of (package, expanded flag)
+        stack: list[tuple[Package, bool]] = [(self, False)]
+        while stack:
+            package, expanded = stack.pop()
+            if package.cached_digest is not None:
+                continue
+            if expanded:
+                package.cached_digest = structural_digest(package.name,
+                                                          (dependency.structural_digest() for dependency in package.dependencies))
+                in_progress.discard(id(package))
+                continue
+            if id(package) in in_progress:
+                raise CyclicDependencyError(f"ERROR: Package {package.name!r} depends on itself")
+            in_progress.add(id(package))
+            stack.append((package, True))
+            stack.extend((dependency, False) for dependency in reversed(package.dependencies) if dependency.cached_digest is None)
+        return cast(bytes, self.cached_digest)
+
+    def structural_print(self, depth_level: int = 0, max_depth: Optional[int] = None):
         """
-        print(f"{depth_level*'  '}- {self.name}")
-        for dep in self.dependencies:
-            dep.structural_print(depth_level+1)
+        Convenience method that prints dependency structure of a package
+        """
+        render_package(self, depth_level=depth_level, max_depth=max_depth)
 
 
 # custom type hints definition
@@ -103,6 +149,34 @@ dependency_tree = dict[str, Package]
 
 
 class DependencyResolver:
+    def __init__(self, cache: Optional[GraphCache] = None, hooks: Optional[Sequence[ResolverHook]] = None):
+        """
+        Args:
+            cache (Optional[GraphCache], optional): persistent cache of compact graphs, used by 'resolve_compact_graph'
+                                                    and 'print_dependency_graph'. Defaults to None (no caching).
+            hooks (Optional[Sequence[ResolverHook]], optional): hooks notified about phases and counters of the resolution,
+                                                                see 'instrumentation' module. Defaults to None.
+        """
+        self.cache = cache
+        self.hooks: list[ResolverHook] = list(hooks) if hooks else []
+
+    def add_hook(self, hook: ResolverHook) -> None:
+        self.hooks.append(hook)
+
+    def phase(self, phase: str) -> Any:
+        """Returns a context manager reporting a phase to the hooks, a shared no-op one if there are no hooks.
+        """
+        return PhaseTimer(phase, self.hooks) if self.hooks else NO_PHASE
+
+    def report_graph(self, graph: Mapping) -> None:
+        """Reports size counters of a resolved graph to the hooks, skipped if there are no hooks.
+        """
+        if not self.hooks:
+            return
+        for name, value in graph_counters(graph).items():
+            for hook in self.hooks:
+                hook.counter(name, value)
+
     def verify_dependency_structure(self, dependency_data: dict[str, list]) -> None:
         """Method verifies if the content of JSON file is valid for further processing.
 
@@ -149,99 +223,293 @@ class DependencyResolver:
                 if dep not in pkgs:
                     raise MissingPackageError(f"ERROR: Package {dep!r} was not found in dependency list")
 
-    def resolve_graph(self, file_path: Union[str, Path]) -> dependency_tree:
-        """A method retrieving 'dependency_tree' structure from a file defined by 'file_path' argument.
+    def find_strongly_connected_components(self, dependency_data: dict[str, list]) -> list[list[str]]:
+        """Iterative Tarjan's algorithm, finding strongly connected components of the dependency graph in O(V+E).
+
+        Packages are visited in order of the 'dependency_data' keys and their dependencies, components are emitted
+        once their root is finished. For an acyclic graph, this is the post-order of a depth first search.
 
         Args:
-            file_path (Union[str, Path]): string or Path objects defining location of JSON dependency structure file
+            dependency_data (dict[str, list]): Verified data containing dependency relations read from a JSON file.
 
-        Raises:
-            FileNotFoundError: if file defined 'file_path' does not exist
         Returns:
-            dependency_tree: a list of structurally constructed Package objects
+            list[list[str]]: strongly connected components in order of their completion
         """
-        def resolve_dependency(pkg: str, recursion_depth: int) -> Package:
-            """Recursive function utilized for building the 'dependency_tree' object.
-            Recursion end once package has no dependencies.
+        index_of: dict[str, int] = {}
+        lowlink: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+        components: list[list[str]] = []
+
+        for root in dependency_data:
+            if root in index_of:
+                continue
+            index_of[root] = lowlink[root] = len(index_of)
+            stack.append(root)
+            on_stack.add(root)
+            # explicit DFS stack of (package, iterator over its dependencies)
+            work = [(root, iter(dependency_data[root]))]
+            while work:
+                pkg, dependencies = work[-1]
+                for dependency in dependencies:
+                    if dependency not in index_of:
+                        index_of[dependency] = lowlink[dependency] = len(index_of)
+                        stack.append(dependency)
+                        on_stack.add(dependency)
+                        work.append((dependency, iter(dependency_data[dependency])))
+                        break
+                    if dependency in on_stack:
+                        lowlink[pkg] = min(lowlink[pkg], index_of[dependency])
+                else:
+                    # all dependencies visited, package is finished
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[pkg])
+                    if lowlink[pkg] == index_of[pkg]:
+                        component: list[str] = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == pkg:
+                                break
+                        components.append(component)
+        return components
+
+    def resolution_order(self, dependency_data: dict[str, list]) -> list[str]:
+        """Orders packages, such that every package follows all of its dependencies.
 
-            Args:
-                pkg (str): name of a package in 'dependency_data'
+        Args:
+            dependency_data (dict[str, list]): Verified data containing dependency relations read from a JSON file.
 
-            Returns:
-                Package: returns a Package with its dependencies
-            """
-            if recursion_depth >= max_recursion_depth:
-                raise CyclicDependencyError(f"Depth of recursion reached its limit {max_recursion_depth!r}")
+        Raises:
+            CyclicDependencyError: raises if the dependency graph contains cycles, all of them are reported.
 
-            package = Package(pkg)
+        Returns:
+            list[str]: package names in resolution order
+        """
+        components = self.find_strongly_connected_components(dependency_data)
+        cycles = [component[::-1] for component in components
+                  if len(component) > 1 or component[0] in dependency_data[component[0]]]
+        if cycles:
+            cycles_description = "; ".join(" -> ".join(cycle) for cycle in cycles)
+            raise CyclicDependencyError(f"ERROR: Cyclic dependencies detected between packages: {cycles_description}", cycles)
+        return [component[0] for component in components]
 
-            for dependency in dependency_data[pkg]:
-                # looking up resolved packages
-                dependency_resolved = dependency_graph.get(dependency, None)
+    def load_dependency_data(self, file_path: Union[str, Path]) -> dict:
+        """Reads dependency relations from a JSON file defined by 'file_path' argument.
 
-                if dependency_resolved is None:
-                    # stepping deeper with recursion, adding Packages in dependencies with one bigger depth
-                    dependency_resolved = resolve_dependency(dependency, recursion_depth+1)
+        Args:
+            file_path (Union[str, Path]): string or Path objects defining location of JSON dependency structure file
 
-                package.dependencies.append(dependency_resolved)
-            # caching resolved package
-            if dependency_graph.get(pkg, None) is None:
-                dependency_graph[pkg] = package
-            return package
+        Raises:
+            FileNotFoundError: if file defined 'file_path' does not exist
 
+        Returns:
+            dict: unverified content of the JSON file
+        """
         # check for existence of a file, shortcircuit for errors
         if os.path.isfile(file_path) is False:
             raise FileNotFoundError(f"Error. File at the path {file_path} does not exist.")
 
         # opens a file with context manager to prevent resource leaking
-        with open(file_path) as json_file:
+        with self.phase("read"), open(file_path) as json_file:
+            content = json_file.read()
+        with self.phase("parse"):
+            try:
+                dependency_data: dict = loads(content)
+            except JSONDecodeError:
+                print(f"File {file_path} does not hold valid JSON format. Exiting program")
+                raise
+        return dependency_data
+
+    def load_dependency_data_streaming(self, file_path: Union[str, Path], chunk_size: int = CHUNK_SIZE) -> dict[str, list]:
+        """Reads dependency relations from a JSON file in chunks, verifying them while parsing.
+
+        Peak memory holds only a chunk of the raw text, and the returned data need no further verification.
+
+        Args:
+            file_path (Union[str, Path]): string or Path objects defining location of JSON dependency structure file
+            chunk_size (int, optional): amount of characters read at once. Defaults to CHUNK_SIZE.
+
+        Raises:
+            FileNotFoundError: if file defined 'file_path' does not exist
+
+        Returns:
+            dict[str, list]: verified dependency relations with interned package names
+        """
+        if os.path.isfile(file_path) is False:
+            raise FileNotFoundError(f"Error. File at the path {file_path} does not exist.")
+
+        with self.phase("parse"), open(file_path) as json_file:
             try:
-                dependency_data: dict = load(json_file)
+                return stream_dependency_data(json_file, chunk_size)
             except JSONDecodeError:
                 print(f"File {file_path} does not hold valid JSON format. Exiting program")
                 raise
+            except TypeError:
+                print("Aborting program due to data structure issues.")
+                raise
+            except MissingPackageError:
+                print("Aborting program due to dependency structure issues.")
+                raise
+
+    def verified_resolution_order(self, dependency_data: dict[str, list], verified: bool = False) -> list[str]:
+        """Verifies dependency relations and orders packages, such that every package follows all of its dependencies.
+
+        Args:
+            dependency_data (dict[str, list]): Data containing dependency relations read from a JSON file.
+            verified (bool, optional): skips verification of data, which were already verified while parsed. Defaults to False.
+
+        Returns:
+            list[str]: package names in resolution order
+        """
         try:
             # checking for validity of data loaded
-            self.verify_dependency_structure(dependency_data)
+            if not verified:
+                with self.phase("verify"):
+                    self.verify_dependency_structure(dependency_data)
+            with self.phase("order"):
+                return self.resolution_order(dependency_data)
         except TypeError:
             print("Aborting program due to data structure issues.")
             raise
         except (MissingPackageError, CyclicDependencyError):
             print("Aborting program due to dependency structure issues.")
             raise
+
+    def resolve_dependency_data(self, dependency_data: dict[str, list], verified: bool = False) -> dependency_tree:
+        """A method verifying dependency relations and building 'dependency_tree' structure out of them.
+
+        Args:
+            dependency_data (dict[str, list]): Data containing dependency relations read from a JSON file.
+            verified (bool, optional): skips verification of data, which were already verified while parsed. Defaults to False.
+
+        Returns:
+            dependency_tree: a list of structurally constructed Package objects
+        """
+        dependency_graph: dict[str, Package] = {}
+        resolution_order = self.verified_resolution_order(dependency_data, verified)
+        with self.phase("build"):
+            for pkg in resolution_order:
+                package = Package(pkg)
+                # all dependencies precede the package in resolution order, therefore they are already resolved
+                package.dependencies = [dependency_graph[dependency] for dependency in dependency_data[pkg]]
+                dependency_graph[pkg] = package
+        self.report_graph(dependency_graph)
+        return dependency_graph
+
+    def resolve_compact_graph(self, file_path: Union[str, Path], streaming: bool = False) -> CompactGraph:
+        """A method retrieving memory efficient 'CompactGraph' from a file defined by 'file_path' argument.
+
+        The returned graph maps package names to 'PackageView' objects, which can be used in place of Package objects.
+
+        Args:
+            file_path (Union[str, Path]): string or Path objects defining location of JSON dependency structure file
+            streaming (bool, optional): parses and verifies the file in chunks, ignored if a cache is used. Defaults to False.
+
+        Raises:
+            FileNotFoundError: if file defined 'file_path' does not exist
+        Returns:
+            CompactGraph: array backed graph with packages in the same order as 'resolve_graph' returns them
+        """
+        if self.cache is not None:
+            hits, misses = self.cache.hits, self.cache.misses
+            with self.phase("cache"):
+                graph = self.cache.get_or_resolve(file_path, lambda content: self.compact_graph_from_content(content, file_path))
+            for hook in self.hooks:
+                hook.counter("cache_hits", self.cache.hits - hits)
+                hook.counter("cache_misses", self.cache.misses - misses)
         else:
-            max_recursion_depth = len(dependency_data)
-            dependency_graph: dict[str, Package] = {}
-            for pkg in dependency_data.keys():
-                if dependency_graph.get(pkg, None) is None:
-                    dependency_graph[pkg] = resolve_dependency(pkg, 0)
+            if streaming:
+                dependency_data = self.load_dependency_data_streaming(file_path)
+            else:
+                dependency_data = self.load_dependency_data(file_path)
+            graph = self.compact_graph_from_data(dependency_data, streaming)
+        self.report_graph(graph)
+        return graph
+
+    def compact_graph_from_data(self, dependency_data: dict[str, list], verified: bool = False) -> CompactGraph:
+        """Verifies and resolves dependency relations into a 'CompactGraph'.
+        """
+        resolution_order = self.verified_resolution_order(dependency_data, verified)
+        with self.phase("build"):
+            return CompactGraph.from_dependency_data(dependency_data, resolution_order)
+
+    def compact_graph_from_content(self, content: bytes, file_path: Union[str, Path]) -> CompactGraph:
+        """Parses, verifies and resolves raw content of a dependency file.
+
+        Args:
+            content (bytes): content of the JSON dependency structure file
+            file_path (Union[str, Path]): location of the file, used in error messages
+
+        Returns:
+            CompactGraph: array backed graph with packages in the same order as 'resolve_graph' returns them
+        """
+        with self.phase("parse"):
+            try:
+                dependency_data: dict = loads(content)
+            except JSONDecodeError:
+                print(f"File {file_path} does not hold valid JSON format. Exiting program")
+                raise
+        return self.compact_graph_from_data(dependency_data)
+
+    def resolve_graph(self, file_path: Union[str, Path], streaming: bool = False) -> dependency_tree:
+        """A method retrieving 'dependency_tree' structure from a file defined by 'file_path' argument.
+
+        Args:
+            file_path (Union[str, Path]): string or Path objects defining location of JSON dependency structure file
+            streaming (bool, optional): parses and verifies the file in chunks, see 'load_dependency_data_streaming'.
+                                        Defaults to False.
 
-            return dependency_graph
+        Raises:
+            FileNotFoundError: if file defined 'file_path' does not exist
+        Returns:
+            dependency_tree: a list of structurally constructed Package objects, see 'resolve_compact_graph'
+                             for a memory efficient graph of package views
+        """
+        if streaming:
+            return self.resolve_dependency_data(self.load_dependency_data_streaming(file_path), verified=True)
+        dependency_data = self.load_dependency_data(file_path)
+        return self.resolve_dependency_data(dependency_data)
 
-    def print_dependency_graph(self, file_path: Union[str, Path]) -> None:
+    def print_dependency_graph(self, file_path: Union[str, Path], mode: str = "tree", max_depth: Optional[int] = None,
+                               stream: Optional[TextIO] = None, output_format: str = "text") -> None:
         """Prints a formatted dependency graph defined by 'file_path' file
 
         Args:
             file_path (Union[str, Path]): JSON file containing dependency relations
+            mode (str, optional): 'tree' (full expansion), 'compact' (shared subtrees once) or 'flat'. Defaults to "tree".
+            max_depth (Optional[int], optional): deepest printed level of dependencies. Defaults to None (no limit).
+            stream (Optional[TextIO], optional): output stream. Defaults to None, which stands for stdout.
+            output_format (str, optional): 'text' or 'json', 'ndjson' and 'dot', see 'exporters' module. Defaults to "text".
         """
-        resolved_graph = self.resolve_graph(file_path)
-
-        for node in resolved_graph.keys():
-            resolved_graph[node].structural_print()
+        resolved_graph = self.resolve_compact_graph(file_path)
+        with self.phase("render"):
+            write_graph(resolved_graph, stream, output_format, mode, max_depth)
 
 
 # convenience methods
-def show_dependency_graph(target_path: str = TARGET_PATH):
+def show_dependency_graph(target_path: str = TARGET_PATH, mode: str = "tree", max_depth: Optional[int] = None,
+                          cache: Optional[GraphCache] = None, hooks: Optional[Sequence[ResolverHook]] = None,
+                          output_format: str = "text", stream: Optional[TextIO] = None):
     """
     Convenience method for invoking dependency graph plot.
     Provides required default path to dependency json at '/tmp/deps.json'.
 
     Args:
         target_path (str, optional): an absolute path to dependency file in json format. Defaults to TARGET_PATH.
+        mode (str, optional): 'tree', 'compact' or 'flat', see 'renderer' module. Defaults to "tree".
+        max_depth (Optional[int], optional): deepest printed level of dependencies. Defaults to None (no limit).
+        cache (Optional[GraphCache], optional): persistent cache of resolved graphs. Defaults to None (no caching).
+        hooks (Optional[Sequence[ResolverHook]], optional): instrumentation hooks, see 'instrumentation' module. Defaults to None.
+        output_format (str, optional): 'text' or 'json', 'ndjson' and 'dot', see 'exporters' module. Defaults to "text".
+        stream (Optional[TextIO], optional): output stream. Defaults to None, which stands for stdout.
     """
-    dr = DependencyResolver()
+    dr = DependencyResolver(cache, hooks)
     # print dependency graph
-    dr.print_dependency_graph(target_path)
+    dr.print_dependency_graph(target_path, mode, max_depth, stream, output_format)
 
 
 def build_dependency_graph(target_path: str = TARGET_PATH) -> dependency_tree:
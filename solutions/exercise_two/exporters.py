@@ -0,0 +1,136 @@
+"""
+Streaming machine readable exports of resolved dependency graphs.
+
+Supported formats:
+    - 'json' writes a single JSON object mapping every package to the list of its direct dependencies,
+    - 'ndjson' writes one JSON record per package with its direct dependencies, amount of its transitive dependencies
+      and its depth (length of the longest dependency chain below the package, 0 for packages without dependencies),
+    - 'dot' writes a Graphviz digraph with a node per package and an edge per direct dependency.
+
+All formats follow the order of the graph, i.e. resolution order, and are written incrementally through
+`BufferedLineWriter`, so memory of 'json' and 'dot' exports does not grow with the size of the graph.
+The 'ndjson' export keeps transitive dependencies (as bitsets) only of packages, whose dependents were not written yet,
+and releases them once their last dependent is written.
+"""
+
+# system imports
+import json
+import sys
+from collections.abc import Mapping
+from typing import Optional, TextIO
+
+# local imports
+from .bitsets import bit_count
+from .renderer import BufferedLineWriter, render_graph
+
+
+# supported export formats
+EXPORT_FORMATS = ("json", "ndjson", "dot")
+# supported output formats, 'text' stands for the indented output of the renderer
+OUTPUT_FORMATS = ("text",) + EXPORT_FORMATS
+
+
+def export_graph(graph: Mapping, stream: Optional[TextIO] = None, export_format: str = "json") -> None:
+    """Writes a resolved dependency graph into a stream in a machine readable format.
+
+    Args:
+        graph (Mapping): resolved graph in resolution order, mapping package names to Package (or PackageView) objects
+        stream (Optional[TextIO], optional): output stream. Defaults to None, which stands for stdout.
+        export_format (str, optional): one of 'json', 'ndjson' or 'dot'. Defaults to "json".
+
+    Raises:
+        ValueError: raises if 'export_format' is not supported.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format {export_format!r}, use one of {EXPORT_FORMATS!r}")
+    writer = BufferedLineWriter(stream if stream is not None else sys.stdout)
+    if export_format == "json":
+        write_json_adjacency(writer, graph)
+    elif export_format == "ndjson":
+        write_ndjson(writer, graph)
+    else:
+        write_dot(writer, graph)
+    writer.flush()
+
+
+def write_graph(graph: Mapping, stream: Optional[TextIO] = None, output_format: str = "text", mode: str = "tree",
+                max_depth: Optional[int] = None) -> None:
+    """Writes a resolved dependency graph as indented text (see 'render_graph') or in an export format.
+
+    Args:
+        graph (Mapping): resolved graph in resolution order, mapping package names to Package (or PackageView) objects
+        stream (Optional[TextIO], optional): output stream. Defaults to None, which stands for stdout.
+        output_format (str, optional): 'text' or one of export formats. Defaults to "text".
+        mode (str, optional): render mode of 'text' format, ignored by exports. Defaults to "tree".
+        max_depth (Optional[int], optional): deepest printed level of 'text' format, ignored by exports. Defaults to None.
+
+    Raises:
+        ValueError: raises if 'output_format' or 'mode' is not supported.
+    """
+    if output_format == "text":
+        render_graph(graph, stream, mode, max_depth)
+    else:
+        export_graph(graph, stream, output_format)
+
+
+def write_json_adjacency(writer: BufferedLineWriter, graph: Mapping) -> None:
+    """Writes the graph as a JSON object, one package per line.
+    """
+    writer.write_line("{")
+    pending: Optional[str] = None
+    for name, package in graph.items():
+        if pending is not None:
+            writer.write_line(pending + ",")
+        pending = f"  {json.dumps(name)}: {json.dumps([dependency.name for dependency in package.dependencies])}"
+    if pending is not None:
+        writer.write_line(pending)
+    writer.write_line("}")
+
+
+def write_ndjson(writer: BufferedLineWriter, graph: Mapping) -> None:
+    """Writes one JSON record per package, with amount of its transitive dependencies and its depth.
+
+    Transitive dependencies are bitsets (Python ints) indexed by positions of packages in the graph.
+    A bitset is kept only until the last dependent of its package is written.
+    """
+    positions: dict[str, int] = {}
+    last_use: dict[str, int] = {}
+    for position, (name, package) in enumerate(graph.items()):
+        positions[name] = position
+        for dependency in package.dependencies:
+            last_use[dependency.name] = position
+
+    # package name -> (bitset of transitive dependencies, depth), for packages with dependents not written yet
+    live: dict[str, tuple[int, int]] = {}
+    for position, (name, package) in enumerate(graph.items()):
+        dependency_names = [dependency.name for dependency in package.dependencies]
+        closure, depth = 0, 0
+        for dependency in dependency_names:
+            dependency_closure, dependency_depth = live[dependency]
+            closure |= dependency_closure | (1 << positions[dependency])
+            depth = max(depth, dependency_depth + 1)
+        record = dict(name=name, dependencies=dependency_names, transitive_dependencies=bit_count(closure), depth=depth)
+        writer.write_line(json.dumps(record))
+        for dependency in dependency_names:
+            if last_use[dependency] == position:
+                live.pop(dependency, None)
+        if last_use.get(name, -1) > position:
+            live[name] = (closure, depth)
+
+
+def dot_id(name: str) -> str:
+    """Quotes a package name as a Graphviz identifier.
+    """
+    return '"' + name.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def write_dot(writer: BufferedLineWriter, graph: Mapping) -> None:
+    """Writes the graph as a Graphviz digraph, every node is followed by edges to its direct dependencies.
+    """
+    writer.write_line("digraph dependencies {")
+    for name, package in graph.items():
+        node = dot_id(name)
+        writer.write_line(f"  {node};")
+        for dependency in package.dependencies:
+            writer.write_line(f"  {node} -> {dot_id(dependency.name)};")
+    writer.write_line("}")
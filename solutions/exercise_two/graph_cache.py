@@ -0,0 +1,316 @@
+"""
+Persistent on-disk cache of resolved dependency graphs.
+
+Entries are keyed by SHA-256 hash of the dependency file content, therefore renamed or copied files share an entry,
+and any change of the content creates a new one. Hashing the file still requires reading it, so an index of
+(modification time, size) per absolute path serves as a fast precheck: if neither changed since the last run,
+the known content hash is used directly and the file is not read at all.
+
+Entries hold the verified and resolved graph in a binary form of `CompactGraph`, so a cache hit skips parsing,
+verification and resolution altogether. Total size of entries is bounded, least recently used entries are evicted first.
+
+The index and a ledger of entries (last use and size of every entry) are loaded once per `GraphCache` object and kept
+in memory, so a lookup costs the same regardless of the size of the cache. They are written back by 'flush'
+(or on exit from the `with` block), merged with changes of concurrent processes. Index paths of evicted entries
+are dropped. The cache directory is scanned only if the index is missing or corrupted.
+
+A pure cache hit (unchanged file with a known entry) does not change the index: recency of the entry is recorded
+in the modification time of the entry file instead, so warm runs never rewrite the index. Eviction, which runs only
+over the size limit, refreshes last uses of the ledger from modification times of entry files.
+
+The cache is best-effort: failures to read or write it are logged and the resolved graph is returned regardless.
+"""
+
+# system imports
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+# local imports
+from .compact_graph import CompactGraph
+from .defaults import CACHE_DIR_VARIABLE
+
+
+# default limit of the total size of cache entries
+MAX_CACHE_BYTES = 256 * 2**20
+# suffix of cache entries
+ENTRY_SUFFIX = ".graph"
+# name of the index of paths (modification time, size, content hash) and of the ledger of entries (last use, size)
+INDEX_FILE = "index.json"
+INDEX_VERSION = 2
+# eviction removes entries until their total size falls below this fraction of the limit
+EVICTION_TARGET = 0.9
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_dir() -> Path:
+    """Returns cache directory, defined by 'EXERCISE_TWO_CACHE_DIR' or 'XDG_CACHE_HOME' environment variables.
+
+    Returns:
+        Path: path to the cache directory, which does not need to exist yet
+    """
+    if os.environ.get(CACHE_DIR_VARIABLE):
+        return Path(os.environ[CACHE_DIR_VARIABLE])
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "exercise_two"
+
+
+class GraphCache:
+    """Content addressed cache of resolved graphs with a size bounded LRU eviction policy.
+
+    Changes of the index are kept in memory until 'flush' is called, the cache can be used as a context manager.
+    """
+    def __init__(self, cache_dir: Union[str, Path, None] = None, max_bytes: int = MAX_CACHE_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.loaded = False
+        self.dirty = False
+        self.paths: dict[str, list] = {}                # absolute path -> [modification time, size, content hash]
+        self.entries: dict[str, list[int]] = {}         # content hash -> [last use, size], the ledger of entries
+        self.total_bytes = 0                            # total size of entries in the ledger
+        self.evicted: set[str] = set()                  # entries evicted since the last flush
+        self.write_failed = False                       # failed writes are logged only once per object
+
+    def __repr__(self):
+        class_name = type(self).__name__
+        return f"{class_name}(cache_dir={str(self.cache_dir)!r}, max_bytes={self.max_bytes!r})"
+
+    def __enter__(self) -> "GraphCache":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.flush()
+
+    def get_or_resolve(self, file_path: Union[str, Path], resolve: Callable[[bytes], CompactGraph]) -> CompactGraph:
+        """Returns the cached graph of a dependency file, or resolves and stores it on a cache miss.
+
+        Args:
+            file_path (Union[str, Path]): path to the dependency file
+            resolve (Callable[[bytes], CompactGraph]): function parsing, verifying and resolving the file content
+
+        Raises:
+            FileNotFoundError: if file defined 'file_path' does not exist
+
+        Returns:
+            CompactGraph: resolved graph
+        """
+        if os.path.isfile(file_path) is False:
+            raise FileNotFoundError(f"Error. File at the path {file_path} does not exist.")
+        path_key = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        self.load()
+
+        content: Optional[bytes] = None
+        indexed = self.paths.get(path_key)
+        if indexed is not None and indexed[:2] == [stat.st_mtime_ns, stat.st_size]:
+            content_hash = indexed[2]
+        else:
+            with open(file_path, "rb") as dependency_file:
+                content = dependency_file.read()
+            content_hash = hashlib.sha256(content).hexdigest()
+
+        graph = self.load_entry(content_hash)
+        if graph is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            if content is None:
+                with open(file_path, "rb") as dependency_file:
+                    content = dependency_file.read()
+                content_hash = hashlib.sha256(content).hexdigest()
+            # resolution raises on invalid content, which is therefore never cached
+            graph = resolve(content)
+            if not self.store_entry(content_hash, graph):
+                return graph
+
+        if indexed != [stat.st_mtime_ns, stat.st_size, content_hash]:
+            self.paths[path_key] = [stat.st_mtime_ns, stat.st_size, content_hash]
+            self.dirty = True
+        return graph
+
+    def entry_path(self, content_hash: str) -> Path:
+        return self.cache_dir / f"{content_hash}{ENTRY_SUFFIX}"
+
+    def load_entry(self, content_hash: str) -> Optional[CompactGraph]:
+        """Loads a cache entry and marks it as recently used.
+
+        Args:
+            content_hash (str): SHA-256 hash of the dependency file content
+
+        Returns:
+            Optional[CompactGraph]: cached graph, None if the entry is missing or corrupted
+        """
+        entry_path = self.entry_path(content_hash)
+        try:
+            data = entry_path.read_bytes()
+            graph = CompactGraph.from_bytes(data)
+        except (OSError, ValueError):
+            return None
+        entry = self.entries.get(content_hash)
+        if entry is None or entry[1] != len(data):
+            self.record_entry(content_hash, len(data))
+            return graph
+        # known entry, its recency is kept by the entry file, so the index stays clean
+        now = time.time_ns()
+        try:
+            os.utime(entry_path, ns=(now, now))
+        except OSError:
+            pass
+        entry[0] = now
+        return graph
+
+    def store_entry(self, content_hash: str, graph: CompactGraph) -> bool:
+        """Atomically stores a cache entry and evicts least recently used entries, if the size limit is exceeded.
+
+        Args:
+            content_hash (str): SHA-256 hash of the dependency file content
+            graph (CompactGraph): resolved graph
+
+        Returns:
+            bool: False if the entry could not be written, or it was evicted right away
+        """
+        data = graph.to_bytes()
+        try:
+            self.atomic_write(self.entry_path(content_hash), data)
+        except OSError as exc:
+            self.log_write_failure(exc)
+            return False
+        self.record_entry(content_hash, len(data))
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+        return content_hash in self.entries
+
+    def record_entry(self, content_hash: str, size: int) -> None:
+        """Marks an entry as used now in the ledger.
+        """
+        previous = self.entries.get(content_hash)
+        self.total_bytes += size - (previous[1] if previous is not None else 0)
+        self.entries[content_hash] = [time.time_ns(), size]
+        self.evicted.discard(content_hash)
+        self.dirty = True
+
+    def evict(self) -> None:
+        """Removes least recently used entries of the ledger, until their total size falls below 'EVICTION_TARGET'
+        of 'max_bytes', and drops index paths of the removed entries.
+        """
+        target_bytes = int(self.max_bytes * EVICTION_TARGET)
+        for content_hash, entry in list(self.entries.items()):
+            try:
+                entry[0] = max(entry[0], self.entry_path(content_hash).stat().st_mtime_ns)
+            except FileNotFoundError:
+                # removed by another process
+                del self.entries[content_hash]
+                self.evicted.add(content_hash)
+                self.total_bytes -= entry[1]
+            except OSError:
+                pass
+        for content_hash, (_, size) in sorted(self.entries.items(), key=lambda item: item[1][0]):
+            if self.total_bytes <= target_bytes:
+                break
+            try:
+                self.entry_path(content_hash).unlink(missing_ok=True)
+            except OSError as exc:
+                logger.warning("Graph cache entry could not be evicted: %s", exc)
+                continue
+            del self.entries[content_hash]
+            self.evicted.add(content_hash)
+            self.total_bytes -= size
+        self.paths = {path: indexed for path, indexed in self.paths.items() if indexed[2] not in self.evicted}
+        self.dirty = True
+
+    def load(self) -> None:
+        """Loads the index and the ledger, once per object. Without a valid index, the ledger is rebuilt from entries.
+        """
+        if self.loaded:
+            return
+        self.loaded = True
+        index = self.read_index()
+        if index is None:
+            self.entries = self.scan_entries()
+            self.dirty = bool(self.entries)
+        else:
+            self.paths, self.entries = index["paths"], index["entries"]
+        self.total_bytes = sum(size for _, size in self.entries.values())
+
+    def read_index(self) -> Optional[dict[str, Any]]:
+        try:
+            with open(self.cache_dir / INDEX_FILE) as index_file:
+                index = json.load(index_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Graph cache index could not be read: %s", exc)
+            return None
+        if not isinstance(index, dict) or index.get("version") != INDEX_VERSION \
+                or not isinstance(index.get("paths"), dict) or not isinstance(index.get("entries"), dict):
+            return None
+        return index
+
+    def scan_entries(self) -> dict[str, list[int]]:
+        """Builds the ledger from entries in the cache directory.
+        """
+        entries: dict[str, list[int]] = {}
+        try:
+            paths = list(self.cache_dir.glob(f"*{ENTRY_SUFFIX}"))
+        except OSError:
+            return entries
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries[path.name[:-len(ENTRY_SUFFIX)]] = [stat.st_mtime_ns, stat.st_size]
+        return entries
+
+    def flush(self) -> None:
+        """Writes the index and the ledger, merged with changes written by other processes since they were loaded.
+        """
+        if not self.dirty:
+            return
+        index = self.read_index()
+        if index is not None:
+            for content_hash, entry in index["entries"].items():
+                previous = self.entries.get(content_hash)
+                if content_hash not in self.evicted and (previous is None or entry[0] > previous[0]):
+                    self.total_bytes += entry[1] - (previous[1] if previous is not None else 0)
+                    self.entries[content_hash] = entry
+            for path, indexed in index["paths"].items():
+                if path not in self.paths and indexed[2] in self.entries:
+                    self.paths[path] = indexed
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+        index = dict(version=INDEX_VERSION, paths=self.paths, entries=self.entries)
+        try:
+            self.atomic_write(self.cache_dir / INDEX_FILE, json.dumps(index).encode("utf-8"))
+        except OSError as exc:
+            self.log_write_failure(exc)
+            return
+        self.evicted.clear()
+        self.dirty = False
+
+    def log_write_failure(self, exc: OSError) -> None:
+        if not self.write_failed:
+            logger.warning("Graph cache at %s could not be written, continuing without it: %s", self.cache_dir, exc)
+        self.write_failed = True
+
+    def atomic_write(self, path: Path, data: bytes) -> None:
+        """Writes data into a temporary file, which then replaces the target, so readers never see partial files.
+
+        Args:
+            path (Path): target path
+            data (bytes): written data
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            temporary_path.write_bytes(data)
+            os.replace(temporary_path, path)
+        finally:
+            if temporary_path.exists():
+                temporary_path.unlink()
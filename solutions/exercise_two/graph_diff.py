@@ -0,0 +1,162 @@
+"""
+Difference of two versions of a dependency file.
+
+The diff reports added and removed packages, packages whose direct dependencies changed (compared as sets,
+so reordering or repeating a dependency is not a change) and packages whose transitive closure changed.
+
+Closures are computed only where they may differ. A closure of a package kept by both versions can change only if
+the package reaches (in the new version) a package with changed direct dependencies, so candidates are collected
+by walking reverse dependencies from changed packages. Closures of all other packages are identical in both versions,
+they are computed once (only if reached from a candidate) and shared by both versions. The cost of closure comparison
+therefore scales with the part of the graph affected by the change (and closures reached from it), instead of with
+the size of the whole graph.
+"""
+
+# system imports
+from pathlib import Path
+from typing import Any, Optional, Union
+
+# local imports
+from .exercise_two import DependencyResolver
+
+
+class GraphDiff:
+    """Difference of two versions of dependency relations.
+    """
+    def __init__(self, added: list[str], removed: list[str], changed_dependencies: dict[str, tuple[list[str], list[str]]],
+                 changed_closures: list[str]):
+        self.added = added                                      # packages only in the new version
+        self.removed = removed                                  # packages only in the old version
+        self.changed_dependencies = changed_dependencies        # package -> (added dependencies, removed dependencies)
+        self.changed_closures = changed_closures                # packages of both versions with changed transitive closure
+
+    def __repr__(self):
+        class_name = type(self).__name__
+        return (f"{class_name}(added={self.added!r}, removed={self.removed!r}, "
+                f"changed_dependencies={self.changed_dependencies!r}, changed_closures={self.changed_closures!r})")
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed_dependencies)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Returns the diff as a JSON serializable dictionary.
+        """
+        changed_dependencies = {pkg: dict(added=added, removed=removed) for pkg, (added, removed) in self.changed_dependencies.items()}
+        return dict(added=self.added, removed=self.removed, changed_dependencies=changed_dependencies,
+                    changed_closures=self.changed_closures)
+
+    def lines(self) -> list[str]:
+        """Returns a human readable description of the diff, one change per line.
+        """
+        lines = [f"added: {pkg}" for pkg in self.added]
+        lines += [f"removed: {pkg}" for pkg in self.removed]
+        for pkg, (added, removed) in self.changed_dependencies.items():
+            lines.append(" ".join([f"changed: {pkg}"] + [f"+{dependency}" for dependency in added]
+                                  + [f"-{dependency}" for dependency in removed]))
+        lines += [f"closure changed: {pkg}" for pkg in self.changed_closures]
+        return lines
+
+
+class ClosureCache:
+    """Memoized transitive closures of packages of a single version, computed on demand without recursion.
+
+    Closures are bitsets (Python ints), bit positions of packages are shared with the other version.
+    """
+    def __init__(self, dependency_data: dict[str, list], shared: Optional["ClosureCache"] = None,
+                 changed: Optional[set[str]] = None):
+        """
+        Args:
+            dependency_data (dict[str, list]): verified acyclic dependency relations
+            shared (Optional[ClosureCache], optional): closures of the other version, reused for its packages,
+                                                       which are not in 'changed'. Defaults to None.
+            changed (Optional[set[str]], optional): packages, whose closures may differ between versions. Defaults to None.
+        """
+        self.dependency_data = dependency_data
+        self.shared = shared
+        self.changed = changed if changed is not None else set()
+        self.bits: dict[str, int] = shared.bits if shared is not None else {}
+        self.closures: dict[str, int] = {}
+
+    def bit(self, pkg: str) -> int:
+        position = self.bits.get(pkg)
+        if position is None:
+            position = self.bits[pkg] = len(self.bits)
+        return 1 << position
+
+    def closure(self, root: str) -> int:
+        work = [root]
+        while work:
+            pkg = work[-1]
+            if pkg in self.closures:
+                work.pop()
+                continue
+            if self.shared is not None and pkg not in self.changed and pkg in self.shared.dependency_data:
+                self.closures[pkg] = self.shared.closure(pkg)
+                work.pop()
+                continue
+            missing = [dependency for dependency in self.dependency_data[pkg] if dependency not in self.closures]
+            if missing:
+                work.extend(missing)
+                continue
+            work.pop()
+            closure = 0
+            for dependency in self.dependency_data[pkg]:
+                closure |= self.closures[dependency] | self.bit(dependency)
+            self.closures[pkg] = closure
+        return self.closures[root]
+
+
+def diff_dependency_data(old_data: dict[str, list], new_data: dict[str, list],
+                         resolver: Optional[DependencyResolver] = None) -> GraphDiff:
+    """Compares two versions of dependency relations, both are verified first.
+
+    Args:
+        old_data (dict[str, list]): old dependency relations
+        new_data (dict[str, list]): new dependency relations
+        resolver (Optional[DependencyResolver], optional): resolver verifying the relations. Defaults to None.
+
+    Returns:
+        GraphDiff: difference of the versions
+    """
+    dr = resolver or DependencyResolver()
+    dr.verified_resolution_order(old_data)
+    dr.verified_resolution_order(new_data)
+
+    added = [pkg for pkg in new_data if pkg not in old_data]
+    removed = [pkg for pkg in old_data if pkg not in new_data]
+    changed_dependencies: dict[str, tuple[list[str], list[str]]] = {}
+    for pkg, dependencies in new_data.items():
+        if pkg not in old_data:
+            continue
+        old_dependencies, new_dependencies = set(old_data[pkg]), set(dependencies)
+        if old_dependencies != new_dependencies:
+            added_dependencies = [dependency for dependency in dependencies if dependency not in old_dependencies]
+            removed_dependencies = [dependency for dependency in old_data[pkg] if dependency not in new_dependencies]
+            changed_dependencies[pkg] = (list(dict.fromkeys(added_dependencies)), list(dict.fromkeys(removed_dependencies)))
+
+    # packages reaching a changed package, closures of all others are equal in both versions
+    dependents: dict[str, list[str]] = {}
+    for pkg, dependencies in new_data.items():
+        for dependency in dependencies:
+            dependents.setdefault(dependency, []).append(pkg)
+    candidates = set(changed_dependencies)
+    work = list(changed_dependencies)
+    while work:
+        for dependent in dependents.get(work.pop(), []):
+            if dependent not in candidates and dependent in old_data:
+                candidates.add(dependent)
+                work.append(dependent)
+
+    new_closures = ClosureCache(new_data)
+    old_closures = ClosureCache(old_data, new_closures, candidates)
+    changed_closures = [pkg for pkg in new_data if pkg in candidates and new_closures.closure(pkg) != old_closures.closure(pkg)]
+    return GraphDiff(added, removed, changed_dependencies, changed_closures)
+
+
+def diff_dependency_files(old_path: Union[str, Path], new_path: Union[str, Path],
+                          resolver: Optional[DependencyResolver] = None) -> GraphDiff:
+    """
+    Convenience method comparing two versions of a dependency file, see 'diff_dependency_data'.
+    """
+    dr = resolver or DependencyResolver()
+    return diff_dependency_data(dr.load_dependency_data(old_path), dr.load_dependency_data(new_path), dr)
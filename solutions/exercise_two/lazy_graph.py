@@ -0,0 +1,122 @@
+"""
+Lazy, on-demand resolution of dependency graphs.
+
+`LazyGraph` maps package names to `Package` objects like the result of `DependencyResolver.resolve_graph`,
+but a package is resolved only when it is accessed for the first time. Resolution walks just the transitive
+dependencies of the package, which were not resolved yet, and memoizes every package built on the way,
+so a lookup costs time proportional to the closure of the package (once the file is loaded).
+
+Verification is lazy as well: invalid dependency lists, missing packages and cycles are reported only if they are
+reachable from an accessed package, with the same exceptions as the eager resolution. Option 'strict' verifies
+the whole graph up front, while packages are still built on demand.
+
+Iteration follows the order of the dependency file (eager resolution returns packages in resolution order)
+and resolves the iterated packages, membership tests do not resolve anything.
+"""
+
+# system imports
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
+
+# local imports
+from .errors import CyclicDependencyError, MissingPackageError
+from .exercise_two import DependencyResolver, Package
+
+
+class LazyGraph(Mapping):
+    """Read-only mapping of package names to `Package` objects, resolved on first access.
+    """
+    def __init__(self, dependency_data: dict[str, list], strict: bool = False, resolver: Optional[DependencyResolver] = None):
+        """
+        Args:
+            dependency_data (dict[str, list]): unverified data containing dependency relations read from a JSON file
+            strict (bool, optional): verifies the whole graph before any access. Defaults to False.
+            resolver (Optional[DependencyResolver], optional): resolver used for strict verification. Defaults to None.
+
+        Raises:
+            TypeError: raises if 'dependency_data' is not a dictionary,
+            MissingPackageError, CyclicDependencyError: raise in strict mode, if the graph is not valid.
+        """
+        if not isinstance(dependency_data, dict):
+            raise TypeError("Loaded JSON file does not provide a dictionary")
+        if strict:
+            (resolver or DependencyResolver()).verified_resolution_order(dependency_data)
+        self.dependency_data = dependency_data
+        self.packages: dict[str, Package] = {}
+
+    def __repr__(self):
+        class_name = type(self).__name__
+        return f"{class_name}(packages={len(self.dependency_data)!r}, resolved={len(self.packages)!r})"
+
+    def __getitem__(self, name: str) -> Package:
+        package = self.packages.get(name)
+        if package is None:
+            if name not in self.dependency_data:
+                raise KeyError(name)
+            package = self.resolve_package(name)
+        return package
+
+    def __contains__(self, name: Any) -> bool:
+        return name in self.dependency_data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.dependency_data)
+
+    def __len__(self) -> int:
+        return len(self.dependency_data)
+
+    def dependencies_of(self, pkg: str) -> list:
+        dependencies = self.dependency_data[pkg]
+        if not isinstance(dependencies, list):
+            raise TypeError(f"ERROR: Package {pkg!r} dependencies are not a list")
+        return dependencies
+
+    def resolve_package(self, root: str) -> Package:
+        """Resolves a package together with its unresolved transitive dependencies, by an iterative depth first search.
+
+        Args:
+            root (str): name of the package
+
+        Raises:
+            TypeError: raises if dependencies of a reached package are not a list,
+            MissingPackageError: raises if a reached dependency is not listed as a package,
+            CyclicDependencyError: raises if a cycle is reachable from the package.
+
+        Returns:
+            Package: resolved package
+        """
+        path = [root]
+        path_positions = {root: 0}
+        work = [(root, iter(self.dependencies_of(root)))]
+        while work:
+            pkg, dependencies = work[-1]
+            for dependency in dependencies:
+                if dependency in self.packages:
+                    continue
+                if dependency in path_positions:
+                    cycle = path[path_positions[dependency]:]
+                    raise CyclicDependencyError(f"ERROR: Cyclic dependencies detected between packages: {' -> '.join(cycle)}", [cycle])
+                if dependency not in self.dependency_data:
+                    raise MissingPackageError(f"ERROR: Package {dependency!r} was not found in dependency list")
+                path_positions[dependency] = len(path)
+                path.append(dependency)
+                work.append((dependency, iter(self.dependencies_of(dependency))))
+                break
+            else:
+                # all dependencies are resolved, so is the package
+                work.pop()
+                path.pop()
+                del path_positions[pkg]
+                package = Package(pkg)
+                package.dependencies = [self.packages[dependency] for dependency in self.dependency_data[pkg]]
+                self.packages[pkg] = package
+        return self.packages[root]
+
+
+def resolve_lazy_graph(file_path: Union[str, Path], strict: bool = False, resolver: Optional[DependencyResolver] = None) -> LazyGraph:
+    """
+    Convenience method loading a dependency file into a lazily resolved graph, see 'LazyGraph'.
+    """
+    dr = resolver or DependencyResolver()
+    return LazyGraph(dr.load_dependency_data(file_path), strict, dr)
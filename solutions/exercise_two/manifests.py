@@ -0,0 +1,176 @@
+"""
+Loading of dependency relations split into many manifests (dependency files), resolved as a single graph.
+
+Manifests are given by paths of files, directories (searched recursively for '*.json' files) or glob patterns.
+Every manifest is parsed and its structure validated on its own, in a pool of processes if there are enough of them.
+Manifests are then merged in the order of their paths, and the merged relations are verified and resolved once,
+so a dependency defined in any manifest satisfies the presence check.
+
+Policies for a package defined by more than one manifest:
+    - 'error' raises `ConflictingPackageError` if the definitions differ (identical definitions are merged),
+    - 'first' keeps the definition of the first manifest,
+    - 'last' keeps the definition of the last manifest, same as duplicate keys in a single file,
+    - 'union' merges dependencies of all definitions, in order of their first occurrence.
+"""
+
+# system imports
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional, Sequence, TextIO, Union
+
+# local imports
+from .defaults import CONFLICT_POLICIES
+from .errors import ConflictingPackageError
+from .exercise_two import DependencyResolver, dependency_tree
+from .exporters import write_graph
+from .instrumentation import ResolverHook
+
+
+# pattern of manifests searched for in directories
+MANIFEST_PATTERN = "*.json"
+# manifests are loaded serially below this amount of files
+PARALLEL_MANIFESTS = 16
+
+manifest_sources = Union[str, Path, Iterable[Union[str, Path]]]
+
+
+def expand_manifests(sources: manifest_sources) -> list[str]:
+    """Expands directories and glob patterns into a list of manifest paths.
+
+    Args:
+        sources (manifest_sources): a path to a file or directory, a glob pattern, or an iterable of those
+
+    Raises:
+        FileNotFoundError: raises if a directory or a glob pattern does not match any manifest.
+
+    Returns:
+        list[str]: sorted paths of manifests of every source, in order of sources and without repetitions
+    """
+    if isinstance(sources, (str, Path)):
+        sources = [sources]
+
+    paths: dict[str, None] = {}
+    for source_path in sources:
+        source = str(source_path)
+        if os.path.isdir(source):
+            matched = sorted(str(path) for path in Path(source).rglob(MANIFEST_PATTERN) if path.is_file())
+        elif glob.has_magic(source):
+            matched = sorted(path for path in glob.glob(source, recursive=True) if os.path.isfile(path))
+        else:
+            # a missing file is reported by the loader
+            matched = [source]
+        if not matched:
+            raise FileNotFoundError(f"Error. No manifests found at {source}.")
+        paths.update((os.path.abspath(path), None) for path in matched)
+    return list(paths)
+
+
+def load_manifest(file_path: str) -> dict[str, list]:
+    """Worker function loading a single manifest and validating its structure.
+
+    Presence of dependencies is not verified, as they may be defined by other manifests.
+    """
+    dr = DependencyResolver()
+    dependency_data = dr.load_dependency_data(file_path)
+    try:
+        dr.verify_dependency_fields(dependency_data)
+    except TypeError:
+        print(f"Manifest {file_path} does not hold valid dependency relations. Exiting program")
+        raise
+    return dependency_data
+
+
+def merge_manifests(manifests: Iterable[tuple[str, dict[str, list]]], conflict: str = "error") -> dict[str, list]:
+    """Merges dependency relations of manifests.
+
+    Args:
+        manifests (Iterable[tuple[str, dict[str, list]]]): pairs of a manifest path and its dependency relations
+        conflict (str, optional): policy for packages defined by more than one manifest. Defaults to "error".
+
+    Raises:
+        ValueError: raises if the conflict policy is not supported,
+        ConflictingPackageError: raises if manifests define a package differently under the 'error' policy.
+
+    Returns:
+        dict[str, list]: merged dependency relations
+    """
+    if conflict not in CONFLICT_POLICIES:
+        raise ValueError(f"Unsupported conflict policy {conflict!r}, use one of {CONFLICT_POLICIES!r}")
+
+    merged: dict[str, list] = {}
+    origins: dict[str, str] = {}
+    for file_path, dependency_data in manifests:
+        for pkg, dependencies in dependency_data.items():
+            if pkg not in merged:
+                merged[pkg] = dependencies
+                origins[pkg] = file_path
+            elif conflict == "error":
+                if merged[pkg] != dependencies:
+                    raise ConflictingPackageError(f"ERROR: Package {pkg!r} is defined differently in {origins[pkg]} and {file_path}")
+            elif conflict == "last":
+                merged[pkg] = dependencies
+            elif conflict == "union":
+                merged[pkg] = list(dict.fromkeys(merged[pkg] + dependencies))
+    return merged
+
+
+def load_manifests(sources: manifest_sources, conflict: str = "error", workers: Optional[int] = None,
+                   threshold: int = PARALLEL_MANIFESTS) -> dict[str, list]:
+    """Loads and merges dependency relations of all manifests, the result is not verified for presence and cycles.
+
+    Args:
+        sources (manifest_sources): a path to a file or directory, a glob pattern, or an iterable of those
+        conflict (str, optional): policy for packages defined by more than one manifest. Defaults to "error".
+        workers (Optional[int], optional): number of worker processes, None uses all CPUs. Defaults to None.
+        threshold (int, optional): fewer manifests are loaded serially. Defaults to PARALLEL_MANIFESTS.
+
+    Returns:
+        dict[str, list]: merged dependency relations
+    """
+    if conflict not in CONFLICT_POLICIES:
+        raise ValueError(f"Unsupported conflict policy {conflict!r}, use one of {CONFLICT_POLICIES!r}")
+    paths = expand_manifests(sources)
+    workers = workers or os.cpu_count() or 1
+
+    if workers < 2 or len(paths) < threshold:
+        return merge_manifests(((file_path, load_manifest(file_path)) for file_path in paths), conflict)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        loaded = list(zip(paths, executor.map(load_manifest, paths)))
+    return merge_manifests(loaded, conflict)
+
+
+def resolve_manifests(sources: manifest_sources, conflict: str = "error", workers: Optional[int] = None,
+                      resolver: Optional[DependencyResolver] = None) -> dependency_tree:
+    """Loads all manifests and resolves them as a single graph.
+
+    Args:
+        sources (manifest_sources): a path to a file or directory, a glob pattern, or an iterable of those
+        conflict (str, optional): policy for packages defined by more than one manifest. Defaults to "error".
+        workers (Optional[int], optional): number of worker processes, None uses all CPUs. Defaults to None.
+        resolver (Optional[DependencyResolver], optional): resolver, e.g. with instrumentation hooks. Defaults to None.
+
+    Returns:
+        dependency_tree: a list of structurally constructed Package objects
+    """
+    dr = resolver or DependencyResolver()
+    with dr.phase("parse"):
+        dependency_data = load_manifests(sources, conflict, workers)
+    return dr.resolve_dependency_data(dependency_data)
+
+
+def show_manifests_graph(sources: manifest_sources, mode: str = "tree", max_depth: Optional[int] = None,
+                         conflict: str = "error", workers: Optional[int] = None,
+                         hooks: Optional[Sequence[ResolverHook]] = None, stream: Optional[TextIO] = None,
+                         output_format: str = "text") -> None:
+    """
+    Convenience method printing the merged graph of all manifests, see 'show_dependency_graph'.
+    """
+    dr = DependencyResolver(hooks=hooks)
+    with dr.phase("parse"):
+        dependency_data = load_manifests(sources, conflict, workers)
+    graph = dr.compact_graph_from_data(dependency_data)
+    dr.report_graph(graph)
+    with dr.phase("render"):
+        write_graph(graph, stream, output_format, mode, max_depth)
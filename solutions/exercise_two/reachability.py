@@ -0,0 +1,120 @@
+"""
+Transitive reachability index over a resolved dependency graph.
+
+Every package gets an integer id, and the set of its transitive dependencies is stored as a Python int used as a bitset
+(bit `i` is set if the package depends on the package with id `i`). Closures are computed once in resolution order,
+where dependencies precede packages depending on them, so the closure of a package is just a union of closures
+of its direct dependencies. Reverse dependencies are kept as an adjacency list, their transitive closures are computed
+lazily in the opposite order on the first query.
+
+Costs:
+    - building the index takes O(V + E) unions of bitsets of up to V bits, i.e. O(V * (V + E) / 64) machine word
+      operations in the worst case (a chain), for V packages and E dependency relations,
+    - memory of closures is bounded by O(V^2 / 8) bytes (V bitsets of up to V bits), reverse closures of transitive
+      'dependents' queries add the same bound once computed,
+    - 'depends_on' is a single bit test,
+    - 'all_dependencies' and transitive 'dependents' take a single O(V / 64) pass over the bitset plus a step per
+      package in their result.
+"""
+
+# system imports
+from collections.abc import Mapping
+from typing import Optional
+
+# local imports
+from .bitsets import bit_count, iter_bits
+from .compact_graph import CompactGraph
+from .exercise_two import DependencyResolver
+
+
+class ReachabilityIndex:
+    """Index answering transitive dependency queries of a resolved graph in near-constant time.
+    """
+    def __init__(self, graph: Mapping):
+        """
+        Args:
+            graph (Mapping): resolved graph, i.e. output of 'DependencyResolver.resolve_graph' or 'resolve_compact_graph'
+        """
+        if isinstance(graph, CompactGraph):
+            # ids of a compact graph are already in resolution order
+            self.names = list(graph.names)
+            self.ids = dict(graph.ids)
+            dependency_ids = [list(graph.dependency_ids(package_id)) for package_id in range(len(graph))]
+        else:
+            dependency_data = {name: [dependency.name for dependency in package.dependencies] for name, package in graph.items()}
+            self.names = DependencyResolver().resolution_order(dependency_data)
+            self.ids = {name: package_id for package_id, name in enumerate(self.names)}
+            dependency_ids = [[self.ids[dependency] for dependency in dependency_data[name]] for name in self.names]
+
+        self.dependency_ids = dependency_ids
+        self.closures: list[int] = []
+        self.reverse_ids: list[list[int]] = [[] for _ in self.names]
+        for package_id, dependencies in enumerate(dependency_ids):
+            closure = 0
+            for dependency_id in dependencies:
+                closure |= self.closures[dependency_id] | (1 << dependency_id)
+                self.reverse_ids[dependency_id].append(package_id)
+            self.closures.append(closure)
+        self.reverse_closures: Optional[list[int]] = None
+
+    def __repr__(self):
+        class_name = type(self).__name__
+        return f"{class_name}(packages={len(self.names)!r})"
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def depends_on(self, package: str, dependency: str) -> bool:
+        """Checks if 'package' transitively depends on 'dependency'.
+
+        Raises:
+            KeyError: raises if any of the packages is not in the graph.
+        """
+        return bool(self.closures[self.ids[package]] >> self.ids[dependency] & 1)
+
+    def all_dependencies(self, package: str) -> list[str]:
+        """Returns all transitive dependencies of a package, in resolution order.
+
+        Raises:
+            KeyError: raises if the package is not in the graph.
+        """
+        return [self.names[package_id] for package_id in iter_bits(self.closures[self.ids[package]])]
+
+    def dependency_count(self, package: str) -> int:
+        """Returns amount of transitive dependencies of a package.
+
+        Raises:
+            KeyError: raises if the package is not in the graph.
+        """
+        return bit_count(self.closures[self.ids[package]])
+
+    def dependents(self, package: str, transitive: bool = False) -> list[str]:
+        """Returns packages depending on a package, in resolution order.
+
+        Args:
+            package (str): name of the package
+            transitive (bool, optional): includes packages depending on the package indirectly. Defaults to False.
+
+        Raises:
+            KeyError: raises if the package is not in the graph.
+
+        Returns:
+            list[str]: names of dependent packages
+        """
+        package_id = self.ids[package]
+        if not transitive:
+            return [self.names[dependent_id] for dependent_id in sorted(set(self.reverse_ids[package_id]))]
+        return [self.names[dependent_id] for dependent_id in iter_bits(self.transitive_reverse_closures()[package_id])]
+
+    def transitive_reverse_closures(self) -> list[int]:
+        """Computes (or retrieves already computed) closures of reverse dependencies, in reverse resolution order.
+        """
+        if self.reverse_closures is None:
+            reverse_closures = [0] * len(self.names)
+            for package_id in reversed(range(len(self.names))):
+                closure = 0
+                for dependent_id in self.reverse_ids[package_id]:
+                    closure |= reverse_closures[dependent_id] | (1 << dependent_id)
+                reverse_closures[package_id] = closure
+            self.reverse_closures = reverse_closures
+        return self.reverse_closures
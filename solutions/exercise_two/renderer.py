@@ -0,0 +1,110 @@
+"""
+Streaming renderer of resolved dependency graphs.
+
+Supported modes:
+    - 'tree' prints the fully expanded tree of every package, same as `Package.structural_print`,
+    - 'compact' expands every subtree only once, its later occurrences are printed as back-references,
+      which keeps the output linear in size of the graph, even for graphs with many shared dependencies,
+    - 'flat' prints one line per package, listing its direct dependencies.
+
+Rendering does not use recursion, so it is not limited by the depth of the graph, and output lines are written
+into the stream in chunks, instead of one write call per line.
+"""
+
+# system imports
+import sys
+from collections.abc import Mapping
+from typing import Any, Optional, TextIO
+
+
+# supported rendering modes
+RENDER_MODES = ("tree", "compact", "flat")
+# amount of lines buffered before they are written to the stream
+BUFFERED_LINES = 4096
+# suffix of packages, whose subtree was already printed in 'compact' mode
+BACK_REFERENCE = " (see above)"
+
+
+class BufferedLineWriter:
+    """Collects lines and writes them into a stream in chunks of 'BUFFERED_LINES' lines.
+    """
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.lines: list[str] = []
+
+    def write_line(self, line: str) -> None:
+        self.lines.append(line)
+        if len(self.lines) >= BUFFERED_LINES:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.lines:
+            self.stream.write("\n".join(self.lines) + "\n")
+            self.lines.clear()
+
+
+def render_graph(graph: Mapping, stream: Optional[TextIO] = None, mode: str = "tree", max_depth: Optional[int] = None) -> None:
+    """Writes a resolved dependency graph into a stream.
+
+    Args:
+        graph (Mapping): resolved graph mapping package names to Package (or PackageView) objects
+        stream (Optional[TextIO], optional): output stream. Defaults to None, which stands for stdout.
+        mode (str, optional): one of 'tree', 'compact' or 'flat'. Defaults to "tree".
+        max_depth (Optional[int], optional): deepest printed level of dependencies, root packages are at level 0.
+                                             Ignored in 'flat' mode. Defaults to None, which stands for no limit.
+
+    Raises:
+        ValueError: raises if 'mode' is not supported.
+    """
+    if mode not in RENDER_MODES:
+        raise ValueError(f"Unsupported render mode {mode!r}, use one of {RENDER_MODES!r}")
+    writer = BufferedLineWriter(stream if stream is not None else sys.stdout)
+    if mode == "flat":
+        for name, package in graph.items():
+            writer.write_line(f"{name}: {', '.join(dependency.name for dependency in package.dependencies)}".rstrip())
+    else:
+        expanded: Optional[set[str]] = set() if mode == "compact" else None
+        for package in graph.values():
+            write_package(writer, package, 0, max_depth, expanded)
+    writer.flush()
+
+
+def render_package(package: Any, stream: Optional[TextIO] = None, depth_level: int = 0, max_depth: Optional[int] = None) -> None:
+    """Writes fully expanded dependency structure of a single package into a stream.
+
+    Args:
+        package (Any): Package (or PackageView) object
+        stream (Optional[TextIO], optional): output stream. Defaults to None, which stands for stdout.
+        depth_level (int, optional): indentation level of the package. Defaults to 0.
+        max_depth (Optional[int], optional): deepest printed level. Defaults to None, which stands for no limit.
+    """
+    writer = BufferedLineWriter(stream if stream is not None else sys.stdout)
+    write_package(writer, package, depth_level, max_depth, None)
+    writer.flush()
+
+
+def write_package(writer: BufferedLineWriter, package: Any, depth_level: int, max_depth: Optional[int],
+                  expanded: Optional[set[str]]) -> None:
+    """Iterative depth first traversal writing a package and its dependencies.
+
+    Args:
+        writer (BufferedLineWriter): output writer
+        package (Any): Package (or PackageView) object
+        depth_level (int): indentation level of the package
+        max_depth (Optional[int]): deepest printed level, None for no limit
+        expanded (Optional[set[str]]): names of already expanded packages in 'compact' mode, None in 'tree' mode
+    """
+    stack: list[tuple[Any, int]] = [(package, depth_level)]
+    while stack:
+        package, depth_level = stack.pop()
+        dependencies: list = package.dependencies
+        expand = max_depth is None or depth_level < max_depth
+        if expanded is not None and dependencies:
+            if package.name in expanded:
+                writer.write_line(f"{depth_level*'  '}- {package.name}{BACK_REFERENCE}")
+                continue
+            if expand:
+                expanded.add(package.name)
+        writer.write_line(f"{depth_level*'  '}- {package.name}")
+        if expand:
+            stack.extend((dependency, depth_level+1) for dependency in reversed(dependencies))
@@ -0,0 +1,189 @@
+"""
+Build scheduler driven by a resolved dependency graph.
+
+Packages are processed by a user callback on a pool of threads or processes. Scheduling uses a ready queue:
+a package is submitted as soon as all of its dependencies have finished, without waiting for the rest of its
+topological level. Concurrency is bounded by the size of the pool.
+
+If a callback raises, the package is marked as failed and all packages depending on it (transitively) are skipped,
+while independent parts of the graph keep building. Every package gets a `TaskResult` with its status and timing.
+"""
+
+# system imports
+import time
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Optional
+
+
+# supported kinds of worker pools
+EXECUTOR_KINDS = ("thread", "process")
+
+# task statuses
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+class TaskResult:
+    """Outcome of a single package build.
+    """
+    def __init__(self, name: str, status: str, result: Any = None, error: Optional[BaseException] = None,
+                 started: Optional[float] = None, duration: float = 0.):
+        self.name = name
+        self.status = status
+        self.result = result
+        self.error = error
+        self.started = started          # wall clock time of the callback start, None for skipped packages
+        self.duration = duration        # duration of the callback in seconds
+
+    def __repr__(self):
+        class_name = type(self).__name__
+        return f"{class_name}(name={self.name!r}, status={self.status!r}, duration={self.duration:.6f})"
+
+
+def timed_call(callback: Callable[[str], Any], name: str) -> tuple[float, float, Any, Optional[BaseException]]:
+    """Runs the callback in a worker and measures it, exceptions are returned instead of raised.
+
+    Args:
+        callback (Callable[[str], Any]): user callback, it has to be picklable for a process pool
+        name (str): name of the built package
+
+    Returns:
+        tuple[float, float, Any, Optional[BaseException]]: start time, duration, result of the callback and its exception
+    """
+    started = time.time()
+    counter = time.perf_counter()
+    try:
+        result, error = callback(name), None
+    except Exception as exc:
+        result, error = None, exc
+    return started, time.perf_counter() - counter, result, error
+
+
+def direct_dependencies(graph: Mapping) -> dict[str, list[str]]:
+    """Extracts names of direct dependencies out of a resolved graph, duplicates are dropped.
+    """
+    return {name: list(dict.fromkeys(dependency.name for dependency in package.dependencies)) for name, package in graph.items()}
+
+
+def reverse_dependencies(dependencies: dict[str, list[str]]) -> dict[str, list[str]]:
+    """Inverts direct dependencies, mapping every package to packages directly depending on it.
+    """
+    dependents: dict[str, list[str]] = {name: [] for name in dependencies}
+    for name, names in dependencies.items():
+        for dependency in names:
+            dependents[dependency].append(name)
+    return dependents
+
+
+def topological_levels(graph: Mapping) -> list[list[str]]:
+    """Groups packages into levels, every package depends only on packages of lower levels.
+
+    Args:
+        graph (Mapping): resolved graph mapping package names to Package (or PackageView) objects
+
+    Returns:
+        list[list[str]]: levels of package names, packages without dependencies form level 0
+    """
+    dependencies = direct_dependencies(graph)
+    pending = {name: len(names) for name, names in dependencies.items()}
+    dependents = reverse_dependencies(dependencies)
+
+    levels: list[list[str]] = []
+    current = [name for name, count in pending.items() if count == 0]
+    while current:
+        levels.append(current)
+        following = []
+        for name in current:
+            for dependent in dependents[name]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    following.append(dependent)
+        current = following
+    return levels
+
+
+class BuildScheduler:
+    """Runs a callback for every package of a resolved graph, respecting dependencies.
+    """
+    def __init__(self, graph: Mapping, callback: Callable[[str], Any], max_workers: int = 4, executor_kind: str = "thread"):
+        """
+        Args:
+            graph (Mapping): resolved graph mapping package names to Package (or PackageView) objects
+            callback (Callable[[str], Any]): function called with a package name, it has to be picklable for process pool
+            max_workers (int, optional): maximal amount of concurrently running callbacks. Defaults to 4.
+            executor_kind (str, optional): 'thread' or 'process'. Defaults to "thread".
+
+        Raises:
+            ValueError: raises if 'executor_kind' is not supported or 'max_workers' is not positive.
+        """
+        if executor_kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unsupported executor {executor_kind!r}, use one of {EXECUTOR_KINDS!r}")
+        if max_workers < 1:
+            raise ValueError(f"Amount of workers has to be positive, got {max_workers!r}")
+        self.dependencies = direct_dependencies(graph)
+        self.callback = callback
+        self.max_workers = max_workers
+        self.executor_kind = executor_kind
+
+    def create_executor(self) -> Executor:
+        if self.executor_kind == "process":
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def run(self) -> dict[str, TaskResult]:
+        """Builds all packages.
+
+        Returns:
+            dict[str, TaskResult]: results of all packages, in order of the graph
+        """
+        pending = {name: len(names) for name, names in self.dependencies.items()}
+        dependents = reverse_dependencies(self.dependencies)
+
+        results: dict[str, TaskResult] = {}
+        with self.create_executor() as executor:
+            running: dict[Future, str] = {}
+
+            def submit(name: str) -> None:
+                running[executor.submit(timed_call, self.callback, name)] = name
+
+            for name, count in pending.items():
+                if count == 0:
+                    submit(name)
+
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    started, duration, result, error = future.result()
+                    if error is not None:
+                        results[name] = TaskResult(name, FAILED, error=error, started=started, duration=duration)
+                        self.skip_dependents(name, dependents, results)
+                        continue
+                    results[name] = TaskResult(name, SUCCEEDED, result=result, started=started, duration=duration)
+                    for dependent in dependents[name]:
+                        pending[dependent] -= 1
+                        if pending[dependent] == 0 and dependent not in results:
+                            submit(dependent)
+
+        return {name: results[name] for name in self.dependencies}
+
+    def skip_dependents(self, failed: str, dependents: dict[str, list[str]], results: dict[str, TaskResult]) -> None:
+        """Marks all packages transitively depending on a failed package as skipped.
+        """
+        error = RuntimeError(f"Dependency {failed!r} failed")
+        stack = list(dependents[failed])
+        while stack:
+            name = stack.pop()
+            if name in results:
+                continue
+            results[name] = TaskResult(name, SKIPPED, error=error)
+            stack.extend(dependents[name])
+
+
+def run_build(graph: Mapping, callback: Callable[[str], Any], max_workers: int = 4, executor_kind: str = "thread") -> dict[str, TaskResult]:
+    """
+    Convenience method building every package of a resolved graph, see 'BuildScheduler'.
+    """
+    return BuildScheduler(graph, callback, max_workers, executor_kind).run()
@@ -0,0 +1,267 @@
+"""
+Compiled binary snapshots of resolved dependency graphs, loaded by memory mapping.
+
+A snapshot is compiled once from a dependency file, and loading it costs only mapping of the file: no parsing,
+no verification and no Python objects per package. Pages of the file are loaded by the operating system on demand
+and are shared by all processes mapping the same snapshot.
+
+Layout (all integers in native byte order, sections aligned to 8 bytes):
+    - header: magic, format version, byte order flag, amount of packages, edges and hash slots, size of string table,
+    - string offsets: int64 array of 'packages + 1' offsets of names in the string table,
+    - CSR offsets and edges: int32 arrays, same as `CompactGraph` (package ids follow resolution order),
+    - hash index: int32 array of open addressing slots holding package ids (-1 for empty slots),
+      names are hashed by 8 byte blake2b of their UTF-8 encoding and collisions are resolved by linear probing,
+    - string table: UTF-8 encoded names.
+
+`MappedGraph` is a `CompactGraph` backed by views of the mapped file, so it serves the same lookups
+(`PackageView` objects, `dependency_ids`, structural digests) and works with the renderer and `ReachabilityIndex`.
+"""
+
+# system imports
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+from hashlib import blake2b
+from pathlib import Path
+from typing import Any, Iterator, Literal, Optional, Union
+
+# local imports
+from .compact_graph import CompactGraph
+from .exercise_two import DependencyResolver
+
+
+# snapshot header: magic, format version, byte order flag, amount of packages, edges and hash slots, string table size
+SNAPSHOT_HEADER = struct.Struct("<8sHHIIIQ")
+SNAPSHOT_MAGIC = b"DEPSNAP\x00"
+SNAPSHOT_VERSION = 1
+# alignment of snapshot sections, in bytes
+SECTION_ALIGNMENT = 8
+# marker of an empty slot of the hash index
+EMPTY_SLOT = -1
+
+
+def name_hash(encoded_name: bytes) -> int:
+    """Hash of a package name, stable across processes (unlike built-in 'hash' of strings).
+    """
+    return int.from_bytes(blake2b(encoded_name, digest_size=8).digest(), "little")
+
+
+def aligned(position: int) -> int:
+    return -(-position // SECTION_ALIGNMENT) * SECTION_ALIGNMENT
+
+
+def snapshot_bytes(graph: CompactGraph) -> bytes:
+    """Serializes a compact graph into the snapshot format.
+
+    Args:
+        graph (CompactGraph): resolved compact graph
+
+    Returns:
+        bytes: content of the snapshot file
+    """
+    encoded_names = [name.encode("utf-8") for name in graph.names]
+    string_offsets = array('q', [0])
+    for encoded_name in encoded_names:
+        string_offsets.append(string_offsets[-1] + len(encoded_name))
+
+    slot_count = 1
+    while slot_count < 2 * len(encoded_names):
+        slot_count *= 2
+    slots = array('i', [EMPTY_SLOT]) * slot_count
+    mask = slot_count - 1
+    for package_id, encoded_name in enumerate(encoded_names):
+        slot = name_hash(encoded_name) & mask
+        while slots[slot] != EMPTY_SLOT:
+            slot = (slot + 1) & mask
+        slots[slot] = package_id
+
+    header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, sys.byteorder == "little", len(graph.names),
+                                  len(graph.edges), slot_count, string_offsets[-1])
+    sections = [header]
+    position = len(header)
+    for section in (string_offsets.tobytes(), array('i', graph.offsets).tobytes(), array('i', graph.edges).tobytes(),
+                    slots.tobytes(), b"".join(encoded_names)):
+        padding = aligned(position) - position
+        sections.extend((b"\0" * padding, section))
+        position += padding + len(section)
+    return b"".join(sections)
+
+
+def compile_snapshot(file_path: Union[str, Path], snapshot_path: Union[str, Path],
+                     resolver: Optional[DependencyResolver] = None) -> CompactGraph:
+    """Resolves a dependency file and writes its snapshot.
+
+    The snapshot is written into a temporary file, which replaces 'snapshot_path' once it is complete,
+    so processes mapping an older snapshot keep their consistent view.
+
+    Args:
+        file_path (Union[str, Path]): JSON file containing dependency relations
+        snapshot_path (Union[str, Path]): path of the written snapshot
+        resolver (Optional[DependencyResolver], optional): resolver, e.g. with instrumentation hooks. Defaults to None.
+
+    Returns:
+        CompactGraph: resolved graph
+    """
+    dr = resolver or DependencyResolver()
+    graph = dr.resolve_compact_graph(file_path)
+    temporary_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, "wb") as snapshot_file:
+            snapshot_file.write(snapshot_bytes(graph))
+        os.replace(temporary_path, snapshot_path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+    return graph
+
+
+class NameTable(Sequence):
+    """Sequence of package names decoded from the string table on access.
+    """
+    def __init__(self, string_offsets: memoryview, strings: memoryview):
+        self.string_offsets = string_offsets
+        self.strings = strings
+
+    def __len__(self) -> int:
+        return len(self.string_offsets) - 1
+
+    def __getitem__(self, package_id: Any) -> Any:
+        if isinstance(package_id, slice):
+            return [self[index] for index in range(len(self))[package_id]]
+        return self.encoded(package_id).tobytes().decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for package_id in range(len(self)):
+            yield self[package_id]
+
+    def encoded(self, package_id: int) -> memoryview:
+        if package_id < 0:
+            package_id += len(self)
+        if not 0 <= package_id < len(self):
+            raise IndexError("Package id out of range")
+        return self.strings[self.string_offsets[package_id]:self.string_offsets[package_id + 1]]
+
+
+class NameIndex(Mapping):
+    """Mapping of package names to their ids, backed by the hash index of a snapshot.
+    """
+    def __init__(self, names: NameTable, slots: memoryview):
+        self.names = names
+        self.slots = slots
+        self.mask = len(slots) - 1
+
+    def __getitem__(self, name: str) -> int:
+        if not isinstance(name, str):
+            raise KeyError(name)
+        encoded_name = name.encode("utf-8")
+        slot = name_hash(encoded_name) & self.mask
+        while True:
+            package_id = self.slots[slot]
+            if package_id == EMPTY_SLOT:
+                raise KeyError(name)
+            if self.names.encoded(package_id) == encoded_name:
+                return package_id
+            slot = (slot + 1) & self.mask
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class MappedGraph(CompactGraph):
+    """Compact graph backed by a memory mapped snapshot, see 'compile_snapshot'.
+
+    The graph holds the snapshot file mapped until 'close' is called, it can be used as a context manager.
+    """
+    def __init__(self, snapshot_path: Union[str, Path]):
+        """
+        Args:
+            snapshot_path (Union[str, Path]): path to a snapshot written by 'compile_snapshot'
+
+        Raises:
+            ValueError: raises if the file is not a compatible snapshot.
+        """
+        self.snapshot_path = str(snapshot_path)
+        with open(snapshot_path, "rb") as snapshot_file:
+            if os.fstat(snapshot_file.fileno()).st_size < SNAPSHOT_HEADER.size:
+                raise ValueError("Snapshot is truncated")
+            self.mapped = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.views = self.map_sections()
+        except ValueError:
+            self.mapped.close()
+            raise
+        string_offsets, offsets, edges, slots, strings = self.views
+        names = NameTable(string_offsets, strings)
+        super().__init__(names, offsets, edges, NameIndex(names, slots))  # type: ignore[arg-type]
+
+    def map_sections(self) -> list[memoryview]:
+        """Validates the header and returns views of all sections of the mapped snapshot.
+        """
+        magic, version, little_endian, package_count, edge_count, slot_count, string_size = SNAPSHOT_HEADER.unpack_from(self.mapped)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or bool(little_endian) != (sys.byteorder == "little"):
+            raise ValueError("Incompatible snapshot")
+
+        data = memoryview(self.mapped)
+        views: list[memoryview] = []
+        position = SNAPSHOT_HEADER.size
+        sections: list[tuple[Literal["q", "i", "B"], int]] = [("q", package_count + 1), ("i", package_count + 1),
+                                                              ("i", edge_count), ("i", slot_count), ("B", string_size)]
+        for type_code, length in sections:
+            position = aligned(position)
+            size = length * struct.calcsize(type_code)
+            if position + size > len(data):
+                for view in views:
+                    view.release()
+                data.release()
+                raise ValueError("Snapshot is truncated")
+            views.append(data[position:position + size].cast(type_code))
+            position += size
+        data.release()
+        return views
+
+    def __repr__(self):
+        class_name = type(self).__name__
+        return f"{class_name}(snapshot_path={self.snapshot_path!r}, packages={len(self.names)!r}, edges={len(self.edges)!r})"
+
+    def dependency_ids(self, package_id: int) -> array:
+        """Returns ids of direct dependencies of a package, copied out of the mapped snapshot.
+
+        Edges of a mapped graph are a memoryview of the mapping, whose slices are views again. The ids are therefore
+        copied into an array, which (unlike a view) can be kept by the caller after 'close'.
+
+        Args:
+            package_id (int): id of the package
+
+        Returns:
+            array: ids of dependencies, in order of the dependency file
+        """
+        dependency_ids = array("i")
+        with self.edges[self.offsets[package_id]:self.offsets[package_id + 1]] as view:  # type: ignore[attr-defined]
+            dependency_ids.frombytes(view.tobytes())
+        return dependency_ids
+
+    def __enter__(self) -> "MappedGraph":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Releases views of the snapshot and unmaps it, the graph can not be used afterwards.
+        """
+        for view in self.views:
+            view.release()
+        self.mapped.close()
+
+
+def open_snapshot(snapshot_path: Union[str, Path]) -> MappedGraph:
+    """
+    Convenience method mapping a snapshot written by 'compile_snapshot'.
+    """
+    return MappedGraph(snapshot_path)
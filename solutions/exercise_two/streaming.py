@@ -0,0 +1,208 @@
+"""
+Streaming ingestion of dependency files, validating the structure while it is being parsed.
+
+The file is read in chunks and parsed token by token, so the raw text is never held in memory as a whole.
+Package names are interned once they are read, and dependencies referencing packages, which were not defined yet,
+are tracked in a pending set. A package definition removes its name from the set, so once the stream ends,
+the presence check is done and a remaining pending dependency raises `MissingPackageError`.
+
+Returned data are therefore fully verified and can be resolved in a single pass.
+
+Errors follow `DependencyResolver.resolve_graph`:
+    - JSONDecodeError for invalid JSON syntax,
+    - TypeError if the top level value is not an object, or a package dependencies are not a list
+      (raised immediately, remaining content of the file is not checked for syntax errors),
+    - MissingPackageError if a dependency is not listed as a package.
+Duplicate package keys are resolved the same way as by `json.load`, the last value wins.
+"""
+
+# system imports
+import sys
+from json import JSONDecodeError, JSONDecoder
+from json.decoder import scanstring  # type: ignore[attr-defined]
+from typing import Any, Callable, TextIO
+
+# local imports
+from .errors import MissingPackageError
+
+
+# amount of characters read from a stream at once
+CHUNK_SIZE = 2**20
+# characters considered whitespace by JSON
+WHITESPACE = " \t\n\r"
+# first characters of JSON values other than objects
+NON_OBJECT_VALUES = '["-0123456789tfn'
+# decoding errors this close to the end of the buffer may be caused by a token cut by the chunk boundary
+# (e.g. a keyword, a number or a surrogate pair escape), errors further from the end are genuine
+TOKEN_LOOKAHEAD = 16
+
+
+class DependencyStreamParser:
+    """Incremental parser of dependency files, holding only a chunk of the file in memory.
+    """
+    def __init__(self, stream: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.offset = 0                      # amount of characters dropped from the start of the buffer
+        self.decoder = JSONDecoder()
+
+    def fill(self) -> bool:
+        """Drops consumed part of the buffer and appends the next chunk of the stream.
+
+        Returns:
+            bool: False if the stream is exhausted
+        """
+        chunk = self.stream.read(self.chunk_size)
+        self.offset += self.position
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return bool(chunk)
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character without consuming it, empty string at the end of the stream.
+        """
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str, message: str) -> None:
+        if self.peek() != char:
+            raise JSONDecodeError(message, self.buffer, self.position)
+        self.position += 1
+
+    def decode(self, decode_token: Callable[[], tuple[Any, int]]) -> Any:
+        """Decodes a token starting at the current position, extending the buffer while the token is incomplete.
+
+        The buffer is extended only if the error may be caused by the end of the buffer, i.e. the token is an unterminated
+        string or the error lies within 'TOKEN_LOOKAHEAD' characters of the end. Other errors are raised right away,
+        so malformed input is not read into memory up to its end.
+
+        Args:
+            decode_token (Callable[[], tuple[Any, int]]): decoder returning the token value and position after it
+
+        Returns:
+            Any: value of the token
+        """
+        while True:
+            try:
+                value, self.position = decode_token()
+                return value
+            except JSONDecodeError as exc:
+                # token may continue in the next chunk, the error is genuine only at the end of the stream
+                truncated = exc.msg.startswith("Unterminated string") or exc.pos >= len(self.buffer) - TOKEN_LOOKAHEAD
+                if not truncated or not self.fill():
+                    raise
+
+    def read_string(self) -> str:
+        self.peek()
+        return sys.intern(self.decode(lambda: scanstring(self.buffer, self.position + 1)))
+
+    def read_value(self) -> Any:
+        self.peek()
+        while True:
+            start = self.offset + self.position
+            value = self.decode(lambda: self.decoder.raw_decode(self.buffer, self.position))
+            if len(self.buffer) - self.position > TOKEN_LOOKAHEAD:
+                return value
+            # numbers may continue in the next chunk (e.g. "1" followed by ".5"), decoding is repeated on the extended buffer
+            self.position = start - self.offset
+            if not self.fill():
+                return self.decode(lambda: self.decoder.raw_decode(self.buffer, self.position))
+
+    def parse(self) -> dict[str, list]:
+        """Parses and verifies the whole stream.
+
+        Returns:
+            dict[str, list]: verified dependency relations with interned package names
+        """
+        dependency_data: dict[str, list] = {}
+        pending: dict[str, None] = {}        # ordered set of referenced, but not yet defined packages
+        invalid_dependencies: list = []      # dependencies, which are not strings and can never be defined
+        duplicate_keys = False
+
+        first_char = self.peek()
+        if first_char in NON_OBJECT_VALUES and first_char:
+            raise TypeError("Loaded JSON file does not provide a dictionary")
+        self.expect("{", "Expecting value")
+
+        if self.peek() == "}":
+            self.position += 1
+        else:
+            while True:
+                if self.peek() != '"':
+                    raise JSONDecodeError("Expecting property name enclosed in double quotes", self.buffer, self.position)
+                pkg = self.read_string()
+                self.expect(":", "Expecting ':' delimiter")
+                if self.peek() != "[":
+                    raise TypeError(f"ERROR: Package {pkg!r} dependencies are not a list")
+                dependencies = self.read_dependencies()
+
+                if pkg in dependency_data:
+                    duplicate_keys = True
+                dependency_data[pkg] = dependencies
+                pending.pop(pkg, None)
+                for dependency in dependencies:
+                    if not isinstance(dependency, str):
+                        invalid_dependencies.append(dependency)
+                    elif dependency not in dependency_data:
+                        pending[dependency] = None
+
+                delimiter = self.peek()
+                self.position += 1
+                if delimiter == "}":
+                    break
+                if delimiter != ",":
+                    raise JSONDecodeError("Expecting ',' delimiter", self.buffer, self.position - 1)
+
+        if self.peek() != "":
+            raise JSONDecodeError("Extra data", self.buffer, self.position)
+
+        if duplicate_keys:
+            # dependencies of overwritten values are no longer part of the data
+            pending = {dependency: None for dependencies in dependency_data.values() for dependency in dependencies
+                       if isinstance(dependency, str) and dependency not in dependency_data}
+            invalid_dependencies = [dependency for dependencies in dependency_data.values() for dependency in dependencies
+                                    if not isinstance(dependency, str)]
+        unresolved = invalid_dependencies + list(pending)
+        if unresolved:
+            raise MissingPackageError(f"ERROR: Package {unresolved[0]!r} was not found in dependency list")
+        return dependency_data
+
+    def read_dependencies(self) -> list:
+        """Reads a list of dependencies, the current position is at its opening bracket.
+
+        Returns:
+            list: interned names of dependencies, other JSON values are kept as they are
+        """
+        self.position += 1
+        dependencies: list = []
+        if self.peek() == "]":
+            self.position += 1
+            return dependencies
+        while True:
+            dependencies.append(self.read_string() if self.peek() == '"' else self.read_value())
+            delimiter = self.peek()
+            self.position += 1
+            if delimiter == "]":
+                return dependencies
+            if delimiter != ",":
+                raise JSONDecodeError("Expecting ',' delimiter", self.buffer, self.position - 1)
+
+
+def stream_dependency_data(stream: TextIO, chunk_size: int = CHUNK_SIZE) -> dict[str, list]:
+    """Parses and verifies dependency relations from a text stream, reading it in chunks.
+
+    Args:
+        stream (TextIO): text stream of the dependency file
+        chunk_size (int, optional): amount of characters read at once. Defaults to CHUNK_SIZE.
+
+    Returns:
+        dict[str, list]: verified dependency relations with interned package names
+    """
+    return DependencyStreamParser(stream, chunk_size).parse()
@@ -0,0 +1,69 @@
+# system imports
+from os.path import dirname, abspath, join
+import json
+import sys
+
+# local imports
+from exercise_one.exercise_one import detect_duplicate_elements_hybrid
+from exercise_two.exercise_two import DependencyResolver
+
+# third-party imports
+import pytest
+
+# benchmark scripts import each other as top-level modules
+BENCHMARKS_PATH = join(dirname(dirname(abspath(__file__))), "benchmarks")
+sys.path.insert(0, BENCHMARKS_PATH)
+import generators  # noqa: E402
+import startup  # noqa: E402
+import suite  # noqa: E402
+
+
+def load_baseline(file_name: str) -> dict:
+    with open(join(BENCHMARKS_PATH, file_name)) as file:
+        return json.load(file)
+
+
+@pytest.mark.parametrize('generate, packages',
+                         [(lambda seed: generators.chain(10, seed), 10),
+                          (lambda seed: generators.fan_out(10, seed), 10),
+                          (lambda seed: generators.diamond_lattice(3, 4, seed), 12),
+                          (lambda seed: generators.random_dag(30, 3, seed), 30),
+                          (lambda seed: generators.near_cyclic(30, seed=seed), 30),
+                          ])
+def test_dependency_generators(generate, packages):
+    dependency_data = generate(0)
+    assert len(dependency_data) == packages
+    assert dependency_data == generate(0)
+    assert all(dependency in dependency_data for dependencies in dependency_data.values() for dependency in dependencies)
+    # generated graphs are acyclic
+    assert len(DependencyResolver().verified_resolution_order(dependency_data)) == packages
+
+
+def test_mixed_list():
+    elements = generators.mixed_list(200, duplicate_ratio=0, seed=1)
+    assert len(elements) == 200
+    assert elements == generators.mixed_list(200, duplicate_ratio=0, seed=1)
+    assert detect_duplicate_elements_hybrid(elements) == []
+    assert detect_duplicate_elements_hybrid(generators.mixed_list(200, duplicate_ratio=0.5)) != []
+    assert {type(element) for element in generators.mixed_list(200, hashable=True)} <= {int, float, str, tuple}
+
+
+def test_suite_smoke():
+    results = suite.run_suite(scale=0.0001, repeat=1)
+    assert all(duration >= 0 for phases in results.values() for duration in phases.values())
+    # the committed reference result covers the same cases and phases
+    baseline = load_baseline("baseline.json")["results"]
+    assert {case: set(phases) for case, phases in results.items()} == {case: set(phases) for case, phases in baseline.items()}
+
+
+def test_suite_compare():
+    baseline = dict(chain=dict(load=1.0, render=1.0), int_list=dict(detect=0.0))
+    results = dict(chain=dict(load=1.2, render=1.5), int_list=dict(detect=1.0), fan_out=dict(load=1.0))
+    regressions = suite.compare(results, baseline, 1.25)
+    assert len(regressions) == 1 and regressions[0].startswith("chain/render")
+
+
+def test_startup_smoke():
+    results = startup.run_startup(files=2, repeat=1)
+    assert all(duration > 0 for phases in results.values() for duration in phases.values())
+    assert set(results) == set(load_baseline("startup_baseline.json")["results"])
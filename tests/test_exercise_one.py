@@ -0,0 +1,302 @@
+# system imports
+import io
+import json
+import random
+
+# local imports
+from exercise_one import exercise_one
+from exercise_one.exercise_one import (detect_duplicate_elements, detect_duplicate_elements_linear,
+                                       detect_duplicate_elements_hybrid, detect_duplicate_elements_vectorized,
+                                       detect_duplicate_elements_parallel, detect_duplicate_occurrences, strict_key,
+                                       DuplicateTracker)
+from exercise_one.external import canonical_key, iter_duplicates, iter_duplicates_external
+import entry_points
+
+# third-party imports
+from click.testing import CliRunner
+import pytest
+
+
+# helper function
+def assert_identical(result: list, expected: list):
+    # equality alone would hide 1 vs True mix-ups, so types of the returned representatives are compared as well
+    assert result == expected
+    assert [type(element) for element in result] == [type(element) for element in expected]
+
+
+@pytest.mark.parametrize('elements, expected',
+                         [(["b", "a", "c", "c", "e", "a", "c", "d", "c", "d"], ["a", "c", "d"]),
+                          ([], []),
+                          (["a", 0, 0., "a", True, [], (), ["a"], None, (1,), 1], ["a", 0, True]),
+                          ([('a',), 'a'], []),
+                          ([[1, 2, 3], 1, 2, 3, [1, 2], [1, 2, 3]], [[1, 2, 3]]),
+                          ])
+def test_detect_duplicate_elements(elements, expected):
+    assert_identical(detect_duplicate_elements(elements), expected)
+
+
+def test_hybrid_matches_linear_on_mixed_types():
+    rng = random.Random(42)
+    pool = [0, 1, 2, 0., 1., 2.5, True, False, None, "a", "b", "1", (), (1,), (1, [2]),
+            [], [1], [1, 2], {"a": 1}, {1}, frozenset({1}), b"a", bytearray(b"a"),
+            {1: 0}.keys(), {1: 0}.items(), {(1, 0)}, frozenset({(1, 0)})]
+    for _ in range(200):
+        elements = [rng.choice(pool) for _ in range(rng.randint(0, 40))]
+        assert_identical(detect_duplicate_elements_hybrid(elements), detect_duplicate_elements_linear(elements))
+
+
+@pytest.mark.parametrize('elements', [[{1}, {1: 0}.keys()],
+                                      [frozenset({1}), {1: 0}.keys()],
+                                      [{1: 0}.items(), {(1, 0)}],
+                                      [{1: [2]}.items(), {1: [2]}.items()]])
+def test_hybrid_matches_linear_on_dict_views(elements):
+    assert_identical(detect_duplicate_elements_hybrid(elements), detect_duplicate_elements_linear(elements))
+    assert len(detect_duplicate_elements_hybrid(elements)) == 1
+
+
+def test_hybrid_keeps_identity_semantics():
+    nan = float("nan")
+    elements = [nan, float("nan"), nan]
+    assert_identical(detect_duplicate_elements_hybrid(elements), detect_duplicate_elements_linear(elements))
+
+
+def test_tracker_incremental_snapshot():
+    tracker = DuplicateTracker()
+    tracker.extend(iter(["b", "a", "c", "c"]))
+    assert tracker.duplicates() == ["c"]
+    tracker.extend(["e", "a", "c", "d", "c", "d"])
+    assert tracker.duplicates() == ["a", "c", "d"]
+
+
+def test_tracker_add():
+    tracker = DuplicateTracker()
+    assert [tracker.add(element) for element in [1, True, [1], [1], 1.]] == [False, True, False, True, False]
+    assert_identical(tracker.duplicates(), [1, [1]])
+
+
+def test_tracker_iter_duplicates():
+    tracker = DuplicateTracker()
+    records = (record for record in ["b", "a", "c", "c", "e", "a", "c", "d", "c", "d"])
+    assert list(tracker.iter_duplicates(records)) == ["c", "a", "d"]
+    assert tracker.duplicates() == ["a", "c", "d"]
+
+
+def test_tracker_memory_bound():
+    tracker = DuplicateTracker()
+    tracker.extend(index % 10 for index in range(10000))
+    assert len(tracker.unique_elements) == 10
+    assert len(tracker.duplicates()) == 10
+
+
+@pytest.mark.parametrize('generator',
+                         [(lambda rng: rng.randint(-50, 50)),
+                          (lambda rng: rng.randint(0, 100) / 4),
+                          (lambda rng: rng.choice("abcdefgh") * rng.randint(1, 3)),
+                          ])
+def test_vectorized_matches_hybrid(generator):
+    pytest.importorskip("numpy")
+    rng = random.Random(7)
+    elements = [generator(rng) for _ in range(3000)]
+    assert_identical(detect_duplicate_elements_vectorized(elements), detect_duplicate_elements_hybrid(elements))
+    assert_identical(detect_duplicate_elements(elements), detect_duplicate_elements_hybrid(elements))
+
+
+def test_vectorized_array_input():
+    np = pytest.importorskip("numpy")
+    assert detect_duplicate_elements(np.array([3, 1, 2, 1, 3, 3])) == [3, 1]
+    assert detect_duplicate_elements(np.array([[1, 2], [1, 2]])) == [[1, 2]]
+
+
+@pytest.mark.parametrize('elements',
+                         [([float("nan")] * 2),
+                          (["a", "a\x00"]),
+                          ([2**70, 2**70]),
+                          ])
+def test_vectorized_refuses_inexact(elements):
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        detect_duplicate_elements_vectorized(elements)
+
+
+def test_vectorized_refuses_padded_strings(monkeypatch):
+    def fail(elements):
+        raise AssertionError("padded strings must not be vectorized")
+    monkeypatch.setattr(exercise_one, "detect_duplicate_elements_vectorized", fail)
+    elements = ["a"] * 1000 + ["b" * 100_000]
+    assert detect_duplicate_elements(elements) == ["a"]
+
+
+def test_vectorized_memory_error_fallback(monkeypatch):
+    def fail(elements):
+        raise MemoryError
+    monkeypatch.setattr(exercise_one, "detect_duplicate_elements_vectorized", fail)
+    assert detect_duplicate_elements([index % 10 for index in range(2000)]) == list(range(10))
+
+
+def test_vectorized_fallback_without_numpy(monkeypatch):
+    monkeypatch.setattr(exercise_one, "np", None)
+    elements = ["b", "a", "c", "c", "e", "a", "c", "d", "c", "d"] * 200
+    assert detect_duplicate_elements(elements) == ["b", "a", "c", "e", "d"]
+    with pytest.raises(ImportError):
+        detect_duplicate_elements_vectorized(elements)
+
+
+@pytest.mark.parametrize('fork', [True, False])
+def test_parallel_matches_hybrid(monkeypatch, fork):
+    # forked workers read the list inherited from the parent, spawned workers get it pickled
+    monkeypatch.setattr(exercise_one, "FORK_WORKERS", fork)
+    rng = random.Random(3)
+    pool = [0, 1, 0., True, None, "a", "b", (), (1,), [], [1], {1}, frozenset({1}), b"a", bytearray(b"a")]
+    if fork:
+        # dict views can not be pickled
+        pool += [{1: 0}.keys(), {1: 0}.items(), frozenset({(1, 0)}), {1: [2]}.items()]
+    elements = [rng.choice(pool) for _ in range(500)] + list(range(500)) + [rng.randint(0, 2000) for _ in range(500)]
+    assert_identical(detect_duplicate_elements_parallel(elements, workers=3, threshold=0), detect_duplicate_elements_hybrid(elements))
+    assert exercise_one.SHARED_ELEMENTS == []
+
+
+def test_parallel_spawned_workers_strings(monkeypatch):
+    # spawned workers have their own string hash seeds, equal strings must still meet in the same shard
+    monkeypatch.setattr(exercise_one, "FORK_WORKERS", False)
+    elements = [f"element{index % 500}" for index in range(2000)] + [(f"tuple{index % 7}",) for index in range(50)]
+    assert_identical(detect_duplicate_elements_parallel(elements, workers=3, threshold=0), detect_duplicate_elements_hybrid(elements))
+
+
+def test_parallel_below_threshold(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("process pool must not be started")
+    monkeypatch.setattr(exercise_one, "ProcessPoolExecutor", fail)
+    assert detect_duplicate_elements(["a", "b", "a"], workers=4) == ["a"]
+
+
+@pytest.mark.parametrize('elements, expected',
+                         [(["a", 0, 0., "a", True, [], (), ["a"], None, (1,), 1], ["a"]),
+                          ([1, 1., True, 1, True], [1, True]),
+                          ([[1, [2]], [1, [2.]], [1, (2,)], [1, [2]]], [[1, [2]]]),
+                          ([{"a": [1]}, {"a": [True]}, {"a": [1]}, {1: 2}, {1.: 2}], [{"a": [1]}]),
+                          ([{1, 2}, frozenset({1, 2}), {2, 1}, {1., 2}], [{1, 2}]),
+                          ([bytearray(b"a"), b"a", bytearray(b"a")], [bytearray(b"a")]),
+                          ])
+def test_strict_detection(elements, expected):
+    assert_identical(detect_duplicate_elements(elements, strict=True), expected)
+
+
+@pytest.mark.parametrize('first, second',
+                         [([1, {"a": {2}}], [1, {"a": {2}}]),
+                          ({1: [], 2: ()}, {2: (), 1: []}),
+                          ])
+def test_strict_key_equal(first, second):
+    assert strict_key(first) == strict_key(second)
+    assert hash(strict_key(first)) == hash(strict_key(second))
+
+
+@pytest.mark.parametrize('first, second',
+                         [(1, True),
+                          (1, 1.),
+                          ([], ()),
+                          ({1}, frozenset({1})),
+                          ([[0]], [[False]]),
+                          ])
+def test_strict_key_not_equal(first, second):
+    assert strict_key(first) != strict_key(second)
+
+
+def test_strict_unhashable_fallback():
+    # objects without a hashable key fall back to the linear lookup of keys
+    class Unhashable:
+        __hash__ = None  # type: ignore[assignment]
+
+        def __eq__(self, other):
+            return isinstance(other, Unhashable)
+    first, second = Unhashable(), Unhashable()
+    assert detect_duplicate_elements([first, [0], second, [False]], strict=True) == [first]
+
+
+def test_duplicate_occurrences():
+    elements = ["b", 1, "a", True, "b", 1., [1], "b", [True], 1]
+    assert detect_duplicate_occurrences(elements) == [("b", 0, 3), (1, 1, 4), ([1], 6, 2)]
+    assert detect_duplicate_occurrences(elements, strict=True) == [("b", 0, 3), (1, 1, 2)]
+    assert detect_duplicate_occurrences([1, 2, 3]) == []
+
+
+def test_strict_parallel_matches_hybrid():
+    rng = random.Random(5)
+    pool = [0, 1, 0., 1., True, False, None, "a", (), (1,), (1.,), [], [1], [True], {1}, {1.}, {"a": 1}, {"a": True}]
+    elements = [rng.choice(pool) for _ in range(600)]
+    expected = detect_duplicate_elements_hybrid(elements, strict=True)
+    assert_identical(detect_duplicate_elements_parallel(elements, workers=3, threshold=0, strict=True), expected)
+    assert_identical(expected, [element for index, element in enumerate(elements)
+                                if [strict_key(other) for other in elements].count(strict_key(element)) > 1
+                                and strict_key(element) not in [strict_key(other) for other in elements[:index]]])
+
+
+@pytest.mark.parametrize('run_size', [1, 7, 1000])
+def test_external_lines_matches_hybrid(run_size):
+    rng = random.Random(11)
+    elements = [rng.choice("abcdefghijklmnopqrstuvwxyz") * rng.randint(1, 2) for _ in range(300)]
+    stream = io.StringIO("\n".join(elements) + "\n")
+    assert list(iter_duplicates_external(stream, "lines", run_size)) == detect_duplicate_elements_hybrid(elements)
+
+
+@pytest.mark.parametrize('run_size', [2, 1000])
+def test_external_ndjson_matches_in_memory(run_size):
+    values = [1, "1", True, [1, 2], [1.0, 2], {"a": 1, "b": [None]}, None, 2.5, {"b": [None], "a": 1.0}, "1", None]
+    ndjson = "\n".join(json.dumps(value) for value in values) + "\n\n"
+    expected = [json.dumps(value) for value in detect_duplicate_elements_hybrid(values)]
+    assert list(iter_duplicates(io.StringIO(ndjson), "ndjson")) == expected
+    assert list(iter_duplicates_external(io.StringIO(ndjson), "ndjson", run_size)) == expected
+
+
+@pytest.mark.parametrize('first, second',
+                         [(1, 1.0),
+                          (True, 1),
+                          ({"a": [0, "x"]}, {"a": [False, "x"]}),
+                          ])
+def test_canonical_key_equal(first, second):
+    assert canonical_key(first) == canonical_key(second)
+
+
+@pytest.mark.parametrize('first, second',
+                         [(1, "1"),
+                          (1.5, 1),
+                          ([1, 2], [2, 1]),
+                          ({"a": 1}, ["a", 1]),
+                          ])
+def test_canonical_key_not_equal(first, second):
+    assert canonical_key(first) != canonical_key(second)
+
+
+def test_external_invalid_run_size():
+    with pytest.raises(ValueError):
+        list(iter_duplicates_external(io.StringIO("a\n"), "lines", 0))
+
+
+@pytest.mark.parametrize('arguments', [[], ["--external", "--run-size", "1"]])
+def test_detect_duplicate_command_input(tmp_path, arguments):
+    input_path = tmp_path / "elements.txt"
+    input_path.write_text("b\na\nb\nc\na\n")
+    result = CliRunner().invoke(entry_points.detect_duplicate, ["--input", str(input_path)] + arguments)
+    assert result.exit_code == 0
+    assert result.output == "b\na\n"
+
+
+def test_detect_duplicate_command_ndjson_stdin():
+    result = CliRunner().invoke(entry_points.detect_duplicate, ["--input", "-", "--format", "ndjson"], input='1\n1.0\n"a"\n[1]\n[1]\n')
+    assert result.exit_code == 0
+    assert result.output == "1\n[1]\n"
+
+
+@pytest.mark.parametrize('arguments', [["--external", "a", "a"],
+                                       ["--run-size", "2", "a", "a"],
+                                       ["--format", "lines", "a", "a"],
+                                       ["--input", "-", "a", "a"]])
+def test_detect_duplicate_command_usage_error(arguments):
+    result = CliRunner().invoke(entry_points.detect_duplicate, arguments, input="a\n")
+    assert result.exit_code == 2
+    assert "--input" in result.output
+
+
+def test_detect_duplicate_command_elements():
+    result = CliRunner().invoke(entry_points.detect_duplicate, ["a", "b", "a"])
+    assert result.exit_code == 0
+    assert result.output == "['a']\n"
@@ -1,12 +1,41 @@
 # system imports
 from os.path import dirname, abspath, join
+import asyncio
+import io
 import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
 
 # local imports
+from exercise_two.__main__ import main
+from exercise_two.batch import resolve_batch
 from exercise_two.exercise_two import (CyclicDependencyError, MissingPackageError, Package, DependencyResolver,
                                        show_dependency_graph, build_dependency_graph)
+from exercise_two import client, daemon
+from exercise_two.client import DaemonQueryError, default_socket_path, query
+from exercise_two.compact_graph import CompactGraph
+from exercise_two.daemon import ResolverDaemon
+from exercise_two.graph_cache import GraphCache
+from exercise_two.graph_diff import diff_dependency_data, diff_dependency_files
+from exercise_two.errors import ConflictingPackageError
+from exercise_two.exporters import export_graph
+from exercise_two.lazy_graph import LazyGraph, resolve_lazy_graph
+from exercise_two.manifests import expand_manifests, load_manifests, resolve_manifests
+from exercise_two.instrumentation import NO_PHASE, ResolverHook, ResolverStats
+from exercise_two.bitsets import bit_count, iter_bits
+from exercise_two.reachability import ReachabilityIndex
+from exercise_two.renderer import render_graph
+from exercise_two.snapshot import compile_snapshot, open_snapshot
+from exercise_two.scheduler import FAILED, SKIPPED, SUCCEEDED, run_build, topological_levels
+from exercise_two.streaming import stream_dependency_data
+import entry_points
 
 # third-party imports
+from click.testing import CliRunner
 import pytest
 
 
@@ -44,6 +73,47 @@ def test_package_eq_type_mismatch():
     assert p1 != 'package'
 
 
+def test_package_hash():
+    p1 = Package('pkg')
+    p1.dependencies = [Package('dep')]
+    p2 = Package('pkg')
+    p2.dependencies = [Package('dep')]
+    assert hash(p1) == hash(p2)
+    assert len({p1, p2, Package('pkg')}) == 2
+    assert {p1: 'value'}[p2] == 'value'
+
+
+def test_package_eq_after_reassignment():
+    p1 = Package('pkg')
+    p2 = Package('pkg')
+    assert p1 == p2
+    p1.dependencies = [Package('dep')]
+    assert p1 != p2
+
+
+def test_package_digest_cycle():
+    p1 = Package('pkg1')
+    p2 = Package('pkg2')
+    p1.dependencies = [p2]
+    p2.dependencies = [p1]
+    with pytest.raises(CyclicDependencyError):
+        p1.structural_digest()
+
+
+def test_diamond_lattice_eq():
+    # every layer depends on both packages of the next layer, which gives 2**layers paths through the graph
+    layers = 200
+    dependency_data = {f"pkg{layer}{side}": [f"pkg{layer + 1}a", f"pkg{layer + 1}b"] for layer in range(layers) for side in "ab"}
+    dependency_data.update({f"pkg{layers}a": [], f"pkg{layers}b": []})
+
+    dr = DependencyResolver()
+    graph = dr.resolve_dependency_data(dependency_data)
+    other_graph = dr.resolve_dependency_data(dependency_data)
+    assert graph == other_graph
+    assert graph["pkg0a"] != graph["pkg0b"]
+    assert hash(graph["pkg0a"]) == hash(other_graph["pkg0a"])
+
+
 def test_package_repr(log_stdout):
     p1 = Package('pkg')
     print(p1)
@@ -96,6 +166,38 @@ def test_cyclic_import(file_name):
         assert dr.resolve_graph(add_test_path(file_name))
 
 
+@pytest.mark.parametrize('file_name, cycles',
+                         [('cyclic_import.json', [['pkg1', 'pkg2']]),
+                          ('self_import.json', [['pkg6']]),
+                          ('cyclic_import_worst_case_fail.json', [['pkg1', 'pkg2', 'pkg3', 'pkg4']])])
+def test_cyclic_import_members(file_name, cycles):
+    with pytest.raises(CyclicDependencyError) as exc_info:
+        dr = DependencyResolver()
+        dr.resolve_graph(add_test_path(file_name))
+    assert exc_info.value.cycles == cycles
+
+
+def test_cyclic_import_all_components():
+    dependency_data = dict(pkg1=["pkg2"], pkg2=["pkg1"], pkg3=["pkg4"], pkg4=["pkg5"], pkg5=["pkg3", "pkg6"], pkg6=[])
+    with pytest.raises(CyclicDependencyError) as exc_info:
+        dr = DependencyResolver()
+        dr.resolve_dependency_data(dependency_data)
+    assert exc_info.value.cycles == [['pkg1', 'pkg2'], ['pkg3', 'pkg4', 'pkg5']]
+
+
+def test_deep_chain():
+    chain_length = 100_000
+    dependency_data = {f"pkg{index}": [f"pkg{index + 1}"] for index in range(chain_length)}
+    dependency_data[f"pkg{chain_length}"] = []
+
+    dr = DependencyResolver()
+    graph = dr.resolve_dependency_data(dependency_data)
+
+    assert len(graph) == chain_length + 1
+    assert list(graph)[0] == f"pkg{chain_length}"
+    assert graph["pkg0"].dependencies[0] is graph["pkg1"]
+
+
 def test_cyclic_import_pass():
     p1 = Package('pkg1')
     p2 = Package('pkg2')
@@ -131,6 +233,36 @@ def test_example(example_structure, file_name):
     assert dr.resolve_graph(add_test_path(file_name)) == example_structure
 
 
+@pytest.mark.parametrize('file_name',
+                         [('deps.json'),
+                          ('cyclic_import_worst_case_pass.json'),
+                          ('empty_dependencies.json')])
+def test_compact_graph(file_name):
+    dr = DependencyResolver()
+    compact_graph = dr.resolve_compact_graph(add_test_path(file_name))
+    graph = dr.resolve_graph(add_test_path(file_name))
+    assert list(compact_graph) == list(graph)
+    assert compact_graph == graph
+    assert all(compact_graph[name] == package for name, package in graph.items())
+    assert all(hash(compact_graph[name]) == hash(package) for name, package in graph.items())
+
+
+def test_compact_graph_view(log_stdout):
+    dr = DependencyResolver()
+    compact_graph = dr.resolve_compact_graph(add_test_path("deps.json"))
+    package = compact_graph["pkg1"]
+    assert [dependency.name for dependency in package.dependencies] == ["pkg2", "pkg3"]
+    assert package != compact_graph["pkg2"]
+    assert package != "pkg1"
+    print(package)
+    package.structural_print()
+    assert log_stdout["stdout"] == "PackageView(name='pkg1', dependencies=['pkg2', 'pkg3'])\n"  \
+                                   "- pkg1\n"       \
+                                   "  - pkg2\n"     \
+                                   "    - pkg3\n"   \
+                                   "  - pkg3\n"
+
+
 def test_build_dependency_graph(example_structure):
     assert build_dependency_graph(add_test_path("deps.json")) == example_structure
 
@@ -160,3 +292,747 @@ def test_show_dependency_graph(log_stdout):
                   "    - pkg3\n"   \
                   "  - pkg3\n"
     assert log_stdout["stdout"] == comp_string
+
+
+@pytest.mark.parametrize('mode, max_depth, comp_string',
+                         [('compact', None, "- pkg3\n- pkg2\n  - pkg3\n- pkg1\n  - pkg2 (see above)\n  - pkg3\n"),
+                          ('flat', None, "pkg3:\npkg2: pkg3\npkg1: pkg2, pkg3\n"),
+                          ('tree', 1, "- pkg3\n- pkg2\n  - pkg3\n- pkg1\n  - pkg2\n  - pkg3\n"),
+                          ('compact', 0, "- pkg3\n- pkg2\n- pkg1\n"),
+                          ])
+def test_render_modes(log_stdout, mode, max_depth, comp_string):
+    show_dependency_graph(add_test_path("deps.json"), mode, max_depth)
+    assert log_stdout["stdout"] == comp_string
+    assert log_stdout["write_cnt"] == 1
+
+
+def test_render_compact_linear_output():
+    layers = 200
+    dependency_data = {f"pkg{layer}{side}": [f"pkg{layer + 1}a", f"pkg{layer + 1}b"] for layer in range(layers) for side in "ab"}
+    dependency_data.update({f"pkg{layers}a": [], f"pkg{layers}b": []})
+    dr = DependencyResolver()
+    stream = io.StringIO()
+    render_graph(dr.resolve_dependency_data(dependency_data), stream, "compact")
+    assert len(stream.getvalue().splitlines()) < 5 * len(dependency_data)
+
+
+def test_render_invalid_mode():
+    with pytest.raises(ValueError):
+        render_graph({}, io.StringIO(), "graph")
+
+
+@pytest.mark.parametrize('output_format, comp_string',
+                         [('json', '{\n  "pkg3": [],\n  "pkg2": ["pkg3"],\n  "pkg1": ["pkg2", "pkg3"]\n}\n'),
+                          ('dot', 'digraph dependencies {\n  "pkg3";\n  "pkg2";\n  "pkg2" -> "pkg3";\n  "pkg1";\n'
+                                  '  "pkg1" -> "pkg2";\n  "pkg1" -> "pkg3";\n}\n'),
+                          ])
+def test_export_formats(log_stdout, output_format, comp_string):
+    show_dependency_graph(add_test_path("deps.json"), output_format=output_format)
+    assert log_stdout["stdout"] == comp_string
+    assert log_stdout["write_cnt"] == 1
+
+
+def test_export_ndjson():
+    dependency_data = {"a": ["b", "c"], "b": ["d"], "c": ["d"], "d": [], "e": ["a", "d"], "f": []}
+    stream = io.StringIO()
+    export_graph(DependencyResolver().compact_graph_from_data(dependency_data), stream, "ndjson")
+    records = {record["name"]: record for record in map(json.loads, stream.getvalue().splitlines())}
+    assert list(records) == ["d", "b", "c", "a", "e", "f"]
+    assert records["a"] == dict(name="a", dependencies=["b", "c"], transitive_dependencies=3, depth=2)
+    assert [(records[pkg]["transitive_dependencies"], records[pkg]["depth"]) for pkg in "bcdef"] == [(1, 1), (1, 1), (0, 0), (4, 3), (0, 0)]
+
+
+def test_export_json_round_trip():
+    dependency_data = {f"pkg{index}": [f"pkg{dependency}" for dependency in range(index)][-3:] for index in range(50)}
+    dependency_data['quoted "pkg"'] = ["pkg49"]
+    stream = io.StringIO()
+    export_graph(DependencyResolver().resolve_dependency_data(dependency_data), stream, "json")
+    assert json.loads(stream.getvalue()) == dependency_data
+    stream = io.StringIO()
+    export_graph({}, stream, "json")
+    assert json.loads(stream.getvalue()) == {}
+
+
+def test_export_invalid_format():
+    with pytest.raises(ValueError):
+        export_graph({}, io.StringIO(), "yaml")
+
+
+def test_compact_graph_serialization():
+    dr = DependencyResolver()
+    compact_graph = dr.resolve_compact_graph(add_test_path("deps.json"))
+    loaded_graph = CompactGraph.from_bytes(compact_graph.to_bytes())
+    assert list(loaded_graph) == list(compact_graph)
+    assert loaded_graph == compact_graph
+    with pytest.raises(ValueError):
+        CompactGraph.from_bytes(compact_graph.to_bytes()[:-3])
+
+
+def test_graph_cache_hit(tmp_path, monkeypatch, example_structure):
+    cache = GraphCache(tmp_path / "cache")
+    dr = DependencyResolver(cache)
+    assert dr.resolve_compact_graph(add_test_path("deps.json")) == example_structure
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached graph must not be parsed again")
+    monkeypatch.setattr(DependencyResolver, "compact_graph_from_content", fail)
+    assert dr.resolve_compact_graph(add_test_path("deps.json")) == example_structure
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_graph_cache_content_change(tmp_path):
+    file_path = tmp_path / "deps.json"
+    file_path.write_text(json.dumps({"pkg1": []}))
+    cache = GraphCache(tmp_path / "cache")
+    dr = DependencyResolver(cache)
+    assert list(dr.resolve_compact_graph(file_path)) == ["pkg1"]
+
+    file_path.write_text(json.dumps({"pkg1": ["pkg2"], "pkg2": []}))
+    assert list(dr.resolve_compact_graph(file_path)) == ["pkg2", "pkg1"]
+    assert cache.misses == 2
+
+
+def test_graph_cache_invalid_file(tmp_path):
+    cache = GraphCache(tmp_path / "cache")
+    dr = DependencyResolver(cache)
+    for _ in range(2):
+        with pytest.raises(MissingPackageError):
+            dr.resolve_compact_graph(add_test_path("missing_package.json"))
+    assert cache.misses == 2
+
+
+def test_graph_cache_eviction(tmp_path):
+    cache = GraphCache(tmp_path / "cache", max_bytes=1)
+    dr = DependencyResolver(cache)
+    for file_name in ("deps.json", "simple_dependencies.json"):
+        dr.resolve_compact_graph(add_test_path(file_name))
+    assert len(list((tmp_path / "cache").glob("*.graph"))) == 0
+    assert list(dr.resolve_compact_graph(add_test_path("deps.json"))) == ["pkg3", "pkg2", "pkg1"]
+    cache.flush()
+    index = json.loads((tmp_path / "cache" / "index.json").read_text())
+    assert index["paths"] == {} and index["entries"] == {}
+
+
+def test_graph_cache_index_once_per_session(tmp_path, monkeypatch):
+    reads = []
+    read_index = GraphCache.read_index
+    monkeypatch.setattr(GraphCache, "read_index", lambda self: reads.append(1) or read_index(self))
+    with GraphCache(tmp_path / "cache") as cache:
+        dr = DependencyResolver(cache)
+        for _ in range(3):
+            for file_name in ("deps.json", "simple_dependencies.json"):
+                dr.resolve_compact_graph(add_test_path(file_name))
+        assert not (tmp_path / "cache" / "index.json").exists()
+    # loaded once, read once more to merge changes of other processes on flush
+    assert len(reads) == 2
+
+    with GraphCache(tmp_path / "cache") as cache:
+        cache.load()
+        assert len(cache.paths) == 2 and cache.total_bytes == sum(size for _, size in cache.entries.values())
+        DependencyResolver(cache).resolve_compact_graph(add_test_path("deps.json"))
+        assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_graph_cache_hit_keeps_index(tmp_path):
+    index_path = tmp_path / "cache" / "index.json"
+    with GraphCache(tmp_path / "cache") as cache:
+        for file_name in ("deps.json", "simple_dependencies.json"):
+            DependencyResolver(cache).resolve_compact_graph(add_test_path(file_name))
+    content, modified = index_path.read_bytes(), index_path.stat().st_mtime_ns
+
+    # a warm hit records its recency in the entry file, not in the index
+    with GraphCache(tmp_path / "cache") as cache:
+        DependencyResolver(cache).resolve_compact_graph(add_test_path("deps.json"))
+        assert cache.hits == 1 and not cache.dirty
+    assert (index_path.read_bytes(), index_path.stat().st_mtime_ns) == (content, modified)
+
+    # eviction follows the recency of entry files, the hit entry is kept
+    cache = GraphCache(tmp_path / "cache")
+    cache.load()
+    cache.max_bytes = int(max(size for _, size in cache.entries.values()) / 0.9) + 1
+    cache.evict()
+    assert list(cache.paths) == [os.path.abspath(add_test_path("deps.json"))]
+
+
+def test_graph_cache_merges_concurrent_sessions(tmp_path):
+    first, second = GraphCache(tmp_path / "cache"), GraphCache(tmp_path / "cache")
+    DependencyResolver(first).resolve_compact_graph(add_test_path("deps.json"))
+    DependencyResolver(second).resolve_compact_graph(add_test_path("simple_dependencies.json"))
+    first.flush()
+    second.flush()
+    assert len(GraphCache(tmp_path / "cache").paths) == 0
+    cache = GraphCache(tmp_path / "cache")
+    cache.load()
+    assert len(cache.paths) == 2 and len(cache.entries) == 2
+
+
+def test_graph_cache_corrupted_index(tmp_path):
+    with GraphCache(tmp_path) as cache:
+        DependencyResolver(cache).resolve_compact_graph(add_test_path("deps.json"))
+    (tmp_path / "index.json").write_text("{")
+    with GraphCache(tmp_path) as cache:
+        DependencyResolver(cache).resolve_compact_graph(add_test_path("deps.json"))
+        # the ledger is rebuilt from entries, the index from hashes of the files
+        assert (cache.hits, cache.misses, len(cache.entries)) == (1, 0, 1)
+    assert json.loads((tmp_path / "index.json").read_text())["version"] > 0
+
+
+def test_graph_cache_unwritable_directory(tmp_path, example_structure):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    with GraphCache(blocker / "cache") as cache:
+        dr = DependencyResolver(cache)
+        for _ in range(2):
+            assert dr.resolve_compact_graph(add_test_path("deps.json")) == example_structure
+    assert cache.misses == 2
+
+
+@pytest.mark.parametrize('file_name, exception',
+                         [('empty.json', json.JSONDecodeError),
+                          ('invalid_json.json', json.JSONDecodeError),
+                          ('list_json.json', TypeError),
+                          ('invalid_dependencies.json', TypeError),
+                          ('missing_package.json', MissingPackageError),
+                          ('cyclic_import.json', CyclicDependencyError),
+                          ('self_import.json', CyclicDependencyError)])
+def test_streaming_errors(file_name, exception):
+    with pytest.raises(exception):
+        dr = DependencyResolver()
+        dr.resolve_graph(add_test_path(file_name), streaming=True)
+
+
+@pytest.mark.parametrize('file_name',
+                         [('deps.json'),
+                          ('deps.txt'),
+                          ('empty_dependencies.json'),
+                          ('simple_dependencies.json'),
+                          ('cyclic_import_worst_case_pass.json')])
+def test_streaming_matches_load(file_name):
+    dr = DependencyResolver()
+    graph = dr.resolve_graph(add_test_path(file_name))
+    streamed_graph = dr.resolve_graph(add_test_path(file_name), streaming=True)
+    assert list(streamed_graph) == list(graph)
+    assert streamed_graph == graph
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 1000])
+def test_streaming_chunk_boundaries(chunk_size):
+    dependency_data = {"pkg \"1\"": ["p\u00e9kg2", "pkg3"], "p\u00e9kg2": [], "pkg3": ["p\u00e9kg2"], "pkg4": []}
+    content = json.dumps(dependency_data, indent=4)
+    assert stream_dependency_data(io.StringIO(content), chunk_size) == dependency_data
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 7, 11])
+def test_streaming_tokens_cut_by_chunks(chunk_size):
+    # keywords, numbers and escapes cut by a chunk boundary are completed from the next chunk
+    content = json.dumps({"pkg\U0001F600": [], "pkg1": ["pkg\U0001F600"], "pkg2": [false_value for false_value in (False, None)],
+                          "pkg3": [-12345.5e3]})
+    with pytest.raises(MissingPackageError):
+        stream_dependency_data(io.StringIO(content), chunk_size)
+    assert stream_dependency_data(io.StringIO(content.split(', "pkg2"')[0] + "}"), chunk_size) == \
+        {"pkg\U0001F600": [], "pkg1": ["pkg\U0001F600"]}
+
+
+def test_streaming_stops_at_malformed_token():
+    class CountingStream(io.StringIO):
+        consumed = 0
+
+        def read(self, size=-1):
+            chunk = super().read(size)
+            self.consumed += len(chunk)
+            return chunk
+
+    stream = CountingStream('{"pkg1": [tru], "pkg2": ["pkg1\n"], ' + '"padding": [], ' * 10_000 + '"pkg3": []}')
+    with pytest.raises(json.JSONDecodeError):
+        stream_dependency_data(stream, 16)
+    assert stream.consumed < 100
+
+
+@pytest.mark.parametrize('content, exception',
+                         [('{"pkg1": ["pkg2"], "pkg2": [12345]}', MissingPackageError),
+                          ('{"pkg1": ["pkg2"], "pkg1": []}', None),
+                          ('{"pkg1": ["pkg2"], "pkg1": ["pkg3"]}', MissingPackageError),
+                          ('{"pkg1": []} []', json.JSONDecodeError),
+                          ('{"pkg1": [] "pkg2": []}', json.JSONDecodeError),
+                          ('{"pkg1": ["pkg2" "pkg3"]}', json.JSONDecodeError),
+                          ('{"pkg1": {}}', TypeError),
+                          ('"pkg1"', TypeError)])
+def test_streaming_edge_cases(content, exception):
+    if exception is None:
+        assert stream_dependency_data(io.StringIO(content), 4) == json.loads(content)
+    else:
+        with pytest.raises(exception):
+            stream_dependency_data(io.StringIO(content), 4)
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_reachability_index(compact):
+    dr = DependencyResolver()
+    file_path = add_test_path("cyclic_import_worst_case_pass.json")
+    index = ReachabilityIndex(dr.resolve_compact_graph(file_path) if compact else dr.resolve_graph(file_path))
+    assert index.depends_on("pkg1", "pkg4")
+    assert not index.depends_on("pkg4", "pkg1")
+    assert not index.depends_on("pkg1", "pkg1")
+    assert index.all_dependencies("pkg2") == ["pkg4", "pkg3"]
+    assert index.dependency_count("pkg1") == 3
+    assert index.dependents("pkg4") == ["pkg3"]
+    assert index.dependents("pkg4", transitive=True) == ["pkg3", "pkg2", "pkg1"]
+    assert index.dependents("pkg1", transitive=True) == []
+    assert "pkg1" in index and "pkg5" not in index
+
+
+def test_reachability_index_unordered_graph(example_structure):
+    index = ReachabilityIndex(example_structure)
+    assert index.all_dependencies("pkg1") == ["pkg3", "pkg2"]
+    assert index.dependents("pkg3") == ["pkg2", "pkg1"]
+    with pytest.raises(KeyError):
+        index.depends_on("pkg1", "pkg5")
+
+
+@pytest.mark.parametrize('positions', [[], [0], [1, 5, 64], list(range(0, 10_000, 7))])
+def test_bitsets(positions):
+    bitset = sum(1 << position for position in positions)
+    assert iter_bits(bitset) == positions
+    assert bit_count(bitset) == len(positions)
+
+
+def test_topological_levels(example_structure):
+    assert topological_levels(example_structure) == [["pkg3"], ["pkg2"], ["pkg1"]]
+
+
+def test_build_scheduler_order():
+    dependency_data = dict(app=["lib1", "lib2"], lib1=["core"], lib2=["core"], core=[], tool=[])
+    dr = DependencyResolver()
+    graph = dr.resolve_dependency_data(dependency_data)
+    finished: list[str] = []
+    lock = threading.Lock()
+
+    def build(name):
+        with lock:
+            assert all(dependency in finished for dependency in dependency_data[name])
+        with lock:
+            finished.append(name)
+        return name.upper()
+
+    results = run_build(graph, build, max_workers=3)
+    assert list(results) == list(graph)
+    assert all(result.status == SUCCEEDED for result in results.values())
+    assert results["app"].result == "APP"
+    assert all(result.duration >= 0. for result in results.values())
+
+
+def test_build_scheduler_failure():
+    dependency_data = dict(app=["lib1", "lib2"], lib1=["core"], lib2=[], core=[], tool=["app"], other=[])
+    dr = DependencyResolver()
+    graph = dr.resolve_dependency_data(dependency_data)
+
+    def build(name):
+        if name == "lib1":
+            raise ValueError("broken build")
+
+    results = run_build(graph, build, max_workers=2)
+    statuses = {name: result.status for name, result in results.items()}
+    assert statuses == dict(core=SUCCEEDED, lib1=FAILED, lib2=SUCCEEDED, app=SKIPPED, tool=SKIPPED, other=SUCCEEDED)
+    assert isinstance(results["lib1"].error, ValueError)
+    assert results["tool"].started is None
+
+
+def test_build_scheduler_process_pool(example_structure):
+    results = run_build(example_structure, len, max_workers=2, executor_kind="process")
+    assert {name: result.result for name, result in results.items()} == dict(pkg1=4, pkg2=4, pkg3=4)
+
+
+def test_build_scheduler_invalid_executor(example_structure):
+    with pytest.raises(ValueError):
+        run_build(example_structure, len, executor_kind="fiber")
+
+
+def test_lazy_graph():
+    dependency_data = dict(app=["lib"], lib=["core"], core=[], broken=["missing"], loop=["loop"])
+    graph = LazyGraph(dependency_data)
+    assert "broken" in graph and len(graph) == 5
+    assert graph["app"].dependencies[0] is graph["lib"]
+    assert sorted(graph.packages) == ["app", "core", "lib"]
+    assert graph["app"] == DependencyResolver().resolve_dependency_data(dict(app=["lib"], lib=["core"], core=[]))["app"]
+    with pytest.raises(MissingPackageError):
+        graph["broken"]
+    with pytest.raises(CyclicDependencyError) as exc_info:
+        graph["loop"]
+    assert exc_info.value.cycles == [["loop"]]
+    with pytest.raises(KeyError):
+        graph["unknown"]
+
+
+@pytest.mark.parametrize('file_name', ["deps.json", "cyclic_import_worst_case_pass.json"])
+def test_lazy_graph_matches_eager(file_name):
+    lazy_graph = resolve_lazy_graph(add_test_path(file_name))
+    eager_graph = DependencyResolver().resolve_graph(add_test_path(file_name))
+    assert dict(lazy_graph) == eager_graph
+
+
+def test_lazy_graph_strict():
+    with pytest.raises(CyclicDependencyError):
+        resolve_lazy_graph(add_test_path("cyclic_import.json"), strict=True)
+    graph = resolve_lazy_graph(add_test_path("deps.json"), strict=True)
+    assert not graph.packages
+
+
+def test_lazy_graph_deep_chain():
+    chain_length = 100_000
+    dependency_data = {f"pkg{index}": [f"pkg{index + 1}"] for index in range(chain_length)}
+    dependency_data[f"pkg{chain_length}"] = []
+    graph = LazyGraph(dependency_data)
+    assert graph[f"pkg{chain_length - 1}"].dependencies[0].name == f"pkg{chain_length}"
+    assert len(graph.packages) == 2
+    assert graph["pkg0"].dependencies[0] is graph["pkg1"]
+
+
+def test_graph_diff():
+    old_data = dict(app=["lib", "util"], lib=["core"], util=[], core=[], tool=["util"], legacy=[])
+    new_data = dict(app=["util", "lib"], lib=["core", "extra"], util=[], core=[], tool=["util"], extra=[])
+    graph_diff = diff_dependency_data(old_data, new_data)
+    assert graph_diff.added == ["extra"]
+    assert graph_diff.removed == ["legacy"]
+    assert graph_diff.changed_dependencies == dict(lib=(["extra"], []))
+    assert graph_diff.changed_closures == ["app", "lib"]
+    assert "changed: lib +extra" in graph_diff.lines()
+
+
+def test_graph_diff_redundant_edge():
+    # an edge to an already reachable package changes direct dependencies, but not closures
+    old_data = dict(app=["lib"], lib=["core"], core=[])
+    new_data = dict(app=["lib", "core"], lib=["core"], core=[])
+    graph_diff = diff_dependency_data(old_data, new_data)
+    assert graph_diff.changed_dependencies == dict(app=(["core"], []))
+    assert graph_diff.changed_closures == []
+    assert not diff_dependency_data(old_data, old_data)
+
+
+def test_graph_diff_files():
+    graph_diff = diff_dependency_files(add_test_path("deps.json"), add_test_path("cyclic_import_worst_case_pass.json"))
+    assert json.loads(json.dumps(graph_diff.as_dict())) == graph_diff.as_dict()
+    with pytest.raises(CyclicDependencyError):
+        diff_dependency_files(add_test_path("deps.json"), add_test_path("cyclic_import.json"))
+
+
+def test_compiled_snapshot(tmp_path):
+    snapshot_path = tmp_path / "deps.snap"
+    compiled = compile_snapshot(add_test_path("cyclic_import_worst_case_pass.json"), snapshot_path)
+    with open_snapshot(snapshot_path) as graph:
+        assert list(graph) == list(compiled)
+        assert graph == compiled
+        assert graph == DependencyResolver().resolve_graph(add_test_path("cyclic_import_worst_case_pass.json"))
+        for name in compiled:
+            assert graph.ids[name] == compiled.ids[name]
+            assert list(graph.dependency_ids(graph.ids[name])) == list(compiled.dependency_ids(compiled.ids[name]))
+        assert "missing" not in graph
+        with pytest.raises(KeyError):
+            graph["missing"]
+        assert graph.to_bytes() == compiled.to_bytes()
+        dependency_ids = graph.dependency_ids(graph.ids["pkg1"])
+    # the snapshot is unmapped while the caller still holds dependency ids
+    assert list(dependency_ids) == list(compiled.dependency_ids(compiled.ids["pkg1"]))
+
+
+def test_compiled_snapshot_invalid(tmp_path):
+    snapshot_path = tmp_path / "deps.snap"
+    compile_snapshot(add_test_path("deps.json"), snapshot_path)
+    content = snapshot_path.read_bytes()
+    snapshot_path.write_bytes(content[:-1])
+    with pytest.raises(ValueError):
+        open_snapshot(snapshot_path)
+    snapshot_path.write_bytes(b"NOTSNAP!" + content[8:])
+    with pytest.raises(ValueError):
+        open_snapshot(snapshot_path)
+
+
+@pytest.fixture
+def manifest_dir(tmp_path):
+    (tmp_path / "component").mkdir()
+    (tmp_path / "app.json").write_text(json.dumps(dict(app=["lib", "core"])))
+    (tmp_path / "component" / "lib.json").write_text(json.dumps(dict(lib=["core"], core=[])))
+    (tmp_path / "component" / "notes.txt").write_text("not a manifest")
+    return tmp_path
+
+
+def test_expand_manifests(manifest_dir):
+    expected = [str(manifest_dir / "app.json"), str(manifest_dir / "component" / "lib.json")]
+    assert expand_manifests(manifest_dir) == expected
+    assert expand_manifests(str(manifest_dir / "**" / "*.json")) == expected
+    assert expand_manifests([manifest_dir / "component" / "lib.json", manifest_dir]) == expected[::-1]
+    with pytest.raises(FileNotFoundError):
+        expand_manifests(str(manifest_dir / "*.yaml"))
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_resolve_manifests(manifest_dir, workers):
+    merged = load_manifests(manifest_dir, workers=workers, threshold=1)
+    assert merged == dict(app=["lib", "core"], lib=["core"], core=[])
+    graph = resolve_manifests(manifest_dir, workers=workers)
+    assert list(graph) == ["core", "lib", "app"]
+
+
+@pytest.mark.parametrize('conflict, dependencies',
+                         [('first', ["core"]),
+                          ('last', ["extra"]),
+                          ('union', ["core", "extra"]),
+                          ])
+def test_manifest_conflict_policies(manifest_dir, conflict, dependencies):
+    (manifest_dir / "override.json").write_text(json.dumps(dict(lib=["extra"], extra=[])))
+    assert load_manifests(manifest_dir, conflict)["lib"] == dependencies
+
+
+def test_manifest_errors(manifest_dir):
+    (manifest_dir / "override.json").write_text(json.dumps(dict(lib=["core"], core=[])))
+    assert load_manifests(manifest_dir)["lib"] == ["core"]
+    (manifest_dir / "override.json").write_text(json.dumps(dict(lib=[])))
+    with pytest.raises(ConflictingPackageError):
+        load_manifests(manifest_dir)
+    with pytest.raises(ValueError):
+        load_manifests(manifest_dir, "merge")
+    # presence of dependencies is checked across all manifests
+    with pytest.raises(MissingPackageError):
+        resolve_manifests(manifest_dir / "app.json")
+
+
+def test_resolver_stats():
+    stats = ResolverStats()
+    dr = DependencyResolver(hooks=[stats])
+    dr.resolve_graph(add_test_path("deps.json"))
+    assert list(stats.phases) == ["read", "parse", "verify", "order", "build"]
+    assert all(duration >= 0. for duration in stats.phases.values())
+    assert stats.counters == dict(packages=3, edges=3, max_depth=2)
+    assert "peak_memory" not in stats.as_dict()
+
+
+def test_resolver_stats_cache_and_memory(tmp_path):
+    with ResolverStats(trace_memory=True) as stats:
+        dr = DependencyResolver(GraphCache(tmp_path), [stats])
+        dr.print_dependency_graph(add_test_path("deps.json"), stream=io.StringIO())
+        dr.print_dependency_graph(add_test_path("deps.json"), stream=io.StringIO())
+    assert stats.counters["cache_hits"] == 1
+    assert stats.counters["cache_misses"] == 1
+    assert stats.peak_memory["cache"] >= stats.peak_memory["parse"] > 0
+    assert set(stats.as_dict()["peak_memory"]) == set(stats.phases)
+
+
+def test_resolver_hook_on_failure():
+    events = []
+
+    class RecordingHook(ResolverHook):
+        def phase_finished(self, phase, duration):
+            events.append(phase)
+
+    dr = DependencyResolver(hooks=[RecordingHook()])
+    with pytest.raises(CyclicDependencyError):
+        dr.resolve_graph(add_test_path("cyclic_import.json"))
+    assert events == ["read", "parse", "verify", "order"]
+    assert DependencyResolver().phase("read") is NO_PHASE
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets are not available")
+def test_resolver_daemon(tmp_path):
+    file_path = tmp_path / "dependencies.json"
+    file_path.write_text(json.dumps(dict(pkg1=["pkg2"], pkg2=["pkg3"], pkg3=[])))
+    socket_path = str(tmp_path / "daemon.sock")
+    daemon = ResolverDaemon(file_path, socket_path, poll_interval=0.01)
+    thread = threading.Thread(target=asyncio.run, args=(daemon.serve(),))
+    thread.start()
+
+    def wait_for(condition):
+        deadline = time.monotonic() + 10
+        while not condition():
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+    try:
+        wait_for(lambda: os.path.exists(socket_path))
+        assert query(dict(command="ping"), socket_path) == "pong"
+        assert query(dict(command="dependencies", package="pkg1", transitive=True), socket_path) == ["pkg3", "pkg2"]
+        assert query(dict(command="dependents", package="pkg3"), socket_path) == ["pkg2"]
+        stream = io.StringIO()
+        render_graph(DependencyResolver().resolve_graph(file_path), stream)
+        assert query(dict(command="graph"), socket_path) == stream.getvalue()
+        assert query(dict(command="graph", package="pkg2", max_depth=1), socket_path) == "- pkg2\n  - pkg3\n"
+        assert query(dict(command="depends_on", package="pkg1", dependency="pkg3"), socket_path) is True
+        with pytest.raises(DaemonQueryError):
+            query(dict(command="dependencies", package="pkg5"), socket_path)
+
+        # invalid content keeps the last valid graph
+        file_path.write_text(json.dumps(dict(pkg1=["pkg5"])))
+        wait_for(lambda: query(dict(command="status"), socket_path)["last_error"] is not None)
+        assert query(dict(command="packages"), socket_path) == ["pkg3", "pkg2", "pkg1"]
+
+        file_path.write_text(json.dumps(dict(pkg1=[], pkg4=["pkg1"])))
+        wait_for(lambda: query(dict(command="status"), socket_path)["generation"] == 1)
+        assert query(dict(command="packages"), socket_path) == ["pkg1", "pkg4"]
+        assert query(dict(command="status"), socket_path)["last_error"] is None
+    finally:
+        query(dict(command="shutdown"), socket_path)
+        thread.join()
+    assert not os.path.exists(socket_path)
+
+
+def test_default_socket_path(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert default_socket_path() == os.path.join(str(tmp_path), "exercise_two.sock")
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    # the socket directory is specific to the user
+    assert default_socket_path().startswith(os.path.join(client.tempfile.gettempdir(), "exercise_two-"))
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets are not available")
+def test_daemon_socket_directory(monkeypatch, tmp_path):
+    socket_path = str(tmp_path / "private" / "daemon.sock")
+    monkeypatch.setattr(daemon, "DEFAULT_SOCKET_PATH", socket_path)
+    ResolverDaemon(add_test_path("deps.json"), socket_path).prepare_socket_dir()
+    assert os.stat(tmp_path / "private").st_mode & 0o777 == 0o700
+    # a directory accessible to other users could be used to replace the socket
+    os.chmod(tmp_path / "private", 0o777)
+    with pytest.raises(RuntimeError):
+        ResolverDaemon(add_test_path("deps.json"), socket_path).prepare_socket_dir()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets are not available")
+def test_query_timeout(tmp_path):
+    socket_path = str(tmp_path / "silent.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(socket_path)
+        server.listen()
+        # the connection is accepted by the backlog, but never answered
+        with pytest.raises(socket.timeout):
+            query(dict(command="ping"), socket_path, timeout=0.05)
+
+
+def test_resolve_batch(tmp_path):
+    cyclic_path = tmp_path / "cyclic.json"
+    cyclic_path.write_text(json.dumps(dict(a=["b"], b=["a"])))
+    empty_path = tmp_path / "empty.json"
+    empty_path.write_text("{}")
+    paths = [add_test_path("deps.json"), add_test_path("missing_package.json"), tmp_path / "absent.json", cyclic_path,
+             add_test_path("invalid_json.json"), add_test_path("list_json.json"), empty_path]
+    records = list(resolve_batch(paths, adjacency=True))
+    assert [record["path"] for record in records] == [str(path) for path in paths]
+    assert records[0] == dict(path=str(paths[0]), ok=True, packages=3, edges=3, max_depth=2,
+                              dependencies=dict(pkg3=[], pkg2=["pkg3"], pkg1=["pkg2", "pkg3"]))
+    errors = ["MissingPackageError", "FileNotFoundError", "CyclicDependencyError", "JSONDecodeError", "TypeError"]
+    assert [record.get("error") for record in records[1:6]] == errors
+    assert not any(record["ok"] for record in records[1:6])
+    assert records[3]["cycles"] == [["a", "b"]]
+    assert records[6] == dict(path=str(empty_path), ok=True, packages=0, edges=0, max_depth=0, dependencies={})
+
+
+@pytest.mark.parametrize('output_format', ["text", "json", "ndjson", "dot"])
+def test_module_main_formats(capsys, output_format):
+    file_path = add_test_path("deps.json")
+    main(["-f", file_path, "--format", output_format])
+    graph, expected = DependencyResolver().resolve_graph(file_path), io.StringIO()
+    if output_format == "text":
+        render_graph(graph, expected)
+    else:
+        export_graph(graph, expected, output_format)
+    assert capsys.readouterr().out == expected.getvalue()
+
+
+def test_module_main_arguments(capsys):
+    file_path = add_test_path("deps.json")
+    main(["-f", file_path, "-m", "flat", "-d", "0"])
+    flat = capsys.readouterr().out
+    assert flat == "pkg3:\npkg2: pkg3\npkg1: pkg2, pkg3\n"
+    # extra arguments are ignored, as by the original entry point
+    main(["-f", file_path, "-m", "flat", "-d", "0", "extra", "--unknown"])
+    assert capsys.readouterr().out == flat
+    with pytest.raises(SystemExit):
+        main(["-f", file_path, "--format", "xml"])
+
+
+def test_entry_points_defer_imports():
+    # defining the commands must not import the resolver, detection engines or NumPy
+    script = "import sys, entry_points; print(sorted(name for name in ('numpy', 'exercise_one.exercise_one', " \
+             "'exercise_two.exercise_two') if name in sys.modules))"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([join(dirname(dirname(abspath(__file__))), "solutions")] + sys.path))
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def output_records(output: str) -> list:
+    # messages of the resolver are mixed into the output of the runner, records are the JSON lines
+    return [json.loads(line) for line in output.splitlines() if line.startswith("{")]
+
+
+def test_compile_dependency_command(tmp_path):
+    snapshot_path = tmp_path / "deps.snap"
+    result = CliRunner().invoke(entry_points.compile_dependency, ["-f", add_test_path("deps.json"), "-o", str(snapshot_path)])
+    assert result.exit_code == 0
+    assert result.output == f"Compiled 3 packages and 3 edges into {snapshot_path}\n"
+    result = CliRunner().invoke(entry_points.dependency_graph, ["--snapshot", str(snapshot_path), "--format", "json"])
+    assert result.exit_code == 0
+    assert json.loads(result.output) == dict(pkg3=[], pkg2=["pkg3"], pkg1=["pkg2", "pkg3"])
+
+
+def test_diff_dependency_command():
+    arguments = [add_test_path("deps.json"), add_test_path("cyclic_import_worst_case_pass.json")]
+    graph_diff = diff_dependency_files(*arguments)
+    result = CliRunner().invoke(entry_points.diff_dependency, arguments)
+    assert result.exit_code == 0
+    assert result.output.splitlines() == list(graph_diff.lines())
+    result = CliRunner().invoke(entry_points.diff_dependency, arguments + ["--json"])
+    assert result.exit_code == 0
+    assert json.loads(result.output) == graph_diff.as_dict()
+
+
+def test_dependency_batch_command(tmp_path):
+    paths = [add_test_path("deps.json"), add_test_path("missing_package.json")]
+    result = CliRunner().invoke(entry_points.dependency_batch, paths + ["--cache-dir", str(tmp_path / "cache")])
+    assert result.exit_code == 1
+    records = output_records(result.output)
+    assert [(record["path"], record["ok"]) for record in records] == [(paths[0], True), (paths[1], False)]
+    assert records[1]["error"] == "MissingPackageError"
+    assert (tmp_path / "cache" / "index.json").exists()
+
+    # paths from stdin
+    result = CliRunner().invoke(entry_points.dependency_batch, ["--no-cache", "--adjacency"], input=f"{paths[0]}\n\n")
+    assert result.exit_code == 0
+    assert output_records(result.output) == [dict(path=paths[0], ok=True, packages=3, edges=3, max_depth=2,
+                                                  dependencies=dict(pkg3=[], pkg2=["pkg3"], pkg1=["pkg2", "pkg3"]))]
+
+
+def test_dependency_daemon_command(monkeypatch):
+    calls = []
+    monkeypatch.setattr("exercise_two.daemon.run_daemon", lambda *args: calls.append(args))
+    result = CliRunner().invoke(entry_points.dependency_daemon, ["-f", "deps.json", "-s", "daemon.sock", "--poll-interval", "0.5"])
+    assert result.exit_code == 0
+    assert calls == [("deps.json", "daemon.sock", 0.5)]
+    result = CliRunner().invoke(entry_points.dependency_daemon, ["--poll-interval", "0"])
+    assert result.exit_code == 2
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets are not available")
+def test_dependency_query_command(tmp_path):
+    socket_path = str(tmp_path / "daemon.sock")
+    result = CliRunner().invoke(entry_points.dependency_query, ["ping", "-s", socket_path])
+    assert result.exit_code == 1
+    assert result.output.startswith("Error:")
+
+    def invoke(*arguments):
+        return CliRunner().invoke(entry_points.dependency_query, list(arguments) + ["-s", socket_path])
+
+    daemon = ResolverDaemon(add_test_path("deps.json"), socket_path)
+    thread = threading.Thread(target=asyncio.run, args=(daemon.serve(),))
+    thread.start()
+    try:
+        deadline = time.monotonic() + 10
+        while not os.path.exists(socket_path):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert invoke("ping").output == "pong"
+        assert invoke("dependencies", "pkg1", "-t").output == "pkg3\npkg2\n"
+        assert invoke("dependents", "pkg3").output == "pkg2\npkg1\n"
+        assert (invoke("depends-on", "pkg1", "pkg3").exit_code, invoke("depends-on", "pkg1", "pkg3").output) == (0, "true\n")
+        assert (invoke("depends-on", "pkg3", "pkg1").exit_code, invoke("depends-on", "pkg3", "pkg1").output) == (1, "false\n")
+        assert invoke("graph", "-m", "flat").output == "pkg3:\npkg2: pkg3\npkg1: pkg2, pkg3\n"
+        assert json.loads(invoke("status").output)["packages"] == 3
+        assert invoke("dependencies", "pkg5").exit_code == 1
+    finally:
+        assert invoke("shutdown").output == "true\n"
+        thread.join()